@@ -0,0 +1,129 @@
+"""
+Import-time profile of the Lambda handler module, from `python -X importtime`
+
+    python benchmarks/importtime.py [--runs N] [--check] [--tolerance T]
+
+Imports `hard.app.main` in fresh interpreters, with every router built
+up front and with `LAZY_ROUTERS_ENABLED`, keeping the fastest run of
+each. The report is written to `benchmarks/importtime.json`, which is
+tracked, so changes to cold-start init show up in review. `--check`
+compares against that file instead, failing if either total has grown
+by more than `--tolerance`
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+REPORT_PATH = Path(__file__).parent / "importtime.json"
+MODULE = "hard.app.main"
+TOP_MODULES = 25
+
+MODES = {
+    "eager": {},
+    "lazy": {"LAZY_ROUTERS_ENABLED": "true"},
+}
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """Parses the `import time: self | cumulative | package` lines of `-X importtime`"""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.append(
+            ImportTime(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return timings
+
+
+def profile(env: dict[str, str]) -> list[ImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, **env},
+    )
+    return parse_importtime(result.stderr)
+
+
+def total_us(timings: list[ImportTime]) -> int:
+    return next(timing.cumulative_us for timing in timings if timing.module == MODULE)
+
+
+def report(runs: int) -> dict:
+    modes = {}
+    for mode, env in MODES.items():
+        fastest = min((profile(env) for _ in range(runs)), key=total_us)
+        modes[mode] = {
+            "total_us": total_us(fastest),
+            "module_count": len(fastest),
+            "top_modules": [
+                {
+                    "module": timing.module,
+                    "self_us": timing.self_us,
+                    "cumulative_us": timing.cumulative_us,
+                }
+                for timing in sorted(
+                    (timing for timing in fastest if timing.module != MODULE),
+                    key=lambda timing: timing.cumulative_us,
+                    reverse=True,
+                )[:TOP_MODULES]
+            ],
+        }
+    return {"python": sys.version.split()[0], "module": MODULE, "modes": modes}
+
+
+def check(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    failures = []
+    for mode, timings in current["modes"].items():
+        allowed = baseline["modes"][mode]["total_us"] * (1 + tolerance)
+        if timings["total_us"] > allowed:
+            failures.append(
+                f"{mode}: {timings['total_us']:,}us exceeds {allowed:,.0f}us"
+            )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    current = report(args.runs)
+    for mode, timings in current["modes"].items():
+        print(
+            f"{mode:>6}: {timings['total_us'] / 1000:8.1f}ms"
+            f" over {timings['module_count']} modules"
+        )
+
+    if not args.check:
+        REPORT_PATH.write_text(json.dumps(current, indent=2) + "\n")
+        return
+
+    failures = check(current, json.loads(REPORT_PATH.read_text()), args.tolerance)
+    for failure in failures:
+        print(f"Import time regression in {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
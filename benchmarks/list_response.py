@@ -0,0 +1,93 @@
+"""
+Request latency of `GET /api/sets` for a large, in-memory list of sets
+
+    python benchmarks/list_response.py [--items N] [--requests R]
+
+The storage read is replaced with a prebuilt list, so only the routing
+and response serialization are timed, once through `response_model`
+validation and once with the pre-serialized `list_response`
+"""
+
+import argparse
+import statistics
+import time
+from unittest import mock
+
+from serialization import make_items
+
+from hard.app.main import handler
+from hard.app.processes import AsyncRestProcesses
+from hard.app.routes import sets as sets_routes
+from hard.models.set import Set
+
+EVENT = {
+    "resource": "/{endpoints+}",
+    "path": "/api/sets",
+    "httpMethod": "GET",
+    "headers": {"host": "benchmark"},
+    "multiValueHeaders": {},
+    "queryStringParameters": None,
+    "multiValueQueryStringParameters": None,
+    "pathParameters": None,
+    "stageVariables": None,
+    "requestContext": {
+        "authorizer": {
+            "claims": {
+                "cognito:username": "benchmark_user",
+                "email": "benchmark@user.com",
+            }
+        },
+        "resourcePath": "/",
+        "httpMethod": "GET",
+        "path": "/api/sets",
+        "stage": "benchmark",
+        "identity": {"sourceIp": "127.0.0.1"},
+    },
+    "body": None,
+    "isBase64Encoded": False,
+}
+
+
+class Context:
+    aws_request_id = "benchmark"
+
+
+def latencies(requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = handler(EVENT, Context())
+        timings.append(time.perf_counter() - start)
+        assert response["statusCode"] == 200, response["body"]
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    percentiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{name:>16}: p50 {percentiles[49] * 1000:8.2f}ms"
+        f"  p99 {percentiles[98] * 1000:8.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    sets = Set.from_db_list(make_items(args.items))
+
+    async def get_list(object_cls, user):
+        return sets
+
+    with mock.patch.object(AsyncRestProcesses, "get_list", get_list):
+        with mock.patch.object(
+            sets_routes, "list_response", lambda object_cls, result: result
+        ):
+            report("response_model", latencies(args.requests))
+        report("list_response", latencies(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Realistic data for the benchmark suite: one user's training log
+
+By default two years of near-daily workouts, each of seven exercises
+from a fixed catalog with around ten sets apiece (~50k sets in total),
+plus tags on some workouts and a handful of templates. Generation is
+seeded, so every run stores the same objects
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from hard.app.aggregates import rebuild_user
+from hard.aws.dynamodb.base_object import BaseObject
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.tag import Tag
+from hard.models.tag_join import TagJoin
+from hard.models.template import Template
+from hard.models.workout import Workout
+
+START_DATE = date(2023, 1, 1)
+DEFAULT_DAYS = 730
+EXERCISES_PER_WORKOUT = 7
+WARMUP_SETS = 2
+WORKING_SETS = (6, 10)
+TAGGED_WORKOUT_SHARE = 0.2
+
+EXERCISE_NAMES = [
+    "Back Squat",
+    "Front Squat",
+    "Deadlift",
+    "Romanian Deadlift",
+    "Bench Press",
+    "Incline Bench Press",
+    "Overhead Press",
+    "Push Press",
+    "Barbell Row",
+    "Pendlay Row",
+    "Pull Up",
+    "Chin Up",
+    "Lat Pulldown",
+    "Seated Cable Row",
+    "Dumbbell Press",
+    "Dumbbell Row",
+    "Dip",
+    "Lunge",
+    "Bulgarian Split Squat",
+    "Leg Press",
+    "Leg Curl",
+    "Leg Extension",
+    "Calf Raise",
+    "Hip Thrust",
+    "Face Pull",
+    "Lateral Raise",
+    "Bicep Curl",
+    "Hammer Curl",
+    "Tricep Pushdown",
+    "Skull Crusher",
+    "Plank",
+    "Hanging Leg Raise",
+    "Ab Wheel",
+    "Farmer Carry",
+    "Shrug",
+    "Good Morning",
+    "Power Clean",
+    "Snatch",
+    "Clean and Jerk",
+    "Box Jump",
+]
+TAG_NAMES = ["Deload", "PR Day", "Travel", "Home Gym", "Tired"]
+TEMPLATE_NAMES = ["Push", "Pull", "Legs", "Upper", "Lower"]
+
+
+class SeededUser(NamedTuple):
+    user: User
+    workouts: list[Workout]
+    exercises: list[Exercise]
+    exercise_joins: list[ExerciseJoin]
+    sets: list[Set]
+    tags: list[Tag]
+    tag_joins: list[TagJoin]
+    templates: list[Template]
+
+    def objects(self) -> list[BaseObject]:
+        return [
+            *self.workouts,
+            *self.exercises,
+            *self.exercise_joins,
+            *self.sets,
+            *self.tags,
+            *self.tag_joins,
+            *self.templates,
+        ]
+
+
+class _Factory:
+    """Builds stored objects with deterministic ids and unique timestamps"""
+
+    def __init__(self, user: User, rng: random.Random) -> None:
+        self.user = user
+        self.rng = rng
+
+    def build(self, object_cls, timestamp: datetime, **values):
+        return object_cls.model_validate(
+            {
+                "user_id": self.user.id,
+                "timestamp": timestamp,
+                "object_type": ObjectType.from_object_class(object_cls),
+                "object_id": UUID(int=self.rng.getrandbits(128), version=4),
+                **values,
+            }
+        )
+
+
+def build_user(user: User, days: int = DEFAULT_DAYS, seed: int = 0) -> SeededUser:
+    rng = random.Random(seed)
+    factory = _Factory(user, rng)
+    start = datetime.combine(START_DATE, datetime.min.time())
+
+    exercises = [
+        factory.build(Exercise, start + timedelta(seconds=index), name=name)
+        for index, name in enumerate(EXERCISE_NAMES)
+    ]
+    tags = [
+        factory.build(
+            Tag,
+            start + timedelta(seconds=index),
+            name=name,
+            color_hex=f"#{rng.getrandbits(24):06x}",
+        )
+        for index, name in enumerate(TAG_NAMES)
+    ]
+    templates = [
+        factory.build(Template, start + timedelta(seconds=index), name=name)
+        for index, name in enumerate(TEMPLATE_NAMES)
+    ]
+
+    workouts, exercise_joins, sets, tag_joins = [], [], [], []
+    for day in range(days):
+        started_at = start + timedelta(days=day, hours=7)
+        workout = factory.build(
+            Workout,
+            started_at,
+            workout_date=(START_DATE + timedelta(days=day)).isoformat(),
+            title=rng.choice(TEMPLATE_NAMES),
+            notes="",
+        )
+        workouts.append(workout)
+
+        if rng.random() < TAGGED_WORKOUT_SHARE:
+            tag_joins.append(
+                factory.build(
+                    TagJoin,
+                    started_at,
+                    target_id=workout.object_id,
+                    tag_id=rng.choice(tags).object_id,
+                    target_object_type=ObjectType.WORKOUT,
+                )
+            )
+
+        for position, exercise in enumerate(
+            rng.sample(exercises, EXERCISES_PER_WORKOUT)
+        ):
+            joined_at = started_at + timedelta(minutes=position)
+            exercise_join = factory.build(
+                ExerciseJoin,
+                joined_at,
+                workout_id=workout.object_id,
+                exercise_id=exercise.object_id,
+            )
+            exercise_joins.append(exercise_join)
+
+            top_weight = 40 + 2.5 * rng.randint(0, 40) + day * 0.05
+            for index in range(WARMUP_SETS + rng.randint(*WORKING_SETS)):
+                warmup = index < WARMUP_SETS
+                sets.append(
+                    factory.build(
+                        Set,
+                        joined_at + timedelta(seconds=index),
+                        set_type=(SetType.WARMUP if warmup else SetType.WORKING),
+                        weight=round(top_weight * (0.5 if warmup else 1), 1),
+                        unit=WeightUnit.KILOGRAMS,
+                        reps=rng.randint(3, 12),
+                        notes="",
+                        exercise_join_id=str(exercise_join.object_id),
+                    )
+                )
+
+    return SeededUser(
+        user=user,
+        workouts=workouts,
+        exercises=exercises,
+        exercise_joins=exercise_joins,
+        sets=sets,
+        tags=tags,
+        tag_joins=tag_joins,
+        templates=templates,
+    )
+
+
+def seed_user(user: User, days: int = DEFAULT_DAYS, seed: int = 0) -> SeededUser:
+    """
+    Builds `user`'s training log (see `build_user`) and stores it,
+    along with its exercise aggregates
+    """
+    seeded = build_user(user, days=days, seed=seed)
+    get_db_instance().batch_write(put_objects=seeded.objects())
+    rebuild_user(user)
+    return seeded
@@ -0,0 +1,99 @@
+"""
+Items/sec for the DynamoDB (de)serialization path of `BaseObject` models
+
+    python benchmarks/serialization.py [--items N] [--repeat R]
+
+Times `from_db` (stored item -> model), `from_db_list` (the batched form
+used by list endpoints) and `to_db` (model -> stored item) over `Set`s,
+the most numerous object type
+"""
+
+import argparse
+import gc
+import time
+from copy import deepcopy
+from decimal import Decimal
+from typing import Callable
+from uuid import uuid4
+
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models import SetType, WeightUnit
+from hard.models.set import Set
+
+USER = User(id="benchmark_user", email="benchmark@user.com")
+
+
+def make_items(count: int) -> list[dict]:
+    join_id = str(uuid4())
+    items = []
+    for index in range(count):
+        set = Set.model_validate(
+            {
+                "set_type": SetType.WORKING.value,
+                "weight": 60 + (index % 40) * 2.5,
+                "unit": WeightUnit.KILOGRAMS.value,
+                "reps": 5,
+                "notes": "",
+                "exercise_join_id": join_id,
+            }
+        )
+        set.init_from_request(USER, ObjectType.SET)
+        item = set.to_db()
+        # As returned by boto3: every number is a Decimal
+        items.append(
+            {
+                key: Decimal(str(value)) if isinstance(value, float) else value
+                for key, value in item.items()
+            }
+        )
+    return items
+
+
+def best_rate(func: Callable[[], object], count: int, repeat: int) -> float:
+    """Items/sec of the fastest of `repeat` runs (with GC paused, as `timeit` does)"""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    models = [Set.from_db(deepcopy(item)) for item in items]
+
+    # `from_db` implementations may consume their input, so copy up front
+    copies = [deepcopy(items) for _ in range(2 * args.repeat)]
+
+    results = {
+        "from_db": best_rate(
+            lambda: [Set.from_db(item) for item in copies.pop()],
+            args.items,
+            args.repeat,
+        ),
+        "to_db": best_rate(
+            lambda: [model.to_db() for model in models], args.items, args.repeat
+        ),
+    }
+    if hasattr(Set, "from_db_list"):
+        results["from_db_list"] = best_rate(
+            lambda: Set.from_db_list(copies.pop()), args.items, args.repeat
+        )
+
+    for name, rate in results.items():
+        print(f"{name:>14}: {rate:>10,.0f} items/sec")
+
+
+if __name__ == "__main__":
+    main()
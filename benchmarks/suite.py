@@ -0,0 +1,618 @@
+"""
+Latency and DynamoDB call counts for every route and `processes` helper
+
+    python -m benchmarks.suite [--days N] [--repeat R] [--only TEXT]
+                               [--update | --check] [--tolerance T]
+
+Runs against the moto table from `tests/conftest.py`, seeded with one
+realistic user (see `seed.py`). Each case reports its median latency,
+and the DynamoDB calls made and items read by a single run. Routes go
+through the Mangum `handler`, as they would on Lambda.
+
+moto scans the whole table for every index query, so the stored
+baselines use two months of data; the full two years of `seed.py`
+(`--days 730`) runs for hours against moto.
+
+Results are compared with `benchmarks/baselines.json`: `--update`
+rewrites it (only the cases run, with `--only`), and `--check` fails if any case makes more calls or reads
+more items than its baseline, or is slower by more than `--tolerance`
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+import boto3
+import moto
+
+from benchmarks.seed import SeededUser, seed_user
+from hard.app import processes
+from hard.app.main import handler
+from hard.app.processes import RestProcesses
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.metrics import collect_call_metrics
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models import SetType, WeightUnit
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.workout import Workout
+from tests.conftest import (
+    MOCK_CURSOR_SECRET_KEY,
+    MOCK_DYNAMO_TABLE_NAME,
+    create_table,
+)
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+USER = User(id="benchmark_user", email="benchmark@user.com")
+DEFAULT_DAYS = 60
+PAGE_SIZE = 100
+BATCH_SIZE = 25
+
+
+class Case(NamedTuple):
+    """
+    A single benchmark: `run` is timed and counted, while `prepare`
+    (if given) runs untimed before each repeat and returns `run`'s arguments
+    """
+
+    name: str
+    run: Callable[..., Any]
+    prepare: Optional[Callable[[], tuple]] = None
+
+
+class Result(NamedTuple):
+    ms: float
+    calls: int
+    items_read: int
+
+
+class RouteError(Exception):
+    pass
+
+
+class _LambdaContext:
+    aws_request_id = "benchmark"
+
+
+def call_route(
+    method: str,
+    path: str,
+    body: Optional[Any] = None,
+    query: Optional[dict[str, str]] = None,
+) -> Any:
+    """Invokes `handler` with an API Gateway event and returns the decoded body"""
+    event = {
+        "resource": "/{endpoints+}",
+        "path": path,
+        "httpMethod": method,
+        "headers": {"content-type": "application/json", "host": "benchmark"},
+        "multiValueHeaders": {},
+        "queryStringParameters": query,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "authorizer": {
+                "claims": {"cognito:username": USER.id, "email": USER.email}
+            },
+            "resourcePath": "/",
+            "httpMethod": method,
+            "path": path,
+            "stage": "benchmark",
+            "identity": {"sourceIp": "127.0.0.1"},
+        },
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+    response = handler(event, _LambdaContext())
+    if response["statusCode"] >= 400:
+        raise RouteError(
+            f"{method} {path}: {response['statusCode']} {response['body']}"
+        )
+    return json.loads(response["body"]) if response["body"] else None
+
+
+def route(method: str, path: str, **kwargs) -> Case:
+    return Case(f"{method} {path}", lambda: call_route(method, path, **kwargs))
+
+
+def _query_name(query: dict[str, str]) -> str:
+    return "&".join(f"{key}={{{key}}}" for key in query)
+
+
+def read_route_cases(seeded: SeededUser) -> list[Case]:
+    workout = seeded.workouts[len(seeded.workouts) // 2]
+    exercise = seeded.exercises[0]
+    tag_join = seeded.tag_joins[0]
+    month_start = workout.workout_date
+    month_end = month_start + timedelta(days=30)
+
+    cases = [route("GET", "/api/user")]
+    for prefix, objects in [
+        ("workouts", seeded.workouts),
+        ("exercises", seeded.exercises),
+        ("sets", seeded.sets),
+        ("exercise-joins", seeded.exercise_joins),
+        ("tags", seeded.tags),
+        ("tag-joins", seeded.tag_joins),
+        ("templates", seeded.templates),
+    ]:
+        path = f"/api/{prefix}"
+        cases += [
+            route("GET", path),
+            Case(
+                f"GET {path}?limit={PAGE_SIZE}",
+                lambda path=path: call_route(
+                    "GET", path, query={"limit": str(PAGE_SIZE)}
+                ),
+            ),
+            Case(
+                f"GET {path}/{{id}}",
+                lambda path=path, object_id=objects[0].object_id: call_route(
+                    "GET", f"{path}/{object_id}"
+                ),
+            ),
+        ]
+
+    for path, query in [
+        ("/api/workouts", {"date": workout.workout_date.isoformat()}),
+        (
+            "/api/workouts",
+            {"from": month_start.isoformat(), "to": month_end.isoformat()},
+        ),
+        ("/api/exercises", {"workout": str(workout.object_id)}),
+        ("/api/sets", {"workout": str(workout.object_id)}),
+        ("/api/sets", {"exercise": str(exercise.object_id)}),
+        ("/api/exercise-joins", {"workout": str(workout.object_id)}),
+        ("/api/exercise-joins", {"exercise": str(exercise.object_id)}),
+        ("/api/tags", {"target": str(tag_join.target_id)}),
+        ("/api/sync", {"limit": str(PAGE_SIZE)}),
+    ]:
+        cases.append(
+            Case(
+                f"GET {path}?{_query_name(query)}",
+                lambda path=path, query=query: call_route("GET", path, query=query),
+            )
+        )
+
+    cases.append(
+        Case(
+            "GET /api/workouts/{id}/full",
+            lambda: call_route("GET", f"/api/workouts/{workout.object_id}/full"),
+        )
+    )
+    cases += [
+        Case(
+            "GET /api/exercises/{id}/stats",
+            lambda: call_route("GET", f"/api/exercises/{exercise.object_id}/stats"),
+        ),
+        route("GET", "/api/stats/summary"),
+    ]
+    return cases
+
+
+def write_route_cases(seeded: SeededUser) -> list[Case]:
+    workout = seeded.workouts[-1]
+    exercises = seeded.exercises
+    tags = seeded.tags
+
+    def new_set() -> dict:
+        return {
+            "set_type": SetType.WORKING.value,
+            "weight": 100,
+            "unit": WeightUnit.KILOGRAMS.value,
+            "reps": 5,
+            "notes": "",
+            "exercise_join_id": str(seeded.exercise_joins[-1].object_id),
+        }
+
+    # Path prefix -> (creation body, patch body)
+    bodies: dict[str, tuple[Callable[[], dict], dict]] = {
+        "workouts": (
+            lambda: {"workout_date": "2025-01-01", "title": "Push", "notes": ""},
+            {"notes": "Felt strong"},
+        ),
+        "exercises": (lambda: {"name": "Benchmark Press"}, {"description": "New"}),
+        "sets": (new_set, {"reps": 6}),
+        "exercise-joins": (
+            lambda: {
+                "workout_id": str(workout.object_id),
+                "exercise_id": str(exercises[-1].object_id),
+            },
+            {"exercise_id": str(exercises[-2].object_id)},
+        ),
+        "tags": (lambda: {"name": "New", "color_hex": "#123456"}, {"name": "Old"}),
+        "tag-joins": (
+            lambda: {
+                "target_id": str(workout.object_id),
+                "tag_id": str(tags[0].object_id),
+            },
+            {"tag_id": str(tags[1].object_id)},
+        ),
+        "templates": (lambda: {"name": "Benchmark"}, {"description": "New"}),
+    }
+
+    cases = []
+    for prefix, (create_body, patch_body) in bodies.items():
+        path = f"/api/{prefix}"
+
+        def create(path=path, create_body=create_body) -> tuple:
+            return (call_route("POST", path, body=create_body()),)
+
+        cases += [
+            Case(
+                f"POST {path}",
+                lambda path=path, create_body=create_body: call_route(
+                    "POST", path, body=create_body()
+                ),
+            ),
+            Case(
+                f"PUT {path}/{{id}}",
+                lambda created, path=path: call_route(
+                    "PUT", f"{path}/{created['object_id']}", body=created
+                ),
+                create,
+            ),
+            Case(
+                f"PATCH {path}/{{id}}",
+                lambda created, path=path, patch_body=patch_body: call_route(
+                    "PATCH", f"{path}/{created['object_id']}", body=patch_body
+                ),
+                create,
+            ),
+            Case(
+                f"DELETE {path}/{{id}}",
+                lambda created, path=path: call_route(
+                    "DELETE", f"{path}/{created['object_id']}"
+                ),
+                create,
+            ),
+        ]
+
+    for prefix, create_body in [
+        ("sets", new_set),
+        ("exercise-joins", bodies["exercise-joins"][0]),
+        ("tag-joins", bodies["tag-joins"][0]),
+    ]:
+        path = f"/api/{prefix}:batch"
+        cases += [
+            Case(
+                f"POST {path}",
+                lambda path=path, create_body=create_body: call_route(
+                    "POST",
+                    path,
+                    body={"items": [create_body() for _ in range(BATCH_SIZE)]},
+                ),
+            ),
+            Case(
+                f"DELETE {path}",
+                lambda created, path=path: call_route(
+                    "DELETE",
+                    path,
+                    body={"object_ids": [result["object_id"] for result in created]},
+                ),
+                lambda path=path, create_body=create_body: (
+                    call_route(
+                        "POST",
+                        path,
+                        body={"items": [create_body() for _ in range(BATCH_SIZE)]},
+                    )["results"],
+                ),
+            ),
+        ]
+
+    return cases
+
+
+def read_process_cases(seeded: SeededUser) -> list[Case]:
+    workout = seeded.workouts[len(seeded.workouts) // 2]
+    exercise = seeded.exercises[0]
+    tag = seeded.tags[0]
+    tag_join = seeded.tag_joins[0]
+    joins = [
+        join for join in seeded.exercise_joins if join.workout_id == workout.object_id
+    ]
+    # Not `asyncio.run`, which leaves no event loop behind for Mangum
+    loop = asyncio.new_event_loop()
+
+    return [
+        Case("RestProcesses.get_list(Set)", lambda: RestProcesses.get_list(Set, USER)),
+        Case(
+            "RestProcesses.get_list(Workout)",
+            lambda: RestProcesses.get_list(Workout, USER),
+        ),
+        Case(
+            "RestProcesses.get_page(Set)",
+            lambda: RestProcesses.get_page(Set, USER, limit=PAGE_SIZE),
+        ),
+        Case(
+            "RestProcesses.get(Set)",
+            lambda: RestProcesses.get(Set, USER, seeded.sets[0].object_id),
+        ),
+        Case(
+            "workout_date_filter",
+            lambda: processes.workout_date_filter(USER, workout.workout_date),
+        ),
+        Case(
+            "workout_date_range_filter",
+            lambda: processes.workout_date_range_filter(
+                USER, workout.workout_date, workout.workout_date + timedelta(days=30)
+            ),
+        ),
+        Case(
+            "exercise_join_filter(workout)",
+            lambda: processes.exercise_join_filter(USER, workout_id=workout.object_id),
+        ),
+        Case(
+            "exercise_join_filter(exercise)",
+            lambda: processes.exercise_join_filter(
+                USER, exercise_id=exercise.object_id
+            ),
+        ),
+        Case(
+            "ids_from_exercise_joins",
+            lambda: processes.ids_from_exercise_joins(seeded.exercise_joins),
+        ),
+        Case(
+            "exercises_from_workout_id",
+            lambda: processes.exercises_from_workout_id(USER, workout.object_id),
+        ),
+        Case(
+            "sets_from_ids(workout)",
+            lambda: processes.sets_from_ids(USER, workout_id=workout.object_id),
+        ),
+        Case(
+            "sets_from_ids(exercise)",
+            lambda: processes.sets_from_ids(USER, exercise_id=exercise.object_id),
+        ),
+        Case(
+            "tag_join_filter(target)",
+            lambda: processes.tag_join_filter(USER, target_id=tag_join.target_id),
+        ),
+        Case(
+            "tag_join_filter(tag)",
+            lambda: processes.tag_join_filter(USER, tag_id=tag.object_id),
+        ),
+        Case(
+            "tags_from_target_id",
+            lambda: processes.tags_from_target_id(USER, target_id=tag_join.target_id),
+        ),
+        Case(
+            "objects_by_id(Set)",
+            lambda: processes.objects_by_id(
+                Set, USER, [set.object_id for set in seeded.sets[:BATCH_SIZE]]
+            ),
+        ),
+        Case(
+            "tag_joins_from_target_ids",
+            lambda: processes.tag_joins_from_target_ids(
+                USER, [workout.object_id for workout in seeded.workouts[:BATCH_SIZE]]
+            ),
+        ),
+        Case("sets_from_joins", lambda: processes.sets_from_joins(USER, joins)),
+        Case(
+            "workout_detail",
+            lambda: loop.run_until_complete(
+                processes.workout_detail(USER, workout.object_id)
+            ),
+        ),
+    ]
+
+
+def _stored_workout(seeded: SeededUser, exercise_count: int, set_count: int):
+    """Stores a new workout with its joins and sets, returning the workout and joins"""
+    workout = Workout.model_validate(
+        {"workout_date": "2025-01-01", "notes": "", "title": "Push"}
+    )
+    workout.init_from_request(USER, ObjectType.WORKOUT)
+    joins, sets = [], []
+    for exercise in seeded.exercises[:exercise_count]:
+        join = ExerciseJoin.model_validate(
+            {"workout_id": workout.object_id, "exercise_id": exercise.object_id}
+        )
+        join.init_from_request(USER, ObjectType.EXCERCISE_JOIN)
+        joins.append(join)
+        for _ in range(set_count):
+            set = Set.model_validate(
+                {
+                    "set_type": SetType.WORKING.value,
+                    "weight": 100,
+                    "unit": WeightUnit.KILOGRAMS.value,
+                    "reps": 5,
+                    "notes": "",
+                    "exercise_join_id": str(join.object_id),
+                }
+            )
+            set.init_from_request(USER, ObjectType.SET)
+            sets.append(set)
+    get_db_instance().batch_write(put_objects=[workout, *joins, *sets])
+    return workout, joins
+
+
+def write_process_cases(seeded: SeededUser) -> list[Case]:
+    def new_set() -> Set:
+        return Set.model_validate(
+            {
+                "set_type": SetType.WORKING.value,
+                "weight": 100,
+                "unit": WeightUnit.KILOGRAMS.value,
+                "reps": 5,
+                "notes": "",
+                "exercise_join_id": str(seeded.exercise_joins[-1].object_id),
+            }
+        )
+
+    def stored_set() -> tuple:
+        return (RestProcesses.post(Set, USER, new_set()),)
+
+    set_patch = Set.partial_model()
+    workout_patch = Workout.partial_model()
+
+    def redated_workout() -> tuple:
+        workout, _ = _stored_workout(seeded, 7, 10)
+        RestProcesses.patch(
+            Workout, USER, workout.object_id, workout_patch(workout_date="2025-01-02")
+        )
+        return ()
+
+    return [
+        Case(
+            "RestProcesses.post(Set)", lambda: RestProcesses.post(Set, USER, new_set())
+        ),
+        Case(
+            "RestProcesses.put(Set)",
+            lambda stored: RestProcesses.put(Set, USER, stored),
+            stored_set,
+        ),
+        Case(
+            "RestProcesses.patch(Set)",
+            lambda stored: RestProcesses.patch(
+                Set, USER, stored.object_id, set_patch(reps=6)
+            ),
+            stored_set,
+        ),
+        Case(
+            "RestProcesses.delete(Set)",
+            lambda stored: RestProcesses.delete(Set, USER, stored.object_id),
+            stored_set,
+        ),
+        Case(
+            "delete_exercise_join_cascade",
+            lambda join: processes.delete_exercise_join_cascade(USER, join),
+            lambda: (_stored_workout(seeded, 1, 10)[1][0],),
+        ),
+        Case(
+            "delete_workout_cascade",
+            lambda workout: processes.delete_workout_cascade(USER, workout.object_id),
+            lambda: (_stored_workout(seeded, 7, 10)[0],),
+        ),
+        # Re-dating marks the aggregates of the workout's exercises stale, and
+        # the next summary rebuilds them
+        Case(
+            "RestProcesses.patch(Workout) re-dated",
+            lambda workout: RestProcesses.patch(
+                Workout,
+                USER,
+                workout.object_id,
+                workout_patch(workout_date="2025-01-02"),
+            ),
+            lambda: (_stored_workout(seeded, 7, 10)[0],),
+        ),
+        Case(
+            "stats_summary after a re-date",
+            lambda: asyncio.run(processes.stats_summary(USER)),
+            redated_workout,
+        ),
+    ]
+
+
+def measure(case: Case, repeat: int) -> Result:
+    durations = []
+    for _ in range(repeat):
+        args = case.prepare() if case.prepare else ()
+        with collect_call_metrics() as metrics:
+            started_at = time.perf_counter()
+            case.run(*args)
+            durations.append(time.perf_counter() - started_at)
+    return Result(
+        ms=round(statistics.median(durations) * 1000, 2),
+        calls=metrics.calls,
+        items_read=metrics.items_read,
+    )
+
+
+def check(results: dict[str, Result], baselines: dict, tolerance: float) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        baseline = baselines["cases"].get(name)
+        if baseline is None:
+            continue
+        if result.calls > baseline["calls"]:
+            failures.append(f"{name}: {result.calls} calls, was {baseline['calls']}")
+        if result.items_read > baseline["items_read"]:
+            failures.append(
+                f"{name}: {result.items_read} items read, was {baseline['items_read']}"
+            )
+        if result.ms > baseline["ms"] * (1 + tolerance):
+            failures.append(f"{name}: {result.ms}ms, was {baseline['ms']}ms")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="Only run cases whose name contains this")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--update", action="store_true")
+    mode.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-2")
+    os.environ["DYNAMO_TABLE_NAME"] = MOCK_DYNAMO_TABLE_NAME
+    os.environ["CURSOR_SECRET_KEY"] = MOCK_CURSOR_SECRET_KEY
+    # The stand-in table is created with every index already built
+    os.environ.setdefault("ADJACENCY_INDEXES_ENABLED", "true")
+    os.environ.setdefault("WORKOUT_DATE_INDEX_ENABLED", "true")
+    os.environ.setdefault("SYNC_INDEX_ENABLED", "true")
+
+    with moto.mock_aws():
+        create_table(boto3.client("dynamodb"))
+        started_at = time.perf_counter()
+        seeded = seed_user(USER, days=args.days)
+        print(
+            f"Seeded {len(seeded.objects()):,} objects ({len(seeded.sets):,} sets)"
+            f" in {time.perf_counter() - started_at:.1f}s"
+        )
+
+        # Reads first, so they see the seeded data and nothing else
+        cases = [
+            *read_route_cases(seeded),
+            *read_process_cases(seeded),
+            *write_route_cases(seeded),
+            *write_process_cases(seeded),
+        ]
+        results = {}
+        for case in cases:
+            if args.only and args.only not in case.name:
+                continue
+            results[case.name] = result = measure(case, args.repeat)
+            print(
+                f"{case.name:<48} {result.ms:>10.2f}ms"
+                f" {result.calls:>6} calls {result.items_read:>8} items read"
+            )
+
+    if args.update:
+        cases = {}
+        if args.only and BASELINES_PATH.exists():
+            baselines = json.loads(BASELINES_PATH.read_text())
+            if baselines["days"] == args.days:
+                cases = baselines["cases"]
+        cases.update({name: result._asdict() for name, result in results.items()})
+
+        BASELINES_PATH.write_text(
+            json.dumps({"days": args.days, "cases": cases}, indent=2) + "\n"
+        )
+        return
+
+    if args.check:
+        baselines = json.loads(BASELINES_PATH.read_text())
+        if baselines["days"] != args.days:
+            sys.exit(f"Baselines were recorded with --days {baselines['days']}")
+        failures = check(results, baselines, args.tolerance)
+        for failure in failures:
+            print(f"Regression in {failure}")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
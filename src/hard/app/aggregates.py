@@ -0,0 +1,464 @@
+"""
+Per-exercise running totals, kept up to date as sets are written
+
+    python -m hard.app.aggregates [USER_ID ...]
+
+recomputes them from the stored sets (for every user, if none are given),
+to repair any that have drifted
+"""
+
+import sys
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
+
+from hard.app.analytics import (
+    SET_ITEM_FIELDS,
+    STATS_DECIMALS,
+    SetColumns,
+    exercise_columns,
+    join_targets,
+    user_columns,
+)
+from hard.app.schemas import ExerciseTotals, StatsSummary, WeeklyVolume
+from hard.aws.dynamodb.consts import (
+    AGGREGATE_PARTITION_TEMPLATE,
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DELIMITER,
+    PARTITION_TEMPLATE,
+    ConditionalCheckFailedError,
+)
+from hard.aws.dynamodb.handler import Attr, Key, get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models.set import Set
+
+AGGREGATE_DECIMALS = 4
+
+SET_COUNT_ATTRIBUTE = "set_count"
+VOLUME_ATTRIBUTE = "total_volume"
+BEST_E1RM_ATTRIBUTE = "best_e1rm"
+LAST_PERFORMED_ATTRIBUTE = "last_performed"
+# Working sets on the `last_performed` date, so a delete can tell when it moves back
+LAST_PERFORMED_SETS_ATTRIBUTE = "last_performed_sets"
+# Counts the writes since the last rebuild that moved sets wholesale, which the
+# totals don't reflect (see `mark_stale`)
+STALE_ATTRIBUTE = "stale"
+# `ADD` only reaches top-level attributes, so each week is a pair of them:
+# "week#{week_start}#sets" and "week#{week_start}#volume"
+WEEK_ATTRIBUTE_PREFIX = "week" + DELIMITER
+WEEK_SETS_SUFFIX = DELIMITER + "sets"
+WEEK_VOLUME_SUFFIX = DELIMITER + "volume"
+
+
+class Contribution(NamedTuple):
+    """What one working set adds to its exercise's aggregate"""
+
+    performed_on: date
+    week_start: date
+    volume: Decimal
+    e1rm: Decimal
+
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(round(value, AGGREGATE_DECIMALS)))
+
+
+def _aggregate_key(user_id: str, exercise_id: str) -> dict[str, str]:
+    return {
+        DB_PARTITION: AGGREGATE_PARTITION_TEMPLATE.format(user_id=user_id),
+        DB_SORT_KEY: exercise_id,
+    }
+
+
+def _week_attribute(week_start: date, suffix: str) -> str:
+    return WEEK_ATTRIBUTE_PREFIX + week_start.isoformat() + suffix
+
+
+def contributions(columns: SetColumns) -> dict[str, list[Contribution]]:
+    """The sets in `columns`, grouped by exercise id"""
+    grouped = {exercise_id: [] for exercise_id in columns.exercise_ids}
+    for index, day, week, volume, e1rm in zip(
+        columns.exercise,
+        columns.day,
+        columns.weeks(),
+        columns.volumes(),
+        columns.e1rms(),
+    ):
+        grouped[columns.exercise_ids[index]].append(
+            Contribution(
+                performed_on=date.fromordinal(day),
+                week_start=date.fromordinal(week),
+                volume=_decimal(volume),
+                e1rm=_decimal(e1rm),
+            )
+        )
+    return {exercise_id: sets for exercise_id, sets in grouped.items() if sets}
+
+
+def set_placements(user: User, sets: list[Set]) -> dict[str, tuple[str, date]]:
+    """`join_targets` for the joins of `sets`, as currently stored"""
+    db = get_db_instance()
+
+    join_items = db.get_items_by_id(
+        list(dict.fromkeys(set.exercise_join_id for set in sets)),
+        partition=PARTITION_TEMPLATE.format(
+            user_id=user.id, object_type=ObjectType.EXCERCISE_JOIN.value
+        ),
+    )
+    workout_items = db.get_items_by_id(
+        [item["workout_id"] for item in join_items],
+        partition=PARTITION_TEMPLATE.format(
+            user_id=user.id, object_type=ObjectType.WORKOUT.value
+        ),
+    )
+    return join_targets(join_items, workout_items)
+
+
+def record_set_changes(
+    user: User,
+    removed: list[Set] = (),
+    added: list[Set] = (),
+    placements: Optional[dict[str, tuple[str, date]]] = None,
+) -> None:
+    """
+    Applies a write that `removed` and/or `added` sets to their exercises'
+    aggregates (an update is both, of the old and new versions of a set)
+
+    Each exercise costs one `UpdateItem` of `ADD`s, plus a conditional one
+    when the best e1RM or last performed date moves forward. When a delete
+    takes away the best or only latest set, the exercise is rebuilt instead.
+    `placements` (see `set_placements`) is read unless given, which it must
+    be if the joins or workouts of the sets may already have been deleted
+    """
+    if not (removed or added):
+        return
+
+    if placements is None:
+        placements = set_placements(user, [*removed, *added])
+
+    removed_by_exercise, added_by_exercise = (
+        contributions(
+            SetColumns.from_items(
+                (set.db_values(include=SET_ITEM_FIELDS) for set in sets), placements
+            )
+        )
+        for sets in (removed, added)
+    )
+
+    for exercise_id in dict.fromkeys([*removed_by_exercise, *added_by_exercise]):
+        _apply(
+            user,
+            exercise_id,
+            removed_by_exercise.get(exercise_id, []),
+            added_by_exercise.get(exercise_id, []),
+        )
+
+
+def record_added_sets(user: User, columns: SetColumns) -> None:
+    """
+    `record_set_changes` for sets that were only added, gathered up in
+    `columns` (e.g. over a whole import) so each exercise is updated once
+    """
+    db = get_db_instance()
+
+    for exercise_id, added in contributions(columns).items():
+        if not added:
+            continue
+
+        key = _aggregate_key(user.id, exercise_id)
+        try:
+            # Usually a new exercise, written whole rather than added to
+            db.put_item(
+                _aggregate_item(key, added),
+                condition_expression=Attr(DB_PARTITION).not_exists(),
+            )
+
+        except ConditionalCheckFailedError:
+            _apply(user, exercise_id, [], added)
+
+
+def _apply(
+    user: User,
+    exercise_id: str,
+    removed: list[Contribution],
+    added: list[Contribution],
+) -> None:
+    db = get_db_instance()
+    key = _aggregate_key(user.id, exercise_id)
+
+    amounts = {SET_COUNT_ATTRIBUTE: len(added) - len(removed), VOLUME_ATTRIBUTE: 0}
+    for sets, sign in ((removed, -1), (added, 1)):
+        for contribution in sets:
+            week_sets = _week_attribute(contribution.week_start, WEEK_SETS_SUFFIX)
+            week_volume = _week_attribute(contribution.week_start, WEEK_VOLUME_SUFFIX)
+            amounts[VOLUME_ATTRIBUTE] += sign * contribution.volume
+            amounts[week_sets] = amounts.get(week_sets, 0) + sign
+            amounts[week_volume] = (
+                amounts.get(week_volume, 0) + sign * contribution.volume
+            )
+
+    item = db.add(key, amounts)
+    if STALE_ATTRIBUTE in item:
+        # Recomputed in full when next read (see `aggregate_items`)
+        return
+    if item[SET_COUNT_ATTRIBUTE] <= 0:
+        # Drops the emptied aggregate, along with its zeroed weeks
+        rebuild_exercise(user, exercise_id)
+        return
+
+    best = item.get(BEST_E1RM_ATTRIBUTE)
+    removed_best = max((set.e1rm for set in removed), default=None)
+    added_best = max((set.e1rm for set in added), default=None)
+    stale = (
+        best is not None
+        and removed_best is not None
+        and removed_best >= best
+        and (added_best is None or added_best < removed_best)
+    )
+
+    last = item.get(LAST_PERFORMED_ATTRIBUTE)
+    last = date.fromisoformat(last) if last is not None else None
+    latest_added = max((set.performed_on for set in added), default=None)
+
+    if latest_added is not None and (last is None or latest_added > last):
+        _raise_max(
+            key,
+            LAST_PERFORMED_ATTRIBUTE,
+            latest_added.isoformat(),
+            {
+                LAST_PERFORMED_SETS_ATTRIBUTE: sum(
+                    set.performed_on == latest_added for set in added
+                )
+            },
+        )
+    elif last is not None:
+        change = sum(set.performed_on == last for set in added) - sum(
+            set.performed_on == last for set in removed
+        )
+        if change:
+            counts = db.add(key, {LAST_PERFORMED_SETS_ATTRIBUTE: change})
+            stale = stale or counts[LAST_PERFORMED_SETS_ATTRIBUTE] <= 0
+
+    if stale:
+        rebuild_exercise(user, exercise_id)
+    elif added_best is not None and (best is None or added_best > best):
+        _raise_max(key, BEST_E1RM_ATTRIBUTE, added_best)
+
+
+def _raise_max(
+    key: dict[str, str], attr: str, value, extra_attrs: Optional[dict] = None
+) -> None:
+    """Sets `attr` to `value` (with `extra_attrs`), unless it's already higher"""
+    try:
+        get_db_instance().update(
+            key=key,
+            set_attrs={attr: value, **(extra_attrs or {})},
+            condition_expression=Attr(attr).not_exists() | Attr(attr).lt(value),
+        )
+
+    except ConditionalCheckFailedError:
+        # A concurrent write stored a higher value first
+        pass
+
+
+def _aggregate_item(key: dict[str, str], sets: list[Contribution]) -> dict[str]:
+    last = max(set.performed_on for set in sets)
+    item = {
+        **key,
+        SET_COUNT_ATTRIBUTE: len(sets),
+        VOLUME_ATTRIBUTE: sum(set.volume for set in sets),
+        BEST_E1RM_ATTRIBUTE: max(set.e1rm for set in sets),
+        LAST_PERFORMED_ATTRIBUTE: last.isoformat(),
+        LAST_PERFORMED_SETS_ATTRIBUTE: sum(set.performed_on == last for set in sets),
+    }
+    for set in sets:
+        week_sets = _week_attribute(set.week_start, WEEK_SETS_SUFFIX)
+        week_volume = _week_attribute(set.week_start, WEEK_VOLUME_SUFFIX)
+        item[week_sets] = item.get(week_sets, 0) + 1
+        item[week_volume] = item.get(week_volume, 0) + set.volume
+    return item
+
+
+def mark_stale(user: User, exercise_ids: Iterable[str]) -> None:
+    """
+    Flags the aggregates of `exercise_ids` to be rebuilt when next read (see
+    `aggregate_items`), after a write that moved their sets wholesale, such
+    as re-dating a workout. One `UpdateItem` each, reading nothing
+    """
+    db = get_db_instance()
+    for exercise_id in exercise_ids:
+        db.add(_aggregate_key(user.id, str(exercise_id)), {STALE_ATTRIBUTE: 1})
+
+
+def rebuild_exercise(
+    user: User, exercise_id: str, stale: Optional[Decimal] = None
+) -> Optional[dict[str]]:
+    """
+    Recomputes one exercise's aggregate from its stored sets, returning it
+    (`None` if there are no sets). See `rebuild_exercises`
+    """
+    return rebuild_exercises(user, {exercise_id: stale})[exercise_id]
+
+
+def rebuild_exercises(
+    user: User, stale: dict[str, Optional[Decimal]]
+) -> dict[str, Optional[dict[str]]]:
+    """
+    Recomputes the aggregates of the exercises in `stale` from their stored
+    sets, read together, returning them by exercise id (`None` for those
+    without sets)
+
+    Each write only goes ahead if the aggregate is still marked as many
+    times as given, as read beforehand (or is unmarked, for `None`). If it
+    was marked again in the meantime, the rebuild is not stored and the
+    next read does it again
+    """
+    if not stale:
+        return {}
+
+    db = get_db_instance()
+    by_exercise = contributions(exercise_columns(user, *stale))
+    items = {}
+    for exercise_id, marks in stale.items():
+        key = _aggregate_key(user.id, exercise_id)
+        sets = by_exercise.get(exercise_id)
+        condition = (
+            Attr(STALE_ATTRIBUTE).not_exists()
+            if marks is None
+            else Attr(STALE_ATTRIBUTE).eq(marks)
+        )
+        items[exercise_id] = _aggregate_item(key, sets) if sets else None
+
+        try:
+            if items[exercise_id] is not None:
+                db.put_item(items[exercise_id], condition_expression=condition)
+            else:
+                db.delete_item(key, condition_expression=condition)
+
+        except ConditionalCheckFailedError:
+            pass
+
+    return items
+
+
+def rebuild_user(user: User) -> int:
+    """
+    Recomputes all of the user's aggregates from their stored sets,
+    dropping those of exercises without any. Returns the number written
+    """
+    db = get_db_instance()
+
+    stored_ids = {item[DB_SORT_KEY] for item in _stored_aggregate_items(user)}
+    by_exercise = contributions(user_columns(user))
+
+    for exercise_id, sets in by_exercise.items():
+        db.put_item(_aggregate_item(_aggregate_key(user.id, exercise_id), sets))
+    for exercise_id in stored_ids - set(by_exercise):
+        db.delete_item(_aggregate_key(user.id, exercise_id))
+
+    return len(by_exercise)
+
+
+def aggregate_items(user: User) -> list[dict[str]]:
+    """
+    The user's aggregates: one item per exercise, however many sets logged
+
+    Those marked stale (see `mark_stale`) are rebuilt first, so it is the
+    next read after a workout is re-dated or a join moved that recomputes
+    the exercises involved, rather than the write itself
+    """
+    items = _stored_aggregate_items(user)
+    rebuilt = rebuild_exercises(
+        user,
+        {
+            item[DB_SORT_KEY]: item[STALE_ATTRIBUTE]
+            for item in items
+            if STALE_ATTRIBUTE in item
+        },
+    )
+    items = [rebuilt.get(item[DB_SORT_KEY], item) for item in items]
+    return [item for item in items if item is not None]
+
+
+def _stored_aggregate_items(user: User) -> list[dict[str]]:
+    return get_db_instance().query(
+        key_expression=Key(DB_PARTITION).eq(
+            AGGREGATE_PARTITION_TEMPLATE.format(user_id=user.id)
+        )
+    )
+
+
+def summarize(items: list[dict[str]], names: dict[str, str]) -> StatsSummary:
+    """A `StatsSummary` of the aggregate `items`, with exercise `names` by id"""
+    exercises = []
+    weeks = {}
+
+    for item in items:
+        if item[SET_COUNT_ATTRIBUTE] <= 0:
+            continue
+
+        for attr, value in item.items():
+            if attr.startswith(WEEK_ATTRIBUTE_PREFIX) and attr.endswith(
+                WEEK_SETS_SUFFIX
+            ):
+                week_start = attr[len(WEEK_ATTRIBUTE_PREFIX) : -len(WEEK_SETS_SUFFIX)]
+                set_count, volume = weeks.get(week_start, (0, 0))
+                weeks[week_start] = (
+                    set_count + value,
+                    volume + item[attr[: -len(WEEK_SETS_SUFFIX)] + WEEK_VOLUME_SUFFIX],
+                )
+
+        best = item.get(BEST_E1RM_ATTRIBUTE)
+        last = item.get(LAST_PERFORMED_ATTRIBUTE)
+        exercises.append(
+            ExerciseTotals(
+                exercise_id=item[DB_SORT_KEY],
+                name=names.get(item[DB_SORT_KEY]),
+                set_count=int(item[SET_COUNT_ATTRIBUTE]),
+                total_volume=round(float(item[VOLUME_ATTRIBUTE]), STATS_DECIMALS),
+                best_e1rm=round(float(best), STATS_DECIMALS) if best else None,
+                last_performed=date.fromisoformat(last) if last else None,
+            )
+        )
+
+    return StatsSummary(
+        set_count=sum(exercise.set_count for exercise in exercises),
+        total_volume=round(
+            sum(exercise.total_volume for exercise in exercises), STATS_DECIMALS
+        ),
+        weekly_volume=[
+            WeeklyVolume(
+                week_start=date.fromisoformat(week_start),
+                set_count=int(set_count),
+                volume=round(float(volume), STATS_DECIMALS),
+            )
+            for week_start, (set_count, volume) in sorted(weeks.items())
+            if set_count > 0
+        ],
+        exercises=sorted(
+            exercises,
+            key=lambda totals: totals.last_performed or date.min,
+            reverse=True,
+        ),
+    )
+
+
+def aggregated_user_ids() -> set[str]:
+    """Everyone with sets or aggregates stored, from a scan of the whole table"""
+    suffixes = (
+        DELIMITER + ObjectType.SET.value,
+        AGGREGATE_PARTITION_TEMPLATE.format(user_id=""),
+    )
+    return {
+        item[DB_PARTITION].rsplit(DELIMITER, 1)[0]
+        for item in get_db_instance().scan_iter()
+        if item[DB_PARTITION].endswith(suffixes)
+    }
+
+
+if __name__ == "__main__":
+    for user_id in sys.argv[1:] or sorted(aggregated_user_ids()):
+        written = rebuild_user(User(id=user_id, email=""))
+        print(f"Rebuilt {written} exercise aggregates for {user_id}")
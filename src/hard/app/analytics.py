@@ -0,0 +1,292 @@
+from array import array
+from collections import Counter
+from datetime import date
+from typing import Iterable
+from uuid import UUID
+
+from hard.app.schemas import ExerciseStats, ExerciseTotals, RepRecord, WeeklyVolume
+from hard.aws.dynamodb.consts import (
+    ALT_PARENT_INDEX_NAME,
+    DB_PARTITION,
+    PARTITION_TEMPLATE,
+)
+from hard.aws.dynamodb.handler import Key, get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+
+LBS_TO_KG = 0.45359237
+STATS_DECIMALS = 2
+
+# The `Set` attributes read by `SetColumns.from_items`
+SET_ITEM_FIELDS = {"exercise_join_id", "set_type", "weight", "unit", "reps"}
+
+# Joins up to which an exercise's sets are looked up join by join; past it,
+# reading the whole `Set` partition takes fewer requests
+SET_LOOKUP_MAX_JOINS = 25
+
+
+class SetColumns:
+    """
+    Working sets as parallel arrays, one position per set
+
+    Built straight from raw DynamoDB items (skipping model validation),
+    with weights normalized to kilograms and each set placed on its
+    exercise (an index into `exercise_ids`) and its workout's date (as
+    a `date.toordinal()`) through the set's `ExerciseJoin`
+    """
+
+    def __init__(self, exercise_ids: list[str]) -> None:
+        self.exercise_ids = exercise_ids
+        self.exercise = array("l")
+        self.day = array("l")
+        self.weight = array("d")
+        self.reps = array("d")
+
+    def __len__(self) -> int:
+        return len(self.weight)
+
+    @classmethod
+    def from_items(
+        cls, items: Iterable[dict[str]], join_targets: dict[str, tuple[str, date]]
+    ) -> "SetColumns":
+        """
+        `join_targets` maps `ExerciseJoin` ids to their exercise id and workout
+        date. Warmups, and sets whose join is missing from it, are left out
+        """
+        columns = cls([])
+        columns.extend(items, join_targets)
+        return columns
+
+    def extend(
+        self, items: Iterable[dict[str]], join_targets: dict[str, tuple[str, date]]
+    ) -> None:
+        """Appends more sets, as for `from_items`, adding any new exercises"""
+        exercise_indexes = {
+            exercise_id: index for index, exercise_id in enumerate(self.exercise_ids)
+        }
+        for exercise_id, _ in join_targets.values():
+            if exercise_id not in exercise_indexes:
+                exercise_indexes[exercise_id] = len(self.exercise_ids)
+                self.exercise_ids.append(exercise_id)
+
+        positions = {
+            join_id: (exercise_indexes[exercise_id], workout_date.toordinal())
+            for join_id, (exercise_id, workout_date) in join_targets.items()
+        }
+
+        working, pounds = SetType.WORKING.value, WeightUnit.POUNDS.value
+        # Bound once, as this loop runs for every set the user has logged
+        append_exercise, append_day = self.exercise.append, self.day.append
+        append_weight, append_reps = self.weight.append, self.reps.append
+
+        for item in items:
+            position = positions.get(item["exercise_join_id"])
+            if position is None or item["set_type"] != working:
+                continue
+
+            weight = float(item["weight"])
+            if item["unit"] == pounds:
+                weight *= LBS_TO_KG
+
+            append_exercise(position[0])
+            append_day(position[1])
+            append_weight(weight)
+            append_reps(float(item["reps"]))
+
+    def volumes(self) -> array:
+        """Tonnage of each set: weight x reps"""
+        return array(
+            "d", [weight * reps for weight, reps in zip(self.weight, self.reps)]
+        )
+
+    def e1rms(self) -> array:
+        """Estimated one rep max of each set, see `epley`"""
+        return array("d", map(epley, self.weight, self.reps))
+
+    def weeks(self) -> array:
+        """Ordinal of the Monday starting each set's week"""
+        # Ordinal 1 (0001-01-01) is a Monday
+        return array("l", [day - (day + 6) % 7 for day in self.day])
+
+
+def epley(weight: float, reps: float) -> float:
+    """Estimated one rep max by the Epley formula, exact for a single rep"""
+    if reps <= 0:
+        return 0.0
+    if reps == 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def weekly_volume(weeks: array, volumes: array) -> list[WeeklyVolume]:
+    set_counts = Counter(weeks)
+    totals = dict.fromkeys(set_counts, 0.0)
+    for week, volume in zip(weeks, volumes):
+        totals[week] += volume
+
+    return [
+        WeeklyVolume(
+            week_start=date.fromordinal(week),
+            set_count=set_counts[week],
+            volume=round(totals[week], STATS_DECIMALS),
+        )
+        for week in sorted(totals)
+    ]
+
+
+def rep_records(columns: SetColumns) -> list[RepRecord]:
+    """The heaviest set at each (whole) number of reps, oldest on a tie"""
+    best = {}
+    for weight, reps, day in zip(columns.weight, columns.reps, columns.day):
+        if reps < 1 or not reps.is_integer():
+            continue
+
+        record = best.get(reps)
+        if record is None or (-weight, day) < (-record[0], record[1]):
+            best[reps] = (weight, day)
+
+    return [
+        RepRecord(
+            reps=int(reps),
+            weight=round(weight, STATS_DECIMALS),
+            performed_on=date.fromordinal(day),
+        )
+        for reps, (weight, day) in sorted(best.items())
+    ]
+
+
+def exercise_totals(
+    columns: SetColumns, volumes: array, e1rms: array, names: dict[str, str]
+) -> list[ExerciseTotals]:
+    """Totals for each of `columns.exercise_ids`, in that order"""
+    exercise_count = len(columns.exercise_ids)
+    set_counts = [0] * exercise_count
+    total_volumes = [0.0] * exercise_count
+    best_e1rms = [0.0] * exercise_count
+    last_days = [0] * exercise_count
+
+    for index, volume, e1rm, day in zip(columns.exercise, volumes, e1rms, columns.day):
+        set_counts[index] += 1
+        total_volumes[index] += volume
+        if e1rm > best_e1rms[index]:
+            best_e1rms[index] = e1rm
+        if day > last_days[index]:
+            last_days[index] = day
+
+    return [
+        ExerciseTotals(
+            exercise_id=exercise_id,
+            name=names.get(exercise_id),
+            set_count=set_counts[index],
+            total_volume=round(total_volumes[index], STATS_DECIMALS),
+            best_e1rm=(
+                round(best_e1rms[index], STATS_DECIMALS) if best_e1rms[index] else None
+            ),
+            last_performed=(
+                date.fromordinal(last_days[index]) if last_days[index] else None
+            ),
+        )
+        for index, exercise_id in enumerate(columns.exercise_ids)
+    ]
+
+
+def compute_exercise_stats(columns: SetColumns, exercise: Exercise) -> ExerciseStats:
+    """Stats for `exercise` from `columns` holding only its sets"""
+    volumes = columns.volumes()
+    (totals,) = exercise_totals(
+        columns, volumes, columns.e1rms(), {str(exercise.object_id): exercise.name}
+    ) or [
+        ExerciseTotals(
+            exercise_id=exercise.object_id,
+            name=exercise.name,
+            set_count=0,
+            total_volume=0.0,
+        )
+    ]
+
+    return ExerciseStats(
+        **totals.model_dump(),
+        rep_records=rep_records(columns),
+        weekly_volume=weekly_volume(columns.weeks(), volumes),
+    )
+
+
+def join_targets(
+    join_items: list[dict[str]], workout_items: list[dict[str]]
+) -> dict[str, tuple[str, date]]:
+    """
+    Raw `ExerciseJoin` ids -> their exercise id and workout date (see `SetColumns`)
+
+    Joins whose workout is not among `workout_items` are left out
+    """
+    workout_dates = {
+        item["object_id"]: date.fromisoformat(item["workout_date"])
+        for item in workout_items
+    }
+    return {
+        item["object_id"]: (item["exercise_id"], workout_dates[item["workout_id"]])
+        for item in join_items
+        if item["workout_id"] in workout_dates
+    }
+
+
+def _partition_items(user: User, object_type: ObjectType) -> Iterable[dict[str]]:
+    return get_db_instance().query_iter(
+        key_expression=Key(DB_PARTITION).eq(
+            PARTITION_TEMPLATE.format(
+                **{"user_id": user.id, "object_type": object_type.value}
+            )
+        )
+    )
+
+
+def exercise_columns(user: User, *exercise_ids: UUID | str) -> SetColumns:
+    """
+    The working sets of one or more exercises, through their joins and
+    the joins' workouts
+
+    The joins are one lookup per exercise and the workouts one partition
+    read. The sets are looked up per join for up to `SET_LOOKUP_MAX_JOINS`
+    joins, and otherwise read as a whole partition and matched in memory
+    (as in `user_columns`), so the number of requests stays bounded
+    however long the history
+    """
+    db = get_db_instance()
+
+    join_items = db.query_children(
+        user,
+        parent_ids=[str(exercise_id) for exercise_id in exercise_ids],
+        child_type=ObjectType.EXCERCISE_JOIN,
+        secondary_index_name=ALT_PARENT_INDEX_NAME,
+    )
+    if not join_items:
+        return SetColumns([])
+
+    targets = join_targets(join_items, list(_partition_items(user, ObjectType.WORKOUT)))
+
+    if len(join_items) <= SET_LOOKUP_MAX_JOINS:
+        set_items = db.query_children(
+            user,
+            parent_ids=[item["object_id"] for item in join_items],
+            child_type=ObjectType.SET,
+        )
+    else:
+        set_items = _partition_items(user, ObjectType.SET)
+
+    return SetColumns.from_items(set_items, targets)
+
+
+def user_columns(user: User) -> SetColumns:
+    """
+    Every working set the user has logged, from whole partition reads
+
+    Joins and workouts are read up front to place each set, while the
+    sets themselves are consumed a page at a time
+    """
+    targets = join_targets(
+        list(_partition_items(user, ObjectType.EXCERCISE_JOIN)),
+        list(_partition_items(user, ObjectType.WORKOUT)),
+    )
+    return SetColumns.from_items(_partition_items(user, ObjectType.SET), targets)
@@ -0,0 +1,420 @@
+from http import HTTPStatus
+from typing import Callable, Optional, Type
+from uuid import UUID
+
+from hard.app.aggregates import set_placements
+from hard.app.errors import InvalidBatchError
+from hard.app.processes import (
+    AGGREGATED_CLASSES,
+    invalidate_objects,
+    sets_from_joins,
+    update_aggregates,
+    update_set_aggregates,
+)
+from hard.app.schemas import BatchItemResult, BatchResult
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE, unique_timestamps
+from hard.aws.dynamodb.consts import (
+    DB_PARTITION,
+    DELIMITER,
+    ITEM_INDEX_PARTITION,
+    PARTITION_TEMPLATE,
+    TRANSACT_WRITE_MAX_ITEMS,
+    TransactionCanceledError,
+)
+from hard.aws.dynamodb.handler import Attr, get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+
+# Objects that own others, and how to find what goes with them on delete
+DESCENDANTS: dict[Type[DB_OBJECT_TYPE], Callable[[User, list], list]] = {
+    ExerciseJoin: sets_from_joins,
+}
+
+
+def batch_post(
+    object_cls: Type[DB_OBJECT_TYPE],
+    user: User,
+    data_objects: list[DB_OBJECT_TYPE],
+    atomic: bool = False,
+) -> BatchResult:
+    """
+    Creates (or, where the `object_id` is already stored, replaces) many items
+
+    Every item is checked before anything is written, with one concurrent
+    id lookup for the items that carry an `object_id`. Valid items are then
+    written with chunked `BatchWriteItem` (replaces with conditional puts,
+    reported as not found if deleted since the check), or, if `atomic`, in
+    a single transaction that is only attempted when every item is valid
+    """
+    db = get_db_instance()
+    object_type = ObjectType.from_object_class(object_cls)
+    partition = _partition(object_cls, user)
+    # `datetime.now()` can repeat within a batch, and a repeated sort key
+    # would overwrite the item before it, so new items take theirs from a
+    # generator that never repeats
+    timestamps = unique_timestamps()
+
+    stored = {
+        item[ITEM_INDEX_PARTITION]: item
+        for item in db.get_items_by_id(
+            [
+                data_object.object_id
+                for data_object in data_objects
+                if data_object.object_id
+            ]
+        )
+    }
+
+    results: list[BatchItemResult] = []
+    writes: list[tuple[int, DB_OBJECT_TYPE, object]] = []
+    seen_ids: set[UUID] = set()
+
+    for index, data_object in enumerate(data_objects):
+        object_id = data_object.object_id
+        stored_item = stored.get(str(object_id)) if object_id else None
+
+        if data_object.user_id is not None and not data_object.owned_by(user):
+            error = (
+                HTTPStatus.UNAUTHORIZED,
+                f"`{object_type.value}` Item not owned by current user ({user.id}): Cannot Create",
+            )
+        elif object_id in seen_ids:
+            error = (
+                HTTPStatus.BAD_REQUEST,
+                f"Duplicate `object_id` in batch: '{object_id}'",
+            )
+        elif stored_item is not None and stored_item[DB_PARTITION] != partition:
+            error = (
+                HTTPStatus.CONFLICT,
+                f"Found `{object_type.value}` with `object_id`: '{object_id}': Cannot Create",
+            )
+        else:
+            error = None
+
+        if object_id:
+            seen_ids.add(object_id)
+
+        if error is not None:
+            results.append(_error_result(index, object_id, *error))
+            continue
+
+        if stored_item is None:
+            data_object.init_from_request(user, object_type)
+            data_object.timestamp = next(timestamps)
+            condition = Attr(DB_PARTITION).not_exists()
+            status = HTTPStatus.CREATED
+        else:
+            stored_timestamp = object_cls.from_db(stored_item).timestamp
+            if data_object.timestamp not in (None, stored_timestamp):
+                results.append(
+                    _error_result(
+                        index,
+                        object_id,
+                        HTTPStatus.BAD_REQUEST,
+                        f"Cannot Modify `timestamp` Attribute on `{object_type.value}`",
+                    )
+                )
+                continue
+            data_object.from_request(user, object_type)
+            data_object.timestamp = stored_timestamp
+            condition = Attr(DB_PARTITION).exists() & Attr(ITEM_INDEX_PARTITION).eq(
+                str(object_id)
+            )
+            status = HTTPStatus.OK
+
+        writes.append((index, data_object, condition))
+        results.append(
+            BatchItemResult(
+                index=index,
+                status=status,
+                object_id=data_object.object_id,
+                item=data_object,
+            )
+        )
+
+    def record_writes(to_write: list[DB_OBJECT_TYPE]) -> None:
+        invalidate_objects(*to_write)
+        if object_cls is Set:
+            update_set_aggregates(
+                user,
+                removed=[
+                    object_cls.from_db(stored[str(data_object.object_id)])
+                    for data_object in to_write
+                    if str(data_object.object_id) in stored
+                ],
+                added=to_write,
+            )
+        elif object_cls in AGGREGATED_CLASSES:
+            # Replacing a join or workout can move the sets below it
+            for data_object in to_write:
+                if str(data_object.object_id) in stored:
+                    update_aggregates(
+                        user,
+                        object_cls.from_db(stored[str(data_object.object_id)]),
+                        data_object,
+                    )
+
+    if not atomic:
+        # Created items have fresh keys, which `BatchWriteItem` can write
+        # without their conditions. Replaces are conditional puts, so that
+        # an item deleted since it was checked is not brought back
+        creates = [
+            data_object
+            for _, data_object, _ in writes
+            if str(data_object.object_id) not in stored
+        ]
+        replaces = [
+            (index, data_object, condition)
+            for index, data_object, condition in writes
+            if str(data_object.object_id) in stored
+        ]
+
+        db.batch_write(put_objects=creates)
+        replaced = db.put_each(
+            [(data_object, condition) for _, data_object, condition in replaces]
+        )
+
+        record_writes(
+            [
+                *creates,
+                *(
+                    data_object
+                    for (_, data_object, _), ok in zip(replaces, replaced)
+                    if ok
+                ),
+            ]
+        )
+        return BatchResult(
+            results=_deleted_since(
+                results,
+                [index for (index, *_), ok in zip(replaces, replaced) if not ok],
+                object_type,
+            )
+        )
+
+    _check_transaction_size(len(writes))
+    if len(writes) < len(data_objects):
+        return BatchResult(results=_abandon(results, [index for index, *_ in writes]))
+
+    try:
+        db.transact_write(
+            puts=[(data_object, condition) for _, data_object, condition in writes]
+        )
+
+    except TransactionCanceledError as exc:
+        return BatchResult(results=_cancelled(results, exc.reasons))
+
+    record_writes([data_object for _, data_object, _ in writes])
+    return BatchResult(results=results)
+
+
+def batch_delete(
+    object_cls: Type[DB_OBJECT_TYPE],
+    user: User,
+    object_ids: list[UUID],
+    atomic: bool = False,
+) -> BatchResult:
+    """
+    Deletes many items (and anything they own, see `DESCENDANTS`)
+
+    Every id is checked before anything is deleted. Descendants go first
+    so a failure part way never orphans them. If `atomic`, the whole set
+    of deletes is one transaction, only attempted when every id is valid
+    """
+    db = get_db_instance()
+    object_type = ObjectType.from_object_class(object_cls)
+    partition = _partition(object_cls, user)
+
+    stored = {
+        item[ITEM_INDEX_PARTITION]: item
+        for item in db.get_items_by_id([str(object_id) for object_id in object_ids])
+    }
+
+    results: list[BatchItemResult] = []
+    to_delete: list[DB_OBJECT_TYPE] = []
+    seen_ids: set[UUID] = set()
+
+    for index, object_id in enumerate(object_ids):
+        stored_item = stored.get(str(object_id))
+
+        if object_id in seen_ids:
+            results.append(
+                _error_result(
+                    index,
+                    object_id,
+                    HTTPStatus.BAD_REQUEST,
+                    f"Duplicate `object_id` in batch: '{object_id}'",
+                )
+            )
+        elif (
+            stored_item is None
+            or stored_item[DB_PARTITION].split(DELIMITER)[-1] != object_type.value
+        ):
+            results.append(
+                _error_result(
+                    index,
+                    object_id,
+                    HTTPStatus.NOT_FOUND,
+                    f"No `{object_type.value}` found with `object_id`: '{object_id}': Cannot Delete",
+                )
+            )
+        elif stored_item[DB_PARTITION] != partition:
+            results.append(
+                _error_result(
+                    index,
+                    object_id,
+                    HTTPStatus.UNAUTHORIZED,
+                    f"`{object_type.value}` Item not owned by current user ({user.id}): Cannot Delete",
+                )
+            )
+        else:
+            data_object = object_cls.from_db(stored_item)
+            to_delete.append(data_object)
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    status=HTTPStatus.OK,
+                    object_id=object_id,
+                    item=data_object,
+                )
+            )
+
+        seen_ids.add(object_id)
+
+    find_descendants = DESCENDANTS.get(object_cls)
+    descendants = find_descendants(user, to_delete) if find_descendants else []
+
+    removed_sets = [
+        data_object
+        for data_object in [*to_delete, *descendants]
+        if isinstance(data_object, Set)
+    ]
+    # Read while the sets' joins are still stored
+    placements = set_placements(user, removed_sets) if removed_sets else {}
+
+    def record_deletes() -> None:
+        invalidate_objects(*to_delete, *descendants)
+        update_set_aggregates(user, removed=removed_sets, placements=placements)
+
+    if not atomic:
+        db.batch_write(delete_objects=descendants)
+        db.batch_write(delete_objects=to_delete)
+        record_deletes()
+        return BatchResult(results=results)
+
+    # Every delete also writes a tombstone
+    _check_transaction_size(2 * (len(to_delete) + len(descendants)))
+    if len(to_delete) < len(object_ids):
+        return BatchResult(
+            results=_abandon(
+                results, [result.index for result in results if result.item is not None]
+            )
+        )
+
+    try:
+        db.transact_write(
+            deletes=[
+                *(
+                    (
+                        data_object,
+                        Attr(ITEM_INDEX_PARTITION).eq(str(data_object.object_id)),
+                    )
+                    for data_object in to_delete
+                ),
+                *((descendant, None) for descendant in descendants),
+            ]
+        )
+
+    except TransactionCanceledError as exc:
+        return BatchResult(results=_cancelled(results, exc.reasons))
+
+    record_deletes()
+    return BatchResult(results=results)
+
+
+def _partition(object_cls: Type[DB_OBJECT_TYPE], user: User) -> str:
+    return PARTITION_TEMPLATE.format(
+        **{
+            "user_id": user.id,
+            "object_type": ObjectType.from_object_class(object_cls).value,
+        }
+    )
+
+
+def _check_transaction_size(action_count: int) -> None:
+    if action_count > TRANSACT_WRITE_MAX_ITEMS:
+        raise InvalidBatchError(
+            f"Invalid Batch: Atomic batches are limited to {TRANSACT_WRITE_MAX_ITEMS} writes, {action_count} required"
+        )
+
+
+def _error_result(
+    index: int, object_id: Optional[UUID], status: HTTPStatus, detail: str
+) -> BatchItemResult:
+    return BatchItemResult(
+        index=index, status=status, object_id=object_id, detail=detail
+    )
+
+
+def _abandon(
+    results: list[BatchItemResult], indexes: list[int]
+) -> list[BatchItemResult]:
+    """Marks the valid items of a failed atomic batch as not written"""
+    return [
+        (
+            _error_result(
+                result.index,
+                result.object_id,
+                HTTPStatus.FAILED_DEPENDENCY,
+                "Not Written: Another item in the atomic batch failed",
+            )
+            if result.index in indexes
+            else result
+        )
+        for result in results
+    ]
+
+
+def _deleted_since(
+    results: list[BatchItemResult], indexes: list[int], object_type: ObjectType
+) -> list[BatchItemResult]:
+    """Marks the replaces of a non-atomic batch whose item was since deleted"""
+    return [
+        (
+            _error_result(
+                result.index,
+                result.object_id,
+                HTTPStatus.NOT_FOUND,
+                f"No `{object_type.value}` found with `object_id`: '{result.object_id}': Cannot Update",
+            )
+            if result.index in indexes
+            else result
+        )
+        for result in results
+    ]
+
+
+def _cancelled(
+    results: list[BatchItemResult], reasons: list[Optional[str]]
+) -> list[BatchItemResult]:
+    """
+    Maps `TransactionCanceledError.reasons` back onto the batch's results
+
+    Reasons line up with the results, as every result was written in
+    order (any trailing reasons belong to descendants of deleted items)
+    """
+    return [
+        _error_result(
+            result.index,
+            result.object_id,
+            HTTPStatus.CONFLICT if reason else HTTPStatus.FAILED_DEPENDENCY,
+            (
+                f"Not Written: {reason}"
+                if reason
+                else "Not Written: Another item in the atomic batch failed"
+            ),
+        )
+        for result, reason in zip(results, reasons)
+    ]
@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Type
+
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE, BaseObject
+from hard.aws.dynamodb.consts import (
+    DB_PARTITION,
+    DB_SORT_KEY,
+    VERSION_ATTRIBUTE,
+    VERSION_PARTITION_TEMPLATE,
+)
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+
+CACHE_ENABLED_ENV_VAR = "CATALOG_CACHE_ENABLED"
+CACHE_TTL_ENV_VAR = "CATALOG_CACHE_TTL_SECONDS"
+CACHE_MAX_OBJECTS_ENV_VAR = "CATALOG_CACHE_MAX_OBJECTS"
+
+DEFAULT_CACHE_TTL = 300
+DEFAULT_CACHE_MAX_OBJECTS = 10_000
+
+CACHED_OBJECT_TYPES = {ObjectType.EXERCISE, ObjectType.TAG, ObjectType.TEMPLATE}
+
+
+@dataclass
+class CacheEntry:
+    objects: list[BaseObject]
+    version: int
+    expires_at: float
+
+
+class CatalogCache:
+    """
+    LRU cache of whole partitions for read-mostly object types
+
+    Lives at module level, so it survives across invocations in a warm
+    Lambda container. Entries expire after `ttl` seconds, and the least
+    recently used are evicted once more than `max_objects` are held.
+    Each entry records the partition version it was read at, see
+    `get_partition_version`
+    """
+
+    def __init__(self, ttl: float, max_objects: int) -> None:
+        self.ttl = ttl
+        self.max_objects = max_objects
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, ObjectType], CacheEntry] = OrderedDict()
+        self._size = 0
+
+    def get(self, user_id: str, object_type: ObjectType) -> Optional[CacheEntry]:
+        key = (user_id, object_type)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        user_id: str,
+        object_type: ObjectType,
+        objects: list[BaseObject],
+        version: int,
+    ) -> None:
+        if len(objects) > self.max_objects:
+            return
+
+        key = (user_id, object_type)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CacheEntry(
+                objects=list(objects),
+                version=version,
+                expires_at=time.monotonic() + self.ttl,
+            )
+            self._size += len(objects)
+
+            while self._size > self.max_objects:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id: str, object_type: ObjectType) -> None:
+        with self._lock:
+            self._remove((user_id, object_type))
+
+    def _remove(self, key: tuple[str, ObjectType]) -> None:
+        # Must be called while holding `_lock`
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.objects)
+
+
+_catalog_cache: Optional[CatalogCache] = None
+_catalog_cache_lock = threading.Lock()
+
+
+def is_versioned_type(object_cls: Type[BaseObject]) -> bool:
+    """
+    Whether writes to `object_cls` bump its partition version
+
+    Not gated on `CATALOG_CACHE_ENABLED`: were writes only counted while the
+    cache is on, switching it off and on again would leave warm containers
+    serving entries whose version no write since has moved
+    """
+    return ObjectType.from_object_class(object_cls) in CACHED_OBJECT_TYPES
+
+
+def is_cached_type(object_cls: Type[BaseObject]) -> bool:
+    """Whether reads of `object_cls` go through the catalog cache"""
+    enabled = os.getenv(CACHE_ENABLED_ENV_VAR, "").lower() in ("1", "true")
+    return enabled and is_versioned_type(object_cls)
+
+
+def get_catalog_cache() -> CatalogCache:
+    global _catalog_cache
+
+    if _catalog_cache is None:
+        with _catalog_cache_lock:
+            if _catalog_cache is None:
+                _catalog_cache = CatalogCache(
+                    ttl=float(os.getenv(CACHE_TTL_ENV_VAR, DEFAULT_CACHE_TTL)),
+                    max_objects=int(
+                        os.getenv(CACHE_MAX_OBJECTS_ENV_VAR, DEFAULT_CACHE_MAX_OBJECTS)
+                    ),
+                )
+
+    return _catalog_cache
+
+
+def reset_catalog_cache() -> None:
+    global _catalog_cache
+
+    with _catalog_cache_lock:
+        _catalog_cache = None
+
+
+def _version_key(user_id: str, object_type: ObjectType) -> dict[str, str]:
+    return {
+        DB_PARTITION: VERSION_PARTITION_TEMPLATE.format(user_id=user_id),
+        DB_SORT_KEY: object_type.value,
+    }
+
+
+def get_partition_version(user_id: str, object_type: ObjectType) -> int:
+    """
+    Reads the write counter for one of a user's partitions (a single `GetItem`)
+
+    The read is strongly consistent, as an eventually consistent one can
+    miss a bump made just before and match a stale entry (or `ETag`)
+    """
+    item = get_db_instance().get_item(
+        _version_key(user_id, object_type), consistent_read=True
+    )
+    if item is None:
+        return 0
+    return int(item[VERSION_ATTRIBUTE])
+
+
+def bump_partition_version(user_id: str, object_type: ObjectType) -> int:
+    return get_db_instance().increment(
+        _version_key(user_id, object_type), VERSION_ATTRIBUTE
+    )
+
+
+def cached_partition(
+    object_cls: Type[DB_OBJECT_TYPE], user_id: str, version: Optional[int] = None
+) -> tuple[Optional[list[DB_OBJECT_TYPE]], int]:
+    """
+    Looks up a partition in the cache, checking it against the stored version
+    (read here unless the caller already has it)
+
+    Returns the cached objects (or `None` on a miss) along with the current
+    version, which should be passed to `cache_partition` after a re-query
+    """
+    object_type = ObjectType.from_object_class(object_cls)
+    if version is None:
+        version = get_partition_version(user_id, object_type)
+
+    entry = get_catalog_cache().get(user_id, object_type)
+    if entry is not None and entry.version == version:
+        return list(entry.objects), version
+
+    return None, version
+
+
+def cache_partition(
+    object_cls: Type[DB_OBJECT_TYPE],
+    user_id: str,
+    objects: list[DB_OBJECT_TYPE],
+    version: int,
+) -> None:
+    get_catalog_cache().put(
+        user_id, ObjectType.from_object_class(object_cls), objects, version
+    )
+
+
+def invalidate_partition(object_cls: Type[BaseObject], user_id: str) -> None:
+    """
+    Write-through invalidation: drops the local entry and bumps the stored
+    version, so other containers notice on their next read
+    """
+    object_type = ObjectType.from_object_class(object_cls)
+    get_catalog_cache().invalidate(user_id, object_type)
+    bump_partition_version(user_id, object_type)
@@ -0,0 +1,164 @@
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from hard.app.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # Optional, without it responses are only ever gzipped
+    brotli = None
+
+BROTLI_ENCODING = "br"
+GZIP_ENCODING = "gzip"
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Whether an `Accept-Encoding` header lists `encoding`, and not with `q=0`"""
+    for coding in accept_encoding.split(","):
+        name, *params = (part.strip() for part in coding.split(";"))
+        if name.lower() != encoding:
+            continue
+
+        qualities = [param for param in params if param.startswith("q=")]
+        try:
+            return not qualities or float(qualities[0][2:]) > 0
+        except ValueError:
+            return False
+
+    return False
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with brotli when the client accepts `br` and the
+    optional `brotli` package is installed, and with gzip otherwise
+
+    Brotli makes JSON bodies noticeably smaller than gzip does at a
+    similar CPU cost, so it is preferred whenever both are accepted.
+    Bodies it encodes have their `ETag` suffixed with the coding (see
+    `etag.encoded_etag`), so each representation has its own strong tag
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 9,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("Accept-Encoding", "")
+
+        if brotli is not None and accepts_encoding(accept_encoding, BROTLI_ENCODING):
+            responder = BrotliResponder(
+                self.app, self.minimum_size, quality=self.brotli_quality
+            )
+            await responder(scope, receive, send)
+
+        elif accepts_encoding(accept_encoding, GZIP_ENCODING):
+            await self._send_gzipped(scope, receive, send)
+
+        else:
+            await self.app(scope, receive, send)
+
+    async def _send_gzipped(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # `GZipResponder` leaves bodies the app encoded itself alone, and
+        # those keep their tag
+        encoded_by_app = False
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            async def send_from_app(message: Message) -> None:
+                nonlocal encoded_by_app
+                if message["type"] == "http.response.start":
+                    encoded_by_app = "content-encoding" in Headers(scope=message)
+                await send(message)
+
+            await self.app(scope, receive, send_from_app)
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and not encoded_by_app:
+                _tag_encoding(message)
+            await send(message)
+
+        responder = GZipResponder(app, self.minimum_size, compresslevel=self.gzip_level)
+        await responder(scope, receive, send_with_etag)
+
+
+def _tag_encoding(message: Message) -> None:
+    """Gives an encoded response its own `ETag`, see `etag.encoded_etag`"""
+    headers = MutableHeaders(scope=message)
+    coding = headers.get("Content-Encoding")
+    if coding is not None and "etag" in headers:
+        headers["ETag"] = encoded_etag(headers["ETag"], coding)
+
+
+class BrotliResponder:
+    """Brotli counterpart of Starlette's `GZipResponder`, for a single response"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = brotli.Compressor(quality=quality)
+        self.send: Optional[Send] = None
+        self.initial_message: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_brotli)
+
+    async def send_with_brotli(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body shows whether to compress
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(scope=message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send_initial()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.initial_message is not None:
+            if len(body) < self.minimum_size and not more_body:
+                self.passthrough = True
+                await self._send_initial()
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(scope=self.initial_message)
+            headers["Content-Encoding"] = BROTLI_ENCODING
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            _tag_encoding(self.initial_message)
+
+        compressed = self.compressor.process(body)
+        compressed += self.compressor.flush() if more_body else self.compressor.finish()
+
+        if self.initial_message is not None and not more_body:
+            headers = MutableHeaders(scope=self.initial_message)
+            headers["Content-Length"] = str(len(compressed))
+
+        await self._send_initial()
+        await self.send({**message, "body": compressed})
+
+    async def _send_initial(self) -> None:
+        if self.initial_message is not None:
+            initial_message, self.initial_message = self.initial_message, None
+            await self.send(initial_message)
@@ -0,0 +1,57 @@
+from typing import Type
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from hard.app.catalog_cache import get_partition_version, is_versioned_type
+from hard.app.etag import ETAG_CACHE_CONTROL, digest, matching_etag, not_modified
+from hard.app.processes import AsyncRestProcesses
+from hard.app.responses import list_response
+from hard.aws.dynamodb.async_handler import run_in_db_executor
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+
+
+def partition_etag(user: User, object_type: ObjectType, version: int) -> str:
+    """
+    Strong `ETag` for the whole of one of a user's partitions, from its write
+    counter (see `get_partition_version`) rather than its contents, so the
+    body is never hashed. The user is part of the tag, as counters of
+    different users' partitions coincide
+    """
+    return f'"{object_type.value}-{version}-{digest(user.id.encode())}"'
+
+
+async def versioned_list_response(
+    req: Request, object_cls: Type[DB_OBJECT_TYPE], user: User
+) -> Response:
+    """
+    `list_response` for a whole partition of a versioned type (see
+    `is_versioned_type`), answered with `304 Not Modified` before it is
+    queried when the client already holds the current version
+
+    The version is read once, and also checks the catalog cache when that
+    is enabled. Versions are bumped on every write whether or not it is
+    """
+    if not is_versioned_type(object_cls):
+        # Without a version to tag it by, `ETagMiddleware` tags the
+        # response from its body instead
+        return list_response(
+            object_cls, await AsyncRestProcesses.get_list(object_cls, user)
+        )
+
+    object_type = ObjectType.from_object_class(object_cls)
+    version = await run_in_db_executor(get_partition_version, user.id, object_type)
+
+    etag = partition_etag(user, object_type, version)
+    matched = matching_etag(req.headers.get("If-None-Match"), etag)
+    if matched is not None:
+        return not_modified(matched)
+
+    response = list_response(
+        object_cls, await AsyncRestProcesses.get_list(object_cls, user, version)
+    )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+    return response
@@ -0,0 +1,18 @@
+# Raised by the app's modules and mapped to responses in `main`, which only
+# imports these, so the modules raising them can be loaded with their routers
+
+
+class InvalidBatchError(Exception):
+    pass
+
+
+class InvalidImportError(Exception):
+    pass
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class WatermarkExpiredError(Exception):
+    pass
@@ -0,0 +1,120 @@
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ETAG_DIGEST_SIZE = 16
+
+# Responses are per user, and clients should revalidate before reusing them
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+# Content codings whose bodies are tagged apart from the identity body
+ETAG_CODINGS = ("gzip", "br")
+
+
+def digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=ETAG_DIGEST_SIZE).hexdigest()
+
+
+def content_etag(body: bytes) -> str:
+    """Strong `ETag` for a response body"""
+    return f'"{digest(body)}"'
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """
+    The `ETag` of a body sent with `Content-Encoding: coding`, as each
+    encoding is a different representation with different bytes
+    """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def identity_etag(etag: str) -> str:
+    """Undoes `encoded_etag`"""
+    for coding in ETAG_CODINGS:
+        if etag.endswith(f'-{coding}"'):
+            return f'{etag[: -len(coding) - 2]}"'
+    return etag
+
+
+def matching_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The tag in an `If-None-Match` header that matches `etag` (compared
+    weakly, as it requires, and in any of `ETAG_CODINGS`), if there is one
+    """
+    if not if_none_match:
+        return None
+
+    for tag in (tag.strip() for tag in if_none_match.split(",")):
+        if tag == "*" or identity_etag(tag.removeprefix("W/")) == etag:
+            return etag if tag == "*" else tag
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an `If-None-Match` header lists `etag`, see `matching_etag`"""
+    return matching_etag(if_none_match, etag) is not None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+    )
+
+
+class ETagMiddleware:
+    """
+    Gives successful `GET` responses a strong `ETag` hashed from their body,
+    and replaces the body with `304 Not Modified` when `If-None-Match` lists it
+
+    The body is still built, but not sent. Streamed responses, and those
+    that set their own `ETag` (see `conditional.versioned_list_response`),
+    pass through. The tag is of the identity body, `CompressionMiddleware`
+    gives encoded bodies their own, and a `304` repeats the tag it matched
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("If-None-Match")
+        start: Optional[Message] = None
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start
+
+            if message["type"] == "http.response.start":
+                if message["status"] == 200 and "etag" not in Headers(scope=message):
+                    # Held back until the body is known
+                    start = message
+                    return
+            elif start is not None:
+                held, start = start, None
+
+                if message.get("more_body", False):
+                    await send(held)
+                else:
+                    etag = content_etag(message.get("body", b""))
+                    matched = matching_etag(if_none_match, etag)
+                    headers = MutableHeaders(scope=held)
+                    headers["ETag"] = matched or etag
+                    headers.setdefault("Cache-Control", ETAG_CACHE_CONTROL)
+
+                    if matched is not None:
+                        held["status"] = 304
+                        for name in ("Content-Length", "Content-Type"):
+                            if name in headers:
+                                del headers[name]
+                        message = {**message, "body": b""}
+
+                    await send(held)
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,180 @@
+import csv
+import io
+import zlib
+from enum import Enum
+from itertools import islice
+from typing import Iterable, Iterator
+
+from hard.app.processes import RestProcesses, workout_items_by_date
+from hard.aws.dynamodb.consts import DB_PARTITION, PARTITION_TEMPLATE
+from hard.aws.dynamodb.handler import Key, get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.registry import OBJECT_CLASSES
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+# Items read, validated and written out together, bounding memory use
+EXPORT_CHUNK_SIZE = 500
+
+# Workouts whose exercises and sets are fetched together for the CSV export
+EXPORT_WORKOUT_BATCH_SIZE = 25
+
+# `wbits` selecting a gzip header and trailer rather than a raw zlib stream
+GZIP_WBITS = 31
+
+CSV_COLUMNS = [
+    "workout_date",
+    "workout_title",
+    "exercise",
+    "set_type",
+    "weight",
+    "unit",
+    "reps",
+    "notes",
+    "workout_id",
+    "exercise_id",
+    "set_id",
+]
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _partition(user: User, object_type: ObjectType) -> str:
+    return PARTITION_TEMPLATE.format(
+        **{"user_id": user.id, "object_type": object_type.value}
+    )
+
+
+def ndjson_chunks(user: User) -> Iterator[bytes]:
+    """
+    Every object the user owns, one JSON document per line
+
+    Partitions are read in turn, a page at a time, and each object is
+    written as the API would return it
+    """
+    db = get_db_instance()
+
+    for object_type, object_cls in OBJECT_CLASSES.items():
+        if object_type is ObjectType.BASE_OBJECT:
+            continue
+
+        items = db.query_iter(
+            key_expression=Key(DB_PARTITION).eq(_partition(user, object_type)),
+            page_size=EXPORT_CHUNK_SIZE,
+        )
+        for chunk in _chunks(items, EXPORT_CHUNK_SIZE):
+            yield b"".join(
+                data_object.model_dump_json().encode() + b"\n"
+                for data_object in object_cls.from_db_list(chunk)
+            )
+
+
+def set_rows(user: User) -> Iterator[list]:
+    """
+    One row per set, flattened with its exercise and workout
+
+    Workouts are read in date order (see `workout_items_by_date`),
+    `EXPORT_WORKOUT_BATCH_SIZE` at a time, with their exercise joins and
+    sets fetched per batch, so only one batch (and, without the date index,
+    the workouts themselves) is held in memory. Sets keep
+    the order they were logged in within each exercise
+    """
+    db = get_db_instance()
+    exercise_names = {
+        exercise.object_id: exercise.name
+        for exercise in RestProcesses.get_list(Exercise, user)
+    }
+
+    workout_items = workout_items_by_date(user)
+    for workout_chunk in _chunks(workout_items, EXPORT_WORKOUT_BATCH_SIZE):
+        workouts = Workout.from_db_list(workout_chunk)
+        joins = ExerciseJoin.from_db_list(
+            db.query_children(
+                user,
+                [workout.object_id for workout in workouts],
+                ObjectType.EXCERCISE_JOIN,
+            )
+        )
+        sets = Set.from_db_list(
+            db.query_children(user, [join.object_id for join in joins], ObjectType.SET)
+        )
+
+        joins_by_workout: dict = {}
+        for join in joins:
+            joins_by_workout.setdefault(join.workout_id, []).append(join)
+
+        sets_by_join: dict = {}
+        for set in sets:
+            sets_by_join.setdefault(set.exercise_join_id, []).append(set)
+
+        for workout in workouts:
+            for join in joins_by_workout.get(workout.object_id, []):
+                for set in sets_by_join.get(str(join.object_id), []):
+                    yield [
+                        workout.workout_date.isoformat(),
+                        workout.title,
+                        exercise_names.get(join.exercise_id, ""),
+                        set.set_type.value,
+                        set.weight,
+                        set.unit.value,
+                        set.reps,
+                        set.notes,
+                        workout.object_id,
+                        join.exercise_id,
+                        set.object_id,
+                    ]
+
+
+def csv_chunks(user: User) -> Iterator[bytes]:
+    """`set_rows` as CSV with a header row, `EXPORT_CHUNK_SIZE` rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+
+    for rows in _chunks(set_rows(user), EXPORT_CHUNK_SIZE):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresses `chunks` as a single gzip stream, as they are produced"""
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(
+    user: User, export_format: ExportFormat, compress: bool = True
+) -> Iterator[bytes]:
+    """The user's full history in `export_format`, optionally gzipped"""
+    if export_format is ExportFormat.CSV:
+        chunks = csv_chunks(user)
+    else:
+        chunks = ndjson_chunks(user)
+
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,377 @@
+import asyncio
+import codecs
+import csv
+import logging
+from datetime import date
+from enum import Enum
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+import orjson
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
+
+from hard.app.aggregates import record_added_sets
+from hard.app.analytics import SET_ITEM_FIELDS, SetColumns
+from hard.app.errors import InvalidImportError
+from hard.app.processes import RestProcesses, invalidate_objects
+from hard.app.schemas import ImportRowError, ImportSummary
+from hard.aws.dynamodb.async_handler import run_in_db_executor
+from hard.aws.dynamodb.base_object import BaseObject, unique_timestamps
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+logger = logging.getLogger(__name__)
+
+# Rows validated, mapped and written together
+IMPORT_BATCH_SIZE = 2000
+
+# Row errors listed in an `ImportSummary`, beyond which they are only counted
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+# Progress is logged each time this many more rows have been read
+IMPORT_PROGRESS_ROWS = 10_000
+
+# Column names used by other trackers, as normalized by `_column_name`
+COLUMN_ALIASES = {
+    "date": "workout_date",
+    "start_time": "workout_date",
+    "workout_name": "workout_title",
+    "title": "workout_title",
+    "exercise_name": "exercise",
+    "exercise_title": "exercise",
+    "weight_kg": "weight",
+    "note": "notes",
+}
+
+
+class ImportFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class ImportRow(BaseModel):
+    """One logged set, as a row of a CSV or NDJSON import"""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    workout_date: date
+    workout_title: str = ""
+    exercise: str = Field(min_length=1)
+    set_type: SetType = SetType.WORKING
+    # Bodyweight exercises are often logged without one
+    weight: float = Field(default=0, ge=0)
+    unit: WeightUnit = WeightUnit.KILOGRAMS
+    reps: float = Field(ge=0)
+    notes: str = ""
+
+    @field_validator("workout_date", mode="before")
+    @classmethod
+    def date_part(cls, value):
+        # Other trackers export the start time, e.g. "2024-05-06 18:30:00"
+        if isinstance(value, str):
+            return value.strip()[:10]
+        return value
+
+
+REQUIRED_COLUMNS = {
+    name for name, field in ImportRow.model_fields.items() if field.is_required()
+}
+
+_rows_adapter = TypeAdapter(list[ImportRow])
+
+
+def _column_name(header: str) -> str:
+    name = header.strip().lower().replace(" ", "_")
+    name = name.split("(")[0].rstrip("_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Splits text arriving in arbitrary chunks into lines (kept with their
+    "\\n"), so a CSV reader can be fed straight from an upload
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def csv_records(lines: Iterable[str]) -> Iterator[dict[str]]:
+    """
+    Rows of CSV `lines` keyed by their (normalized) header names,
+    leaving out empty cells so that defaults apply
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    columns = [_column_name(name) for name in header]
+    missing = REQUIRED_COLUMNS.difference(columns)
+    if missing:
+        raise InvalidImportError(
+            f"Invalid Import: Missing required columns: {', '.join(sorted(missing))}"
+        )
+
+    for values in reader:
+        if values:
+            yield {column: value for column, value in zip(columns, values) if value}
+
+
+def ndjson_records(lines: Iterable[str]) -> Iterator[Optional[dict[str]]]:
+    """
+    Objects of NDJSON `lines`, keyed like the CSV columns. Lines that are
+    not JSON objects are yielded as `None`, to be reported against their row
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+class Importer:
+    """
+    Maps import rows onto workouts, exercises, exercise joins and sets
+
+    Rows are grouped into a workout by date and title, and exercises are
+    matched by name (ignoring case) against the user's existing exercises
+    and those created earlier in the import. Each call to `add_rows`
+    validates its rows in one pass and writes what they create with
+    `batch_write`, so the import is not atomic: rows already added stay
+    written if a later batch fails. The exercise aggregates are updated
+    once, by `record_aggregates`, from the working sets gathered so far
+    """
+
+    def __init__(self, user: User) -> None:
+        self.user = user
+        self.rows = 0
+        self.counts = dict.fromkeys(
+            (
+                ObjectType.WORKOUT,
+                ObjectType.EXERCISE,
+                ObjectType.EXCERCISE_JOIN,
+                ObjectType.SET,
+            ),
+            0,
+        )
+        self.errors: list[ImportRowError] = []
+        self.error_count = 0
+
+        self._timestamps = unique_timestamps()
+        self._exercise_ids: dict[str, str] = {
+            exercise.name.casefold(): str(exercise.object_id)
+            for exercise in RestProcesses.get_list(Exercise, user)
+        }
+        self._workouts: dict[tuple[date, str], Workout] = {}
+        self._joins: dict[tuple[str, str], ExerciseJoin] = {}
+        self._columns = SetColumns([])
+
+    def _init(self, data_object: BaseObject, object_type: ObjectType) -> None:
+        data_object.init_from_request(self.user, object_type)
+        data_object.timestamp = next(self._timestamps)
+        self.counts[object_type] += 1
+
+    def _error(self, row: int, detail: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(row=row, detail=detail))
+
+    def _validate(self, records: list[Optional[dict[str]]]) -> list[ImportRow]:
+        """The valid rows of `records`, recording the rest as errors"""
+        try:
+            return _rows_adapter.validate_python(records)
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False)
+
+        invalid: dict[int, list[str]] = {}
+        for error in errors:
+            index, *field = error["loc"]
+            if records[index] is None:
+                detail = "Row is not a JSON object"
+            elif field:
+                detail = f"{'.'.join(str(part) for part in field)}: {error['msg']}"
+            else:
+                detail = error["msg"]
+            invalid.setdefault(index, []).append(detail)
+
+        first_row = self.rows - len(records) + 1
+        for index, details in sorted(invalid.items()):
+            self._error(first_row + index, "; ".join(details))
+
+        return _rows_adapter.validate_python(
+            [record for index, record in enumerate(records) if index not in invalid]
+        )
+
+    def add_rows(self, records: list[Optional[dict[str]]]) -> None:
+        self.rows += len(records)
+        rows = self._validate(records)
+
+        new_objects: list[BaseObject] = []
+        new_sets: list[Set] = []
+        placements: dict[str, tuple[str, date]] = {}
+
+        for row in rows:
+            workout_key = (row.workout_date, row.workout_title)
+            workout = self._workouts.get(workout_key)
+            if workout is None:
+                workout = Workout(
+                    workout_date=row.workout_date, title=row.workout_title, notes=""
+                )
+                self._init(workout, ObjectType.WORKOUT)
+                self._workouts[workout_key] = workout
+                new_objects.append(workout)
+
+            exercise_key = row.exercise.casefold()
+            exercise_id = self._exercise_ids.get(exercise_key)
+            if exercise_id is None:
+                exercise = Exercise(name=row.exercise)
+                self._init(exercise, ObjectType.EXERCISE)
+                exercise_id = str(exercise.object_id)
+                self._exercise_ids[exercise_key] = exercise_id
+                new_objects.append(exercise)
+
+            join_key = (str(workout.object_id), exercise_id)
+            join = self._joins.get(join_key)
+            if join is None:
+                join = ExerciseJoin(
+                    workout_id=workout.object_id, exercise_id=exercise_id
+                )
+                self._init(join, ObjectType.EXCERCISE_JOIN)
+                self._joins[join_key] = join
+                new_objects.append(join)
+
+            join_id = str(join.object_id)
+            set = Set(
+                set_type=row.set_type,
+                weight=row.weight,
+                unit=row.unit,
+                reps=row.reps,
+                notes=row.notes,
+                exercise_join_id=join_id,
+            )
+            self._init(set, ObjectType.SET)
+            new_sets.append(set)
+            placements[join_id] = (exercise_id, row.workout_date)
+
+        if not new_sets:
+            return
+
+        get_db_instance().batch_write(put_objects=[*new_objects, *new_sets])
+        invalidate_objects(*new_objects)
+        self._columns.extend(
+            (set.db_values(include=SET_ITEM_FIELDS) for set in new_sets), placements
+        )
+
+    def record_aggregates(self) -> None:
+        """Adds the working sets written so far to their exercises' aggregates"""
+        try:
+            record_added_sets(self.user, self._columns)
+
+        except Exception:
+            # As for single writes, `python -m hard.app.aggregates` repairs them
+            logger.exception(
+                "Failed to update exercise aggregates for %s", self.user.id
+            )
+
+        self._columns = SetColumns([])
+
+    def summary(self) -> ImportSummary:
+        return ImportSummary(
+            rows=self.rows,
+            workouts=self.counts[ObjectType.WORKOUT],
+            exercises=self.counts[ObjectType.EXERCISE],
+            exercise_joins=self.counts[ObjectType.EXCERCISE_JOIN],
+            sets=self.counts[ObjectType.SET],
+            error_count=self.error_count,
+            errors=self.errors,
+        )
+
+
+def import_lines(
+    user: User, lines: Iterable[str], import_format: ImportFormat
+) -> ImportSummary:
+    """
+    Imports the rows of `lines`, `IMPORT_BATCH_SIZE` at a time
+
+    Only one batch of rows is held at once, along with the workouts,
+    exercises and joins created so far (to attach later rows to)
+    """
+    if import_format is ImportFormat.CSV:
+        records = csv_records(lines)
+    else:
+        records = ndjson_records(lines)
+
+    importer = Importer(user)
+    batch: list[Optional[dict[str]]] = []
+    next_progress = IMPORT_PROGRESS_ROWS
+
+    try:
+        for record in records:
+            batch.append(record)
+            if len(batch) < IMPORT_BATCH_SIZE:
+                continue
+
+            importer.add_rows(batch)
+            batch = []
+            if importer.rows >= next_progress:
+                logger.info("Imported %d rows for %s", importer.rows, user.id)
+                next_progress += IMPORT_PROGRESS_ROWS
+
+        if batch:
+            importer.add_rows(batch)
+
+    finally:
+        # Including when a batch fails, for the batches already written
+        importer.record_aggregates()
+
+    return importer.summary()
+
+
+def _blocking_iter(
+    chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop
+) -> Iterator[bytes]:
+    """Iterates `chunks` from a worker thread, each step awaited on `loop`"""
+
+    async def next_chunk() -> bytes:
+        return await chunks.__anext__()
+
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(next_chunk(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+async def import_stream(
+    user: User, chunks: AsyncIterator[bytes], import_format: ImportFormat
+) -> ImportSummary:
+    """
+    Imports an uploaded body as it arrives
+
+    Parsing and writing run on the DynamoDB executor, which pulls each
+    chunk of the body from the event loop as it needs it
+    """
+    loop = asyncio.get_running_loop()
+    text = codecs.iterdecode(_blocking_iter(chunks, loop), "utf-8-sig", "replace")
+    return await run_in_db_executor(import_lines, user, iter_lines(text), import_format)
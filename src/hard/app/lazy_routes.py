@@ -0,0 +1,66 @@
+import os
+import threading
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+LAZY_ROUTERS_ENV_VAR = "LAZY_ROUTERS_ENABLED"
+
+
+def lazy_routers_enabled() -> bool:
+    return os.getenv(LAZY_ROUTERS_ENV_VAR, "").lower() in ("1", "true")
+
+
+class LazyRouters:
+    """
+    Includes routers in `app` from the modules that define them, on demand
+
+    `modules` maps each router's full path prefix to its module, which
+    is only imported (and its routes built) the first time `load` is
+    asked for a path under that prefix. Paths under no prefix load every
+    router, so 404s and the OpenAPI schema see the complete app
+    """
+
+    def __init__(self, app: FastAPI, modules: dict[str, str], **include_kwargs):
+        self._app = app
+        self._pending = dict(modules)
+        self._include_kwargs = include_kwargs
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> None:
+        if not self._pending:
+            return
+
+        with self._lock:
+            prefixes = [
+                prefix
+                for prefix in self._pending
+                if path == prefix or path.startswith((f"{prefix}/", f"{prefix}:"))
+            ] or list(self._pending)
+
+            for prefix in prefixes:
+                self._include(prefix)
+
+    def load_all(self) -> None:
+        with self._lock:
+            for prefix in list(self._pending):
+                self._include(prefix)
+
+    def _include(self, prefix: str) -> None:
+        # Must be called while holding `_lock`
+        # `__import__` rather than `importlib`, so `-X importtime` reports it
+        module = __import__(self._pending.pop(prefix), fromlist=["router"])
+        self._app.include_router(module.router, **self._include_kwargs)
+
+
+class LazyRoutersMiddleware:
+    """Loads the router for each request's path before it is routed"""
+
+    def __init__(self, app: ASGIApp, routers: LazyRouters) -> None:
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            self.routers.load(scope["path"])
+        await self.app(scope, receive, send)
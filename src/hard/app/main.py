@@ -1,16 +1,23 @@
-from fastapi import APIRouter, FastAPI, HTTPException, status
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, status
 from mangum import Mangum
 from starlette.requests import Request
 
-from hard.app.routes import (
-    exercise_joins,
-    exercises,
-    sets,
-    tag_joins,
-    tags,
-    templates,
-    workouts,
+from hard.app.compression import CompressionMiddleware
+from hard.app.errors import (
+    InvalidBatchError,
+    InvalidCursorError,
+    InvalidImportError,
+    WatermarkExpiredError,
 )
+from hard.app.etag import ETagMiddleware
+from hard.app.lazy_routes import (
+    LazyRouters,
+    LazyRoutersMiddleware,
+    lazy_routers_enabled,
+)
+from hard.app.metrics import RequestMetricsMiddleware
+from hard.app.responses import TimedORJSONResponse
+from hard.app.unit_of_work import unit_of_work
 from hard.aws.dynamodb.consts import (
     InvalidAttributeChangeError,
     ItemAccessUnauthorizedError,
@@ -20,14 +27,32 @@ from hard.aws.dynamodb.consts import (
 from hard.aws.interfaces.fastapi import request
 from hard.aws.models.user import User
 
-api = APIRouter(prefix="/api")
-api.include_router(workouts.router)
-api.include_router(exercises.router)
-api.include_router(sets.router)
-api.include_router(tags.router)
-api.include_router(exercise_joins.router)
-api.include_router(tag_joins.router)
-api.include_router(templates.router)
+API_PREFIX = "/api"
+API_DEPENDENCIES = [Depends(unit_of_work)]
+
+# Bodies smaller than this gain little from compression
+COMPRESSION_MINIMUM_SIZE = 1000
+# Most of level 9's savings on JSON, for a fraction of the CPU time
+GZIP_COMPRESS_LEVEL = 6
+# Smaller than gzip at level 6 on JSON, at about the same speed
+BROTLI_QUALITY = 4
+
+# Full path prefix -> module defining the `router` served under it
+ROUTER_MODULES = {
+    f"{API_PREFIX}/workouts": "hard.app.routes.workouts",
+    f"{API_PREFIX}/exercises": "hard.app.routes.exercises",
+    f"{API_PREFIX}/sets": "hard.app.routes.sets",
+    f"{API_PREFIX}/tags": "hard.app.routes.tags",
+    f"{API_PREFIX}/exercise-joins": "hard.app.routes.exercise_joins",
+    f"{API_PREFIX}/tag-joins": "hard.app.routes.tag_joins",
+    f"{API_PREFIX}/templates": "hard.app.routes.templates",
+    f"{API_PREFIX}/sync": "hard.app.routes.sync",
+    f"{API_PREFIX}/stats": "hard.app.routes.stats",
+    f"{API_PREFIX}/export": "hard.app.routes.export",
+    f"{API_PREFIX}/import": "hard.app.routes.imports",
+}
+
+api = APIRouter(prefix=API_PREFIX, dependencies=API_DEPENDENCIES)
 
 
 @api.get("/user", response_model=User)
@@ -35,15 +60,51 @@ def get_user_claims(req: Request):
     return request.get_user_claims(req)
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=TimedORJSONResponse)
 app.include_router(api)
 
+routers = LazyRouters(
+    app, ROUTER_MODULES, prefix=API_PREFIX, dependencies=API_DEPENDENCIES
+)
+if lazy_routers_enabled():
+    # Cold starts only build the routes of the first request's path
+    app.add_middleware(LazyRoutersMiddleware, routers=routers)
+else:
+    routers.load_all()
+
+# Tags the identity body, `CompressionMiddleware` gives each encoding its own tag
+app.add_middleware(ETagMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    gzip_level=GZIP_COMPRESS_LEVEL,
+    brotli_quality=BROTLI_QUALITY,
+)
+
+# Added last, so it is outermost and times everything below it
+app.add_middleware(RequestMetricsMiddleware)
+
 
 @app.exception_handler(InvalidAttributeChangeError)
 async def invalid_attr_exc_handler(_req: Request, exc: InvalidAttributeChangeError):
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 
+@app.exception_handler(InvalidBatchError)
+async def invalid_batch_exc_handler(_req: Request, exc: InvalidBatchError):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@app.exception_handler(InvalidImportError)
+async def invalid_import_exc_handler(_req: Request, exc: InvalidImportError):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_exc_handler(_req: Request, exc: InvalidCursorError):
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
 @app.exception_handler(ItemAccessUnauthorizedError)
 async def item_access_auth_exc_handler(_req: Request, exc: ItemAccessUnauthorizedError):
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc))
@@ -59,4 +120,9 @@ async def item_already_exists_exc_handler(_req: Request, exc: ItemAlreadyExistsE
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
 
+@app.exception_handler(WatermarkExpiredError)
+async def watermark_expired_exc_handler(_req: Request, exc: WatermarkExpiredError):
+    raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc))
+
+
 handler = Mangum(app)
@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from hard.aws.dynamodb.metrics import CallMetrics, collect_call_metrics
+
+EMF_ENABLED_ENV_VAR = "EMF_METRICS_ENABLED"
+EMF_NAMESPACE = "hard"
+EMF_DIMENSIONS = ["Route", "Method"]
+UNMATCHED_ROUTE = "UNMATCHED"
+
+# Metric name -> CloudWatch unit
+EMF_METRICS = {
+    "Duration": "Milliseconds",
+    "DynamoDBCalls": "Count",
+    "DynamoDBDuration": "Milliseconds",
+    "ConsumedCapacity": "None",
+    "ItemsRead": "Count",
+    "ItemsReturned": "Count",
+    "SerializationDuration": "Milliseconds",
+    "UnitOfWorkHits": "Count",
+    "UnitOfWorkMisses": "Count",
+}
+
+_current_request_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    """Where the time in a single request went, see `RequestMetricsMiddleware`"""
+
+    def __init__(self, db: CallMetrics) -> None:
+        self.started_at = time.perf_counter()
+        self.db = db
+        self.serialization = 0.0
+        # Reads answered by the request's `UnitOfWork`, and those it passed on
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+def emf_enabled() -> bool:
+    return os.getenv(EMF_ENABLED_ENV_VAR, "").lower() in ("1", "true")
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Counts the time spent in this block as the request's serialization time"""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _current_request_metrics.get()
+        if metrics is not None:
+            metrics.serialization += time.perf_counter() - started_at
+
+
+def record_cache_lookup(hit: bool) -> None:
+    """Counts a `UnitOfWork` lookup against the current request"""
+    metrics = _current_request_metrics.get()
+    if metrics is None:
+        return
+
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+def server_timing(metrics: RequestMetrics, duration: float) -> str:
+    db = metrics.db
+    return ", ".join(
+        [
+            f"total;dur={duration * 1000:.2f}",
+            f"db;dur={db.duration * 1000:.2f};desc="
+            f'"{db.calls} calls, {db.consumed_capacity:g} CU, '
+            f'{db.items_returned}/{db.items_read} items"',
+            f"serialize;dur={metrics.serialization * 1000:.2f}",
+            f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+        ]
+    )
+
+
+def emf_record(
+    metrics: RequestMetrics, duration: float, route: str, method: str, status: int
+) -> dict:
+    """A CloudWatch Embedded Metric Format log record of `metrics`"""
+    db = metrics.db
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": EMF_NAMESPACE,
+                    "Dimensions": [EMF_DIMENSIONS],
+                    "Metrics": [
+                        {"Name": name, "Unit": unit}
+                        for name, unit in EMF_METRICS.items()
+                    ],
+                }
+            ],
+        },
+        "Route": route,
+        "Method": method,
+        "StatusCode": status,
+        "Duration": duration * 1000,
+        "DynamoDBCalls": db.calls,
+        "DynamoDBDuration": db.duration * 1000,
+        "ConsumedCapacity": db.consumed_capacity,
+        "ItemsRead": db.items_read,
+        "ItemsReturned": db.items_returned,
+        "SerializationDuration": metrics.serialization * 1000,
+        "UnitOfWorkHits": metrics.cache_hits,
+        "UnitOfWorkMisses": metrics.cache_misses,
+    }
+
+
+class RequestMetricsMiddleware:
+    """
+    Times each request, its DynamoDB calls and its response serialization
+
+    The totals go out as a `Server-Timing` header and, with
+    `EMF_METRICS_ENABLED`, as one EMF line on stdout per request,
+    which CloudWatch turns into metrics per route
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        with collect_call_metrics() as db:
+            metrics = RequestMetrics(db)
+            token = _current_request_metrics.set(metrics)
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing", server_timing(metrics, metrics.elapsed())
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _current_request_metrics.reset(token)
+                if emf_enabled():
+                    route = scope.get("route")
+                    record = emf_record(
+                        metrics,
+                        metrics.elapsed(),
+                        route=route.path if route is not None else UNMATCHED_ROUTE,
+                        method=scope["method"],
+                        status=status,
+                    )
+                    sys.stdout.write(orjson.dumps(record).decode() + "\n")
+                    sys.stdout.flush()
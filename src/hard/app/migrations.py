@@ -0,0 +1,140 @@
+"""
+One-off data migrations, run against the table named by `DYNAMO_TABLE_NAME`
+
+    python -m hard.app.migrations
+
+Once the parent keys are backfilled, joins and sets can be read through the
+adjacency indexes by setting `ADJACENCY_INDEXES_ENABLED`
+"""
+
+from datetime import datetime
+from typing import Callable, Type
+
+from hard.aws.dynamodb.base_object import BaseObject, format_modified_at
+from hard.aws.dynamodb.consts import (
+    CHILD_KEY_TEMPLATE,
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DELIMITER,
+    PARENT_INDEX_SORT_KEY,
+    SYNC_INDEX_PARTITION,
+    SYNC_INDEX_SORT_KEY,
+    ConditionalCheckFailedError,
+)
+from hard.aws.dynamodb.handler import Attr, get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.registry import OBJECT_CLASSES
+
+PARENTED_OBJECT_CLASSES = {
+    object_type: object_cls
+    for object_type, object_cls in OBJECT_CLASSES.items()
+    if object_cls.PARENT_ATTRIBUTES
+}
+
+
+def backfill_parent_keys() -> int:
+    """
+    Adds the `parent_key`/`child_key` attributes to child items stored
+    before the adjacency indexes existed
+
+    Safe to re-run: items that already have a `child_key` are skipped.
+    Returns the number of items updated
+    """
+    return _backfill_missing(
+        PARENT_INDEX_SORT_KEY, PARENTED_OBJECT_CLASSES, _parent_keys
+    )
+
+
+def backfill_sync_keys() -> int:
+    """
+    Adds `sync_key`/`modified_at` to items stored before the change feed
+    existed, so they appear in `ModifiedSearch`
+
+    `modified_at` is taken from when the item was created, rather than now,
+    so clients that have synced since are not sent every old item again.
+    Safe to re-run: items that already have a `modified_at` are skipped.
+    Returns the number of items updated
+    """
+    return _backfill_missing(SYNC_INDEX_SORT_KEY, OBJECT_CLASSES, _sync_keys)
+
+
+def _backfill_missing(
+    attr: str,
+    object_classes: dict[ObjectType, Type[BaseObject]],
+    keys_for: Callable[[Type[BaseObject], dict[str]], dict[str]],
+) -> int:
+    """
+    Sets the attributes from `keys_for` that are missing on every item of
+    `object_classes` lacking `attr`, one `UpdateItem` each
+
+    Runs against the live table, so each update only happens while the
+    attributes are still missing and the item still exists: anything written
+    (or deleted) since the scan is left as it is, rather than reverted
+    """
+    db = get_db_instance()
+
+    updated = 0
+    for item in db.scan_iter(filter_expression=Attr(attr).not_exists()):
+        object_cls = object_classes.get(_object_type(item))
+        if object_cls is None:
+            continue
+
+        missing = {
+            key: value
+            for key, value in keys_for(object_cls, item).items()
+            if key not in item
+        }
+        if not missing:
+            continue
+
+        condition = Attr(DB_PARTITION).exists()
+        for key in missing:
+            condition = condition & Attr(key).not_exists()
+
+        try:
+            db.update(
+                key={DB_PARTITION: item[DB_PARTITION], DB_SORT_KEY: item[DB_SORT_KEY]},
+                set_attrs=missing,
+                condition_expression=condition,
+                return_values="NONE",
+            )
+
+        except ConditionalCheckFailedError:
+            continue
+
+        updated += 1
+
+    return updated
+
+
+def _parent_keys(object_cls: Type[BaseObject], item: dict[str]) -> dict[str]:
+    keys = object_cls.parent_index_keys(_user_id(item), item)
+    keys[PARENT_INDEX_SORT_KEY] = CHILD_KEY_TEMPLATE.format(
+        **{"object_type": _object_type(item).value, "timestamp": item[DB_SORT_KEY]}
+    )
+    return keys
+
+
+def _sync_keys(object_cls: Type[BaseObject], item: dict[str]) -> dict[str]:
+    return {
+        SYNC_INDEX_PARTITION: _user_id(item),
+        SYNC_INDEX_SORT_KEY: format_modified_at(
+            datetime.fromisoformat(item[DB_SORT_KEY])
+        ),
+    }
+
+
+def _user_id(item: dict[str]) -> str:
+    return item[DB_PARTITION].split(DELIMITER)[0]
+
+
+def _object_type(item: dict[str]) -> ObjectType | None:
+    try:
+        return ObjectType(item[DB_PARTITION].split(DELIMITER)[-1])
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    print(f"Backfilled adjacency keys on {backfill_parent_keys()} items")
+    print(f"Backfilled sync keys on {backfill_sync_keys()} items")
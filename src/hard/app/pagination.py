@@ -0,0 +1,59 @@
+import os
+from typing import Generic, Optional, TypeVar
+
+from itsdangerous import BadSignature, URLSafeSerializer
+from pydantic import BaseModel, Field
+
+from hard.app.errors import InvalidCursorError
+
+CURSOR_SECRET_ENV_VAR = "CURSOR_SECRET_KEY"
+CURSOR_SALT = "hard.pagination.cursor"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+ITEM_TYPE = TypeVar("ITEM_TYPE")
+
+
+class Page(BaseModel, Generic[ITEM_TYPE]):
+    """A single page of a list endpoint, with the cursor for the next one"""
+
+    items: list[ITEM_TYPE]
+    next_cursor: Optional[str] = Field(default=None)
+
+
+def _get_serializer() -> URLSafeSerializer:
+    secret = os.getenv(CURSOR_SECRET_ENV_VAR)
+    if not secret:
+        raise ValueError(f"Missing Environment Variable: `{CURSOR_SECRET_ENV_VAR}`")
+    return URLSafeSerializer(secret, salt=CURSOR_SALT)
+
+
+def encode_cursor(last_key: Optional[dict[str]], partition: str) -> Optional[str]:
+    """
+    Signs a `LastEvaluatedKey` into an opaque continuation token
+
+    The cursor is bound to `partition`, so it cannot be replayed
+    against another user's (or object type's) items
+    """
+    if not last_key:
+        return None
+    return _get_serializer().dumps({"p": partition, "k": last_key})
+
+
+def decode_cursor(cursor: Optional[str], partition: str) -> Optional[dict[str]]:
+    """
+    Verifies a cursor from `encode_cursor` and returns its `ExclusiveStartKey`
+    """
+    if not cursor:
+        return None
+
+    try:
+        payload = _get_serializer().loads(cursor)
+    except BadSignature:
+        raise InvalidCursorError("Invalid Cursor: Signature does not match")
+
+    if not isinstance(payload, dict) or payload.get("p") != partition:
+        raise InvalidCursorError("Invalid Cursor: Cursor does not belong to this list")
+
+    return payload["k"]
@@ -1,20 +1,62 @@
+import asyncio
+import logging
 from datetime import date
-from typing import Optional, Type
+from operator import itemgetter
+from typing import Iterable, Optional, Type
 from uuid import UUID
 
-from hard.aws.dynamodb.base_object import CORE_ATTRIBUTES, DB_OBJECT_TYPE
+from pydantic import BaseModel
+
+from hard.app.aggregates import (
+    aggregate_items,
+    mark_stale,
+    record_set_changes,
+    set_placements,
+    summarize,
+)
+from hard.app.analytics import compute_exercise_stats, exercise_columns
+from hard.app.catalog_cache import (
+    cache_partition,
+    cached_partition,
+    invalidate_partition,
+    is_cached_type,
+    is_versioned_type,
+)
+from hard.app.pagination import DEFAULT_PAGE_SIZE, Page, decode_cursor, encode_cursor
+from hard.app.schemas import (
+    ExerciseStats,
+    StatsSummary,
+    WorkoutDetail,
+    WorkoutExerciseDetail,
+)
+from hard.app.unit_of_work import get_unit_of_work
+from hard.aws.dynamodb.async_handler import run_in_db_executor
+from hard.aws.dynamodb.base_object import (
+    CORE_ATTRIBUTES,
+    DB_OBJECT_TYPE,
+    sync_attributes,
+)
 from hard.aws.dynamodb.consts import (
+    ALT_PARENT_INDEX_NAME,
     DB_PARTITION,
     DB_SORT_KEY,
     ITEM_INDEX_NAME,
     ITEM_INDEX_PARTITION,
     PARTITION_TEMPLATE,
+    WORKOUT_DATE_INDEX_NAME,
+    WORKOUT_DATE_INDEX_SORT_KEY,
+    ConditionalCheckFailedError,
     InvalidAttributeChangeError,
     ItemAccessUnauthorizedError,
     ItemAlreadyExistsError,
     ItemNotFoundError,
 )
-from hard.aws.dynamodb.handler import Attr, Key, get_db_instance
+from hard.aws.dynamodb.handler import (
+    Attr,
+    Key,
+    get_db_instance,
+    workout_date_index_enabled,
+)
 from hard.aws.dynamodb.object_type import ObjectType
 from hard.aws.models.user import User
 from hard.models.exercise import Exercise
@@ -24,6 +66,11 @@ from hard.models.tag import Tag
 from hard.models.tag_join import TagJoin
 from hard.models.workout import Workout
 
+logger = logging.getLogger(__name__)
+
+# Classes whose updates can change the exercise aggregates (see `aggregates`)
+AGGREGATED_CLASSES = (Set, Workout, ExerciseJoin)
+
 
 class RestProcesses:
 
@@ -31,23 +78,68 @@ class RestProcesses:
     def get_list(
         object_cls: Type[DB_OBJECT_TYPE],
         user: User,
+        version: Optional[int] = None,
     ) -> list[DB_OBJECT_TYPE]:
         db = get_db_instance()
+        unit_of_work = get_unit_of_work()
 
-        query = db.query(
-            key_expression=Key(DB_PARTITION).eq(
-                PARTITION_TEMPLATE.format(
-                    **{
-                        "user_id": user.id,
-                        "object_type": ObjectType.from_object_class(object_cls).value,
-                    }
-                )
-            )
+        partition = PARTITION_TEMPLATE.format(
+            **{
+                "user_id": user.id,
+                "object_type": ObjectType.from_object_class(object_cls).value,
+            }
         )
 
-        results = [object_cls.from_db(item) for item in query]
+        if unit_of_work is not None:
+            cached = unit_of_work.get_partition(object_cls, partition)
+            if cached is not None:
+                return cached
+
+        use_catalog_cache = is_cached_type(object_cls)
+        results = None
+
+        if use_catalog_cache:
+            results, version = cached_partition(object_cls, user.id, version)
+
+        if results is None:
+            items = db.query_iter(key_expression=Key(DB_PARTITION).eq(partition))
+            results = object_cls.from_db_list(items)
+
+            if use_catalog_cache:
+                cache_partition(object_cls, user.id, results, version)
+
+        if unit_of_work is not None:
+            unit_of_work.add_partition(object_cls, partition, results)
+
         return results
 
+    @staticmethod
+    def get_page(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[DB_OBJECT_TYPE]:
+        db = get_db_instance()
+
+        partition = PARTITION_TEMPLATE.format(
+            **{
+                "user_id": user.id,
+                "object_type": ObjectType.from_object_class(object_cls).value,
+            }
+        )
+
+        items, last_key = db.query_page(
+            key_expression=Key(DB_PARTITION).eq(partition),
+            limit=limit or DEFAULT_PAGE_SIZE,
+            exclusive_start_key=decode_cursor(cursor, partition),
+        )
+
+        return Page[object_cls](
+            items=object_cls.from_db_list(items),
+            next_cursor=encode_cursor(last_key, partition),
+        )
+
     @staticmethod
     def get(
         object_cls: Type[DB_OBJECT_TYPE],
@@ -55,21 +147,33 @@ class RestProcesses:
         object_id: UUID,
     ) -> DB_OBJECT_TYPE:
         db = get_db_instance()
+        unit_of_work = get_unit_of_work()
 
-        query = db.query(
-            secondary_index_name=ITEM_INDEX_NAME,
-            key_expression=Key(ITEM_INDEX_PARTITION).eq(str(object_id)),
+        result = (
+            unit_of_work.get_object(object_cls, object_id)
+            if unit_of_work is not None
+            else None
         )
 
-        try:
-            item = query[0]
-
-        except IndexError:
-            raise ItemNotFoundError(
-                f"No `{ObjectType.from_object_class(object_cls).value}` found with `object_id`: '{object_id}'"
+        if result is None:
+            query = db.query_all(
+                secondary_index_name=ITEM_INDEX_NAME,
+                key_expression=Key(ITEM_INDEX_PARTITION).eq(str(object_id)),
+                max_items=1,
             )
 
-        result = object_cls.from_db(item)
+            try:
+                item = query[0]
+
+            except IndexError:
+                raise ItemNotFoundError(
+                    f"No `{ObjectType.from_object_class(object_cls).value}` found with `object_id`: '{object_id}'"
+                )
+
+            result = object_cls.from_db(item)
+
+            if unit_of_work is not None:
+                unit_of_work.add_object(result)
 
         if not result.owned_by(user):
             raise ItemAccessUnauthorizedError(
@@ -85,23 +189,50 @@ class RestProcesses:
         data_object: DB_OBJECT_TYPE,
     ) -> DB_OBJECT_TYPE:
         db = get_db_instance()
+        object_type = ObjectType.from_object_class(object_cls)
 
-        if data_object.object_id:
+        if data_object.user_id is not None and not data_object.owned_by(user):
+            raise ItemAccessUnauthorizedError(
+                f"`{object_type.value}` Item not owned by current user ({user.id}): Cannot Create"
+            )
 
+        if data_object.object_id:
+            # A caller-chosen `object_id` can clash with an item under any
+            # key, which a condition on this item's key cannot detect
             try:
                 RestProcesses.get(object_cls, user, data_object.object_id)
 
             except ItemNotFoundError:
                 pass
 
+            except ItemAccessUnauthorizedError:
+                # Owned by someone else, but the `object_id` is still taken
+                raise ItemAlreadyExistsError(
+                    f"Found `{object_type.value}` with `object_id`: '{data_object.object_id}': Cannot Create"
+                )
+
             else:
                 raise ItemAlreadyExistsError(
-                    f"Found `{ObjectType.from_object_class(object_cls).value}` with `object_id`: '{data_object.object_id}': Cannot Create"
+                    f"Found `{object_type.value}` with `object_id`: '{data_object.object_id}': Cannot Create"
                 )
 
-        data_object.init_from_request(user, ObjectType.from_object_class(object_cls))
-        result = db.put(data_object=data_object)
-        return result
+        data_object.init_from_request(user, object_type)
+
+        try:
+            db.put(
+                data_object=data_object,
+                condition_expression=Attr(DB_PARTITION).not_exists(),
+            )
+
+        except ConditionalCheckFailedError:
+            raise ItemAlreadyExistsError(
+                f"Found `{object_type.value}` with `object_id`: '{data_object.object_id}': Cannot Create"
+            )
+
+        invalidate_objects(data_object)
+        if object_cls is Set:
+            update_set_aggregates(user, added=[data_object])
+        return data_object
 
     @staticmethod
     def put(
@@ -117,22 +248,138 @@ class RestProcesses:
                 f"`{updated_object.object_type.value}` Item does not have a valid `object_id`"
             )
 
+        if updated_object.timestamp is None:
+            # Without its sort key the item cannot be addressed by the write,
+            # so the stored item is read to report what the body is missing
+            RestProcesses._raise_update_failure(object_cls, user, updated_object)
+
+        # The key pins `user_id`, `object_type` and `timestamp`, so only
+        # `object_id` needs checking to know the core attributes are unchanged
+        condition = Attr(DB_PARTITION).exists() & Attr(ITEM_INDEX_PARTITION).eq(
+            str(updated_object.object_id)
+        )
+
+        # Aggregates need the values being replaced (see `update_aggregates`),
+        # so for their classes the write returns the item it replaced
+        tracked = object_cls in AGGREGATED_CLASSES
+
         try:
-            current_obj = RestProcesses.get(object_cls, user, updated_object.object_id)
+            item = db.put(
+                data_object=updated_object,
+                condition_expression=condition,
+                return_values="ALL_OLD" if tracked else "NONE",
+            )
+
+        except ConditionalCheckFailedError:
+            RestProcesses._raise_update_failure(object_cls, user, updated_object)
+
+        invalidate_objects(updated_object)
+        if tracked:
+            update_aggregates(user, object_cls.from_db(item), updated_object)
+        return updated_object
+
+    @staticmethod
+    def patch(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        object_id: UUID,
+        changes: BaseModel,
+    ) -> DB_OBJECT_TYPE:
+        """
+        Applies a sparse update (see `BaseObject.partial_model`) in one `UpdateItem`
+
+        Fields set to `None` are removed. If `changes` carries the item's
+        `timestamp` no read is needed, otherwise the key is looked up first
+        """
+        db = get_db_instance()
+        object_type = ObjectType.from_object_class(object_cls)
+
+        fields = changes.model_dump(exclude_unset=True)
+        timestamp = fields.pop("timestamp", None)
+
+        set_values = {
+            attr: value for attr, value in fields.items() if value is not None
+        }
+        remove_attrs = [attr for attr, value in fields.items() if value is None]
 
-        except ItemNotFoundError:
-            raise ItemNotFoundError(
-                f"No `{ObjectType.from_object_class(object_cls).value}` found with `object_id`: '{updated_object.object_id}': Cannot Update"
+        for attr in remove_attrs:
+            if object_cls.model_fields[attr].is_required():
+                raise InvalidAttributeChangeError(
+                    f"Cannot Remove required `{attr}` Attribute on `{object_type.value}`"
+                )
+
+        if timestamp is None or not fields:
+            current_obj = _get_for(object_cls, user, object_id, "Update")
+            if not fields:
+                return current_obj
+            timestamp = current_obj.timestamp
+
+        target = object_cls.model_construct(
+            user_id=user.id,
+            object_type=object_type,
+            object_id=object_id,
+            timestamp=timestamp,
+        )
+        serialized = object_cls.model_construct(**set_values).db_values(
+            include=set(set_values)
+        )
+        # Re-parenting must move the item within the adjacency indexes too
+        serialized.update(object_cls.parent_index_keys(user.id, serialized))
+        serialized.update(sync_attributes(user.id))
+        condition = Attr(DB_PARTITION).exists() & Attr(ITEM_INDEX_PARTITION).eq(
+            str(object_id)
+        )
+
+        # Aggregates need the values being replaced, so for their classes the
+        # old item is returned instead and the updated one is worked out from it
+        tracked = object_cls in AGGREGATED_CLASSES
+
+        try:
+            item = db.update(
+                key=target.primary_key(),
+                set_attrs=serialized,
+                remove_attrs=remove_attrs,
+                condition_expression=condition,
+                return_values="ALL_OLD" if tracked else "ALL_NEW",
             )
 
+        except ConditionalCheckFailedError:
+            RestProcesses._raise_update_failure(object_cls, user, target)
+
+        invalidate_objects(target)
+
+        if not tracked:
+            return object_cls.from_db(item)
+
+        previous = object_cls.from_db(item)
+        item = {**item, **serialized}
+        for attr in remove_attrs:
+            item.pop(attr, None)
+        result = object_cls.from_db(item)
+
+        update_aggregates(user, previous, result)
+        return result
+
+    @staticmethod
+    def _raise_update_failure(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        updated_object: DB_OBJECT_TYPE,
+    ) -> None:
+        """Works out why a conditional update was rejected, and raises it"""
+        object_type = ObjectType.from_object_class(object_cls)
+        current_obj = _get_for(object_cls, user, updated_object.object_id, "Update")
+
         for attr in CORE_ATTRIBUTES:
             if current_obj.__dict__[attr] != updated_object.__dict__[attr]:
                 raise InvalidAttributeChangeError(
                     f"Cannot Modify `{attr}` Attribute on `{current_obj.object_type.value}`"
                 )
 
-        result = db.put(data_object=updated_object)
-        return result
+        # The item was replaced between the write and this read
+        raise ItemNotFoundError(
+            f"No `{object_type.value}` found with `object_id`: '{updated_object.object_id}': Cannot Update"
+        )
 
     @staticmethod
     def delete(
@@ -142,26 +389,216 @@ class RestProcesses:
     ) -> DB_OBJECT_TYPE:
         db = get_db_instance()
 
-        try:
-            to_delete = RestProcesses.get(object_cls, user, object_id)
+        to_delete = _get_for(object_cls, user, object_id, "Delete")
 
-        except ItemNotFoundError:
-            raise ItemNotFoundError(
-                f"No `{ObjectType.from_object_class(object_cls).value}` found with `object_id`: '{object_id}': Cannot Delete"
-            )
+        result = db.delete(to_delete)
+        invalidate_objects(result)
+        if object_cls is Set:
+            update_set_aggregates(user, removed=[result])
+        return result
 
-        except ItemAccessUnauthorizedError:
-            raise ItemAccessUnauthorizedError(
-                f"`{ObjectType.from_object_class(object_cls).value}` Item not owned by current user ({user.id}): Cannot Delete"
-            )
 
-        return db.delete(to_delete)
+def invalidate_objects(*data_objects: DB_OBJECT_TYPE) -> None:
+    """
+    Forgets `data_objects`, just written, in the request's unit of work, and
+    moves on the versions of any catalog partitions they belong to
+    """
+    unit_of_work = get_unit_of_work()
+    if unit_of_work is not None:
+        for data_object in data_objects:
+            unit_of_work.invalidate(data_object)
+
+    cached_partitions = {
+        (type(data_object), data_object.user_id)
+        for data_object in data_objects
+        if is_versioned_type(type(data_object))
+    }
+    for object_cls, user_id in cached_partitions:
+        invalidate_partition(object_cls, user_id)
+
+
+def update_set_aggregates(
+    user: User,
+    removed: list[Set] = (),
+    added: list[Set] = (),
+    placements: Optional[dict[str, tuple[str, date]]] = None,
+) -> None:
+    """
+    Brings the exercise aggregates in line with a write of sets that has
+    already succeeded (see `aggregates.record_set_changes`)
+
+    A failure here is logged rather than raised, as the sets themselves
+    are stored; `python -m hard.app.aggregates` repairs the totals
+    """
+    try:
+        record_set_changes(user, removed, added, placements)
+
+    except Exception:
+        logger.exception("Failed to update exercise aggregates for %s", user.id)
+
+
+def update_aggregates(
+    user: User, previous: DB_OBJECT_TYPE, result: DB_OBJECT_TYPE
+) -> None:
+    """
+    Brings the exercise aggregates in line with an update of one of
+    `AGGREGATED_CLASSES` that has already succeeded
+
+    A set's old and new values are applied as they are. Re-dating a
+    `Workout`, or moving an `ExerciseJoin` to another workout or exercise,
+    moves every set below it, so the exercises involved are marked stale
+    and rebuilt when their aggregates are next read (see `mark_stale`)
+
+    As in `update_set_aggregates`, a failure here is logged rather than raised
+    """
+    if isinstance(result, Set):
+        update_set_aggregates(user, removed=[previous], added=[result])
+        return
+
+    if isinstance(result, Workout):
+        if previous.workout_date == result.workout_date:
+            return
+    elif (previous.exercise_id, previous.workout_id) == (
+        result.exercise_id,
+        result.workout_id,
+    ):
+        return
+
+    try:
+        if isinstance(result, Workout):
+            exercise_ids = {
+                join.exercise_id
+                for join in exercise_join_filter(user, workout_id=result.object_id)
+            }
+        else:
+            exercise_ids = {previous.exercise_id, result.exercise_id}
+
+        mark_stale(user, exercise_ids)
+
+    except Exception:
+        logger.exception("Failed to mark exercise aggregates stale for %s", user.id)
+
+
+class AsyncRestProcesses:
+    """
+    Awaitable versions of `RestProcesses`, for use in async routes
+
+    Each call runs on the DynamoDB executor, so the event loop is
+    free to serve other requests (or overlap independent calls)
+    """
+
+    @staticmethod
+    async def get_list(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        version: Optional[int] = None,
+    ) -> list[DB_OBJECT_TYPE]:
+        return await run_in_db_executor(
+            RestProcesses.get_list, object_cls, user, version
+        )
+
+    @staticmethod
+    async def get_page(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[DB_OBJECT_TYPE]:
+        return await run_in_db_executor(
+            RestProcesses.get_page, object_cls, user, limit=limit, cursor=cursor
+        )
+
+    @staticmethod
+    async def get(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        object_id: UUID,
+    ) -> DB_OBJECT_TYPE:
+        return await run_in_db_executor(RestProcesses.get, object_cls, user, object_id)
+
+    @staticmethod
+    async def post(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        data_object: DB_OBJECT_TYPE,
+    ) -> DB_OBJECT_TYPE:
+        return await run_in_db_executor(
+            RestProcesses.post, object_cls, user, data_object
+        )
+
+    @staticmethod
+    async def put(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        updated_object: DB_OBJECT_TYPE,
+    ) -> DB_OBJECT_TYPE:
+        return await run_in_db_executor(
+            RestProcesses.put, object_cls, user, updated_object
+        )
+
+    @staticmethod
+    async def patch(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        object_id: UUID,
+        changes: BaseModel,
+    ) -> DB_OBJECT_TYPE:
+        return await run_in_db_executor(
+            RestProcesses.patch, object_cls, user, object_id, changes
+        )
+
+    @staticmethod
+    async def delete(
+        object_cls: Type[DB_OBJECT_TYPE],
+        user: User,
+        object_id: UUID,
+    ) -> DB_OBJECT_TYPE:
+        return await run_in_db_executor(
+            RestProcesses.delete, object_cls, user, object_id
+        )
 
 
 def workout_date_filter(
     user: User,
     requested_date: date,
 ) -> list[Workout]:
+    return workout_date_range_filter(user, requested_date, requested_date)
+
+
+def workout_date_range_filter(
+    user: User,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> list[Workout]:
+    """
+    Fetches the user's workouts between `from_date` and `to_date` (inclusive)
+
+    Either bound may be omitted. See `workout_items_by_date`
+    """
+    if not (from_date or to_date):
+        raise ValueError(
+            "Invalid Usage: `workout_date_range_filter` requires either `from_date` or `to_date` or both, None provided"
+        )
+
+    json_items = workout_items_by_date(user, from_date, to_date)
+    workouts = Workout.from_db_list(json_items)
+
+    return workouts
+
+
+def workout_items_by_date(
+    user: User,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> Iterable[dict[str]]:
+    """
+    The user's stored workouts between `from_date` and `to_date` (inclusive,
+    either or both may be omitted), in date order
+
+    Runs as a key condition on the `WorkoutDateSearch` index, so only
+    matching workouts are read. Unless `WORKOUT_DATE_INDEX_ENABLED` is set,
+    the workout partition is read, filtered and sorted instead
+    """
     db = get_db_instance()
 
     partition = PARTITION_TEMPLATE.format(
@@ -171,15 +608,32 @@ def workout_date_filter(
         }
     )
 
-    filter = Attr("workout_date").eq(requested_date.isoformat())
+    # Key and filter conditions are built alike, only the class differs
+    indexed = workout_date_index_enabled()
+    date_key = (Key if indexed else Attr)(WORKOUT_DATE_INDEX_SORT_KEY)
+    if from_date and to_date:
+        date_condition = date_key.between(from_date.isoformat(), to_date.isoformat())
+    elif from_date:
+        date_condition = date_key.gte(from_date.isoformat())
+    elif to_date:
+        date_condition = date_key.lte(to_date.isoformat())
+    else:
+        date_condition = None
+
+    if indexed:
+        key_expression = Key(DB_PARTITION).eq(partition)
+        if date_condition is not None:
+            key_expression = key_expression & date_condition
+        return db.query_iter(
+            secondary_index_name=WORKOUT_DATE_INDEX_NAME,
+            key_expression=key_expression,
+        )
 
-    json_items = db.query(
+    json_items = db.query_iter(
         key_expression=Key(DB_PARTITION).eq(partition),
-        filter_expression=filter,
+        filter_expression=date_condition,
     )
-    workouts = [Workout.from_db(item) for item in json_items]
-
-    return workouts
+    return sorted(json_items, key=itemgetter(WORKOUT_DATE_INDEX_SORT_KEY))
 
 
 def exercise_join_filter(
@@ -195,25 +649,25 @@ def exercise_join_filter(
 
     db = get_db_instance()
 
-    partition = PARTITION_TEMPLATE.format(
-        **{
-            "user_id": user.id,
-            "object_type": ObjectType.EXCERCISE_JOIN.value,
-        }
-    )
-
-    filter = None
-    if exercise_id:
-        filter = Attr("exercise_id").eq(str(exercise_id))
+    # Either parent narrows the lookup to a single index key; with both,
+    # the workout (the smaller set of joins) is looked up and filtered
     if workout_id:
-        workout_filter = Attr("workout_id").eq(str(workout_id))
-        filter = filter & workout_filter if filter else workout_filter
-
-    json_items = db.query(
-        key_expression=Key(DB_PARTITION).eq(partition),
-        filter_expression=filter,
-    )
-    joins = [ExerciseJoin.from_db(item) for item in json_items]
+        json_items = db.query_children(
+            user,
+            parent_ids=[str(workout_id)],
+            child_type=ObjectType.EXCERCISE_JOIN,
+            filter_expression=(
+                Attr("exercise_id").eq(str(exercise_id)) if exercise_id else None
+            ),
+        )
+    else:
+        json_items = db.query_children(
+            user,
+            parent_ids=[str(exercise_id)],
+            child_type=ObjectType.EXCERCISE_JOIN,
+            secondary_index_name=ALT_PARENT_INDEX_NAME,
+        )
+    joins = ExerciseJoin.from_db_list(json_items)
 
     return joins
 
@@ -253,22 +707,13 @@ def exercises_from_workout_id(user: User, workout_id: UUID) -> list[Exercise]:
 def sets_from_ids(
     user: User, /, workout_id: Optional[UUID] = None, exercise_id: Optional[UUID] = None
 ) -> list[Set]:
-    db = get_db_instance()
-
     joins = exercise_join_filter(
         user,
         workout_id=workout_id,
         exercise_id=exercise_id,
     )
-    join_ids = [str(join.object_id) for join in joins]
 
-    sets = db.batch_get(
-        user,
-        target_object_cls=Set,
-        search_attr="exercise_join_id",
-        matches_list=join_ids,
-    )
-    return sets
+    return sets_from_joins(user, joins)
 
 
 def tag_join_filter(
@@ -284,24 +729,20 @@ def tag_join_filter(
 
     db = get_db_instance()
 
-    partition = PARTITION_TEMPLATE.format(
-        **{
-            "user_id": user.id,
-            "object_type": ObjectType.TAG_JOIN.value,
-        }
-    )
-
-    filter = None
-    if tag_id:
-        filter = Attr("tag_id").eq(str(tag_id))
     if target_id:
-        filter = Attr("target_id").eq(str(target_id))
-
-    json_items = db.query(
-        key_expression=Key(DB_PARTITION).eq(partition),
-        filter_expression=filter,
-    )
-    joins = [TagJoin.from_db(item) for item in json_items]
+        json_items = db.query_children(
+            user,
+            parent_ids=[str(target_id)],
+            child_type=ObjectType.TAG_JOIN,
+        )
+    else:
+        json_items = db.query_children(
+            user,
+            parent_ids=[str(tag_id)],
+            child_type=ObjectType.TAG_JOIN,
+            secondary_index_name=ALT_PARENT_INDEX_NAME,
+        )
+    joins = TagJoin.from_db_list(json_items)
 
     return joins
 
@@ -322,3 +763,224 @@ def tags_from_target_id(user: User, /, target_id: UUID) -> list[Tag]:
         matches_list=tag_ids,
     )
     return tags
+
+
+def _delete_object_graph(
+    user: User,
+    root: DB_OBJECT_TYPE,
+    descendants: list[DB_OBJECT_TYPE],
+) -> DB_OBJECT_TYPE:
+    for data_object in [root, *descendants]:
+        if not data_object.owned_by(user):
+            raise ItemAccessUnauthorizedError(
+                f"`{data_object.object_type.value}` Item not owned by current user ({user.id}): Cannot Delete"
+            )
+
+    db = get_db_instance()
+
+    # Children go first, so a failure part way never orphans them
+    db.batch_write(delete_objects=descendants)
+    db.batch_write(delete_objects=[root])
+
+    invalidate_objects(root, *descendants)
+    return root
+
+
+def _get_for(
+    object_cls: Type[DB_OBJECT_TYPE],
+    user: User,
+    object_id: UUID,
+    action: str,
+) -> DB_OBJECT_TYPE:
+    """`RestProcesses.get`, with errors worded for the given `action`"""
+    try:
+        return RestProcesses.get(object_cls, user, object_id)
+
+    except ItemNotFoundError:
+        raise ItemNotFoundError(
+            f"No `{ObjectType.from_object_class(object_cls).value}` found with `object_id`: '{object_id}': Cannot {action}"
+        )
+
+    except ItemAccessUnauthorizedError:
+        raise ItemAccessUnauthorizedError(
+            f"`{ObjectType.from_object_class(object_cls).value}` Item not owned by current user ({user.id}): Cannot {action}"
+        )
+
+
+def sets_from_joins(user: User, joins: list[ExerciseJoin]) -> list[Set]:
+    if not joins:
+        return []
+
+    db = get_db_instance()
+
+    json_items = db.query_children(
+        user,
+        parent_ids=[str(join.object_id) for join in joins],
+        child_type=ObjectType.SET,
+    )
+    return Set.from_db_list(json_items)
+
+
+def delete_exercise_join_cascade(
+    user: User,
+    exercise_join: ExerciseJoin | UUID,
+) -> ExerciseJoin:
+    """
+    Deletes an `ExerciseJoin` along with every `Set` logged against it
+
+    Accepts either the join itself (if already fetched) or its `object_id`
+    """
+    if not isinstance(exercise_join, ExerciseJoin):
+        exercise_join = _get_for(ExerciseJoin, user, exercise_join, "Delete")
+
+    sets = sets_from_joins(user, [exercise_join])
+    # Read while the join is still stored
+    placements = set_placements(user, sets) if sets else {}
+
+    _delete_object_graph(user, exercise_join, sets)
+    update_set_aggregates(user, removed=sets, placements=placements)
+    return exercise_join
+
+
+def delete_workout_cascade(user: User, workout_id: UUID) -> Workout:
+    """
+    Deletes a `Workout` along with its `ExerciseJoin`s and their `Set`s
+
+    The whole object graph is read up front (one query per object type)
+    and removed with batched writes
+    """
+    workout = _get_for(Workout, user, workout_id, "Delete")
+
+    joins = exercise_join_filter(user, workout_id=workout_id)
+    sets = sets_from_joins(user, joins)
+
+    _delete_object_graph(user, workout, [*sets, *joins])
+    update_set_aggregates(
+        user,
+        removed=sets,
+        placements={
+            str(join.object_id): (str(join.exercise_id), workout.workout_date)
+            for join in joins
+        },
+    )
+    return workout
+
+
+def objects_by_id(
+    object_cls: Type[DB_OBJECT_TYPE],
+    user: User,
+    object_ids: list[UUID | str],
+) -> list[DB_OBJECT_TYPE]:
+    """
+    Fetches the user's `object_cls` items with the given ids, in id order
+
+    Ids that don't exist (or belong to another user) are skipped
+    """
+    if not object_ids:
+        return []
+
+    db = get_db_instance()
+
+    partition = PARTITION_TEMPLATE.format(
+        **{
+            "user_id": user.id,
+            "object_type": ObjectType.from_object_class(object_cls).value,
+        }
+    )
+    json_items = db.get_items_by_id(
+        [str(object_id) for object_id in object_ids], partition=partition
+    )
+    return object_cls.from_db_list(json_items)
+
+
+def tag_joins_from_target_ids(user: User, target_ids: list[UUID]) -> list[TagJoin]:
+    if not target_ids:
+        return []
+
+    db = get_db_instance()
+
+    json_items = db.query_children(
+        user,
+        parent_ids=[str(target_id) for target_id in target_ids],
+        child_type=ObjectType.TAG_JOIN,
+    )
+    return TagJoin.from_db_list(json_items)
+
+
+async def workout_detail(user: User, workout_id: UUID) -> WorkoutDetail:
+    """
+    Builds a `Workout` with its exercises, sets and tags
+
+    Reads run in three concurrent rounds, each depending on ids from the last:
+    the workout, its joins and its tag joins; then the exercises, their sets
+    and the exercises' tag joins; then every referenced tag
+    """
+    workout, joins, workout_tag_joins = await asyncio.gather(
+        AsyncRestProcesses.get(Workout, user, workout_id),
+        run_in_db_executor(exercise_join_filter, user, workout_id=workout_id),
+        run_in_db_executor(tag_joins_from_target_ids, user, [workout_id]),
+    )
+
+    exercise_ids = list(dict.fromkeys(join.exercise_id for join in joins))
+    exercises, sets, exercise_tag_joins = await asyncio.gather(
+        run_in_db_executor(objects_by_id, Exercise, user, exercise_ids),
+        run_in_db_executor(sets_from_joins, user, joins),
+        run_in_db_executor(tag_joins_from_target_ids, user, exercise_ids),
+    )
+
+    tag_joins = [*workout_tag_joins, *exercise_tag_joins]
+    tags = await run_in_db_executor(
+        objects_by_id, Tag, user, list(dict.fromkeys(join.tag_id for join in tag_joins))
+    )
+
+    tags_by_id = {tag.object_id: tag for tag in tags}
+    tags_by_target = {}
+    for tag_join in tag_joins:
+        if tag_join.tag_id in tags_by_id:
+            tags_by_target.setdefault(tag_join.target_id, []).append(
+                tags_by_id[tag_join.tag_id]
+            )
+
+    exercises_by_id = {exercise.object_id: exercise for exercise in exercises}
+    sets_by_join = {}
+    for set in sets:
+        sets_by_join.setdefault(set.exercise_join_id, []).append(set)
+
+    return WorkoutDetail(
+        workout=workout,
+        tags=tags_by_target.get(workout.object_id, []),
+        exercises=[
+            WorkoutExerciseDetail(
+                exercise_join=join,
+                exercise=exercises_by_id.get(join.exercise_id),
+                sets=sets_by_join.get(str(join.object_id), []),
+                tags=tags_by_target.get(join.exercise_id, []),
+            )
+            for join in joins
+        ],
+    )
+
+
+async def exercise_stats(user: User, exercise_id: UUID) -> ExerciseStats:
+    """Progress on one exercise, computed from all of its sets (see `analytics`)"""
+    exercise, columns = await asyncio.gather(
+        AsyncRestProcesses.get(Exercise, user, exercise_id),
+        run_in_db_executor(exercise_columns, user, exercise_id),
+    )
+
+    return compute_exercise_stats(columns, exercise)
+
+
+async def stats_summary(user: User) -> StatsSummary:
+    """
+    Totals across all of the user's exercises, read from their aggregates
+    (see `aggregates`): one item per exercise, however long the history
+    """
+    exercises, items = await asyncio.gather(
+        AsyncRestProcesses.get_list(Exercise, user),
+        run_in_db_executor(aggregate_items, user),
+    )
+
+    return summarize(
+        items, {str(exercise.object_id): exercise.name for exercise in exercises}
+    )
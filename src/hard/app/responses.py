@@ -0,0 +1,40 @@
+from functools import cache
+from typing import Type
+
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from hard.app.metrics import timed_serialization
+from hard.app.pagination import Page
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """`ORJSONResponse` that counts its rendering as serialization time"""
+
+    def render(self, content) -> bytes:
+        with timed_serialization():
+            return super().render(content)
+
+
+@cache
+def _adapter(content_type: type) -> TypeAdapter:
+    return TypeAdapter(content_type)
+
+
+def list_response(
+    object_cls: Type[DB_OBJECT_TYPE], result: list[DB_OBJECT_TYPE] | Page
+) -> Response:
+    """
+    Serializes a list endpoint's result to JSON bytes in a single pass
+
+    The items have already been validated by `from_db`, so returning a
+    `Response` skips FastAPI's `response_model` re-validation (the route's
+    `response_model` is still used for the OpenAPI schema)
+    """
+    content_type = type(result) if isinstance(result, Page) else list[object_cls]
+    with timed_serialization():
+        content = _adapter(content_type).dump_json(result)
+    return Response(content=content, media_type=JSON_MEDIA_TYPE)
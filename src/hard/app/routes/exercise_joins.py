@@ -1,34 +1,57 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from starlette.requests import Request
-
-from hard.app.processes import RestProcesses, exercise_join_filter
-from hard.aws.dynamodb.handler import get_db_instance
+from starlette.responses import Response
+
+from hard.app.batch import batch_delete, batch_post
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import (
+    AsyncRestProcesses,
+    delete_exercise_join_cascade,
+    exercise_join_filter,
+)
+from hard.app.responses import list_response
+from hard.app.schemas import BatchDeleteRequest, BatchResult, BatchWriteRequest
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
 from hard.models.exercise_join import ExerciseJoin
-from hard.models.set import Set
 
 router = APIRouter(prefix="/exercise-joins")
 
+ExerciseJoinPatch = ExerciseJoin.partial_model()
+
 
-@router.get("", response_model=list[ExerciseJoin])
+@router.get("", response_model=list[ExerciseJoin] | Page[ExerciseJoin])
 async def list_exercise_joins(
     req: Request,
     exercise: Optional[UUID] = None,
     workout: Optional[UUID] = None,
-) -> list[ExerciseJoin] | ExerciseJoin:
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
     if exercise or workout:
-        relevant_joins = exercise_join_filter(user, exercise, workout)
+        relevant_joins = await run_in_db_executor(
+            exercise_join_filter, user, exercise, workout
+        )
         if len(relevant_joins) == 0:
             raise HTTPException(status_code=404, detail="No joins found")
 
         else:
-            return relevant_joins
+            return list_response(ExerciseJoin, relevant_joins)
+    elif limit or cursor:
+        return list_response(
+            ExerciseJoin,
+            await AsyncRestProcesses.get_page(
+                ExerciseJoin, user, limit=limit, cursor=cursor
+            ),
+        )
     else:
-        return RestProcesses.get_list(ExerciseJoin, user)
+        return list_response(
+            ExerciseJoin, await AsyncRestProcesses.get_list(ExerciseJoin, user)
+        )
 
 
 @router.get("/{exercise_join_id}", response_model=ExerciseJoin)
@@ -37,7 +60,9 @@ async def get_exercise_join(
     exercise_join_id: str,
 ) -> ExerciseJoin:
     user = request.get_user_claims(req)
-    exercise_join = RestProcesses.get(ExerciseJoin, user, UUID(exercise_join_id))
+    exercise_join = await AsyncRestProcesses.get(
+        ExerciseJoin, user, UUID(exercise_join_id)
+    )
 
     return exercise_join
 
@@ -48,7 +73,9 @@ async def create_exercise_join(
     exercise_join: ExerciseJoin,
 ) -> ExerciseJoin:
     user = request.get_user_claims(req)
-    created_exercise_join = RestProcesses.post(ExerciseJoin, user, exercise_join)
+    created_exercise_join = await AsyncRestProcesses.post(
+        ExerciseJoin, user, exercise_join
+    )
 
     return created_exercise_join
 
@@ -61,30 +88,36 @@ async def update_exercise_join(
 ) -> ExerciseJoin:
     user = request.get_user_claims(req)
     exercise_join.object_id = UUID(exercise_join_id)
-    updated_exercise_join = RestProcesses.put(ExerciseJoin, user, exercise_join)
+    updated_exercise_join = await AsyncRestProcesses.put(
+        ExerciseJoin, user, exercise_join
+    )
 
     return updated_exercise_join
 
 
-@router.delete("/{exercise_join_id}", response_model=ExerciseJoin)
-async def delete_exercise_join(
+@router.patch("/{exercise_join_id}", response_model=ExerciseJoin)
+async def patch_exercise_join(
     req: Request,
     exercise_join_id: str,
+    changes: ExerciseJoinPatch,
 ) -> ExerciseJoin:
     user = request.get_user_claims(req)
-    db = get_db_instance()
-    deleted_exercise_join = RestProcesses.delete(
-        ExerciseJoin, user, UUID(exercise_join_id)
+    patched_exercise_join = await AsyncRestProcesses.patch(
+        ExerciseJoin, user, UUID(exercise_join_id), changes
     )
 
-    sets = db.batch_get(
-        user,
-        target_object_cls=Set,
-        search_attr="exercise_join_id",
-        matches_list=[exercise_join_id],
+    return patched_exercise_join
+
+
+@router.delete("/{exercise_join_id}", response_model=ExerciseJoin)
+async def delete_exercise_join(
+    req: Request,
+    exercise_join_id: str,
+) -> ExerciseJoin:
+    user = request.get_user_claims(req)
+    deleted_exercise_join = await run_in_db_executor(
+        delete_exercise_join_cascade, user, UUID(exercise_join_id)
     )
-    for set in sets:
-        RestProcesses.delete(Set, user, set.object_id)
 
     return deleted_exercise_join
 
@@ -95,27 +128,45 @@ async def delete_exercise_join_from_ids(
     exercise: UUID,
     workout: UUID,
 ) -> ExerciseJoin:
-    db = get_db_instance()
     user = request.get_user_claims(req)
-    relevant_joins = exercise_join_filter(user, exercise, workout)
+    relevant_joins = await run_in_db_executor(
+        exercise_join_filter, user, exercise, workout
+    )
     if len(relevant_joins) == 0:
         raise HTTPException(status_code=404, detail="No joins found")
     elif len(relevant_joins) > 1:
         raise HTTPException(status_code=409, detail="Multiple joins found")
     else:
-        to_delete = relevant_joins[0]
-
-        sets = db.batch_get(
-            user,
-            target_object_cls=Set,
-            search_attr="exercise_join_id",
-            matches_list=[str(to_delete.object_id)],
-        )
-        for set in sets:
-            RestProcesses.delete(Set, user, set.object_id)
-
-        deleted_exercise_join = RestProcesses.delete(
-            ExerciseJoin, user, to_delete.object_id
+        deleted_exercise_join = await run_in_db_executor(
+            delete_exercise_join_cascade, user, relevant_joins[0]
         )
 
         return deleted_exercise_join
+
+
+@router.post(":batch", response_model=BatchResult[ExerciseJoin])
+async def batch_create_exercise_joins(
+    req: Request,
+    batch: BatchWriteRequest[ExerciseJoin],
+    atomic: bool = False,
+) -> BatchResult[ExerciseJoin]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(
+        batch_post, ExerciseJoin, user, batch.items, atomic
+    )
+
+    return result
+
+
+@router.delete(":batch", response_model=BatchResult[ExerciseJoin])
+async def batch_delete_exercise_joins(
+    req: Request,
+    batch: BatchDeleteRequest,
+    atomic: bool = False,
+) -> BatchResult[ExerciseJoin]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(
+        batch_delete, ExerciseJoin, user, batch.object_ids, atomic
+    )
+
+    return result
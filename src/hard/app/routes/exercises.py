@@ -1,27 +1,51 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
-
-from hard.app.processes import RestProcesses, exercises_from_workout_id
+from starlette.responses import Response
+
+from hard.app.conditional import versioned_list_response
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import (
+    AsyncRestProcesses,
+    exercise_stats,
+    exercises_from_workout_id,
+)
+from hard.app.responses import list_response
+from hard.app.schemas import ExerciseStats
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
 from hard.models.exercise import Exercise
 
 router = APIRouter(prefix="/exercises")
 
+ExercisePatch = Exercise.partial_model()
+
 
-@router.get("", response_model=list[Exercise])
+@router.get("", response_model=list[Exercise] | Page[Exercise])
 async def list_exercises(
     req: Request,
     workout: Optional[UUID] = None,
-) -> list[Exercise]:
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
 
     if workout:
-        return exercises_from_workout_id(user, workout)
+        return list_response(
+            Exercise, await run_in_db_executor(exercises_from_workout_id, user, workout)
+        )
 
-    return RestProcesses.get_list(Exercise, user)
+    if limit or cursor:
+        return list_response(
+            Exercise,
+            await AsyncRestProcesses.get_page(
+                Exercise, user, limit=limit, cursor=cursor
+            ),
+        )
+
+    return await versioned_list_response(req, Exercise, user)
 
 
 @router.get("/{exercise_id}", response_model=Exercise)
@@ -30,18 +54,29 @@ async def get_exercise(
     exercise_id: str,
 ) -> Exercise:
     user = request.get_user_claims(req)
-    exercise = RestProcesses.get(Exercise, user, UUID(exercise_id))
+    exercise = await AsyncRestProcesses.get(Exercise, user, UUID(exercise_id))
 
     return exercise
 
 
+@router.get("/{exercise_id}/stats", response_model=ExerciseStats)
+async def get_exercise_stats(
+    req: Request,
+    exercise_id: str,
+) -> ExerciseStats:
+    user = request.get_user_claims(req)
+    stats = await exercise_stats(user, UUID(exercise_id))
+
+    return stats
+
+
 @router.post("", response_model=Exercise, status_code=201)
 async def create_exercise(
     req: Request,
     exercise: Exercise,
 ) -> Exercise:
     user = request.get_user_claims(req)
-    created_exercise = RestProcesses.post(Exercise, user, exercise)
+    created_exercise = await AsyncRestProcesses.post(Exercise, user, exercise)
 
     return created_exercise
 
@@ -54,17 +89,33 @@ async def update_exercise(
 ) -> Exercise:
     user = request.get_user_claims(req)
     exercise.object_id = UUID(exercise_id)
-    updated_exercise = RestProcesses.put(Exercise, user, exercise)
+    updated_exercise = await AsyncRestProcesses.put(Exercise, user, exercise)
 
     return updated_exercise
 
 
+@router.patch("/{exercise_id}", response_model=Exercise)
+async def patch_exercise(
+    req: Request,
+    exercise_id: str,
+    changes: ExercisePatch,
+) -> Exercise:
+    user = request.get_user_claims(req)
+    patched_exercise = await AsyncRestProcesses.patch(
+        Exercise, user, UUID(exercise_id), changes
+    )
+
+    return patched_exercise
+
+
 @router.delete("/{exercise_id}", response_model=Exercise)
 async def delete_exercise(
     req: Request,
     exercise_id: str,
 ) -> Exercise:
     user = request.get_user_claims(req)
-    deleted_exercise = RestProcesses.delete(Exercise, user, UUID(exercise_id))
+    deleted_exercise = await AsyncRestProcesses.delete(
+        Exercise, user, UUID(exercise_id)
+    )
 
     return deleted_exercise
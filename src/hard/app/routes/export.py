@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Query
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from hard.app.compression import GZIP_ENCODING, accepts_encoding
+from hard.app.export import EXPORT_MEDIA_TYPES, ExportFormat, export_chunks
+from hard.aws.interfaces.fastapi import request
+
+router = APIRouter(prefix="/export")
+
+
+@router.get("", response_class=StreamingResponse)
+def export_history(
+    req: Request,
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    user = request.get_user_claims(req)
+    compress = accepts_encoding(req.headers.get("accept-encoding", ""), GZIP_ENCODING)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="hard-export.{export_format.value}"'
+    }
+    if compress:
+        headers["Content-Encoding"] = GZIP_ENCODING
+        headers["Vary"] = "Accept-Encoding"
+
+    # The sync generator is iterated on a worker thread as the body is sent
+    return StreamingResponse(
+        export_chunks(user, export_format, compress=compress),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Query
+from starlette.requests import Request
+
+from hard.app.importer import ImportFormat, import_stream
+from hard.app.schemas import ImportSummary
+from hard.aws.interfaces.fastapi import request
+
+router = APIRouter(prefix="/import")
+
+
+@router.post("", response_model=ImportSummary)
+async def import_history(
+    req: Request,
+    import_format: ImportFormat = Query(default=ImportFormat.CSV, alias="format"),
+) -> ImportSummary:
+    user = request.get_user_claims(req)
+    # The raw body, read as it is parsed rather than collected up front
+    summary = await import_stream(user, req.stream(), import_format)
+
+    return summary
@@ -1,32 +1,52 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
-
-from hard.app.processes import RestProcesses, sets_from_ids
+from starlette.responses import Response
+
+from hard.app.batch import batch_delete, batch_post
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import AsyncRestProcesses, sets_from_ids
+from hard.app.responses import list_response
+from hard.app.schemas import BatchDeleteRequest, BatchResult, BatchWriteRequest
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
 from hard.models.set import Set
 
 router = APIRouter(prefix="/sets")
 
+SetPatch = Set.partial_model()
+
 
-@router.get("", response_model=list[Set])
+@router.get("", response_model=list[Set] | Page[Set])
 async def list_sets(
     req: Request,
     workout: Optional[UUID] = None,
     exercise: Optional[UUID] = None,
-) -> list[Set]:
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
 
     if workout or exercise:
-        return sets_from_ids(
-            user,
-            workout_id=workout,
-            exercise_id=exercise,
+        return list_response(
+            Set,
+            await run_in_db_executor(
+                sets_from_ids,
+                user,
+                workout_id=workout,
+                exercise_id=exercise,
+            ),
+        )
+
+    if limit or cursor:
+        return list_response(
+            Set,
+            await AsyncRestProcesses.get_page(Set, user, limit=limit, cursor=cursor),
         )
 
-    return RestProcesses.get_list(Set, user)
+    return list_response(Set, await AsyncRestProcesses.get_list(Set, user))
 
 
 @router.get("/{set_id}", response_model=Set)
@@ -35,7 +55,7 @@ async def get_set(
     set_id: str,
 ) -> Set:
     user = request.get_user_claims(req)
-    set = RestProcesses.get(Set, user, UUID(set_id))
+    set = await AsyncRestProcesses.get(Set, user, UUID(set_id))
 
     return set
 
@@ -46,7 +66,7 @@ async def create_set(
     set: Set,
 ) -> Set:
     user = request.get_user_claims(req)
-    created_set = RestProcesses.post(Set, user, set)
+    created_set = await AsyncRestProcesses.post(Set, user, set)
 
     return created_set
 
@@ -59,17 +79,53 @@ async def update_set(
 ) -> Set:
     user = request.get_user_claims(req)
     set.object_id = UUID(set_id)
-    updated_set = RestProcesses.put(Set, user, set)
+    updated_set = await AsyncRestProcesses.put(Set, user, set)
 
     return updated_set
 
 
+@router.patch("/{set_id}", response_model=Set)
+async def patch_set(
+    req: Request,
+    set_id: str,
+    changes: SetPatch,
+) -> Set:
+    user = request.get_user_claims(req)
+    patched_set = await AsyncRestProcesses.patch(Set, user, UUID(set_id), changes)
+
+    return patched_set
+
+
 @router.delete("/{set_id}", response_model=Set)
 async def delete_set(
     req: Request,
     set_id: str,
 ) -> Set:
     user = request.get_user_claims(req)
-    deleted_set = RestProcesses.delete(Set, user, UUID(set_id))
+    deleted_set = await AsyncRestProcesses.delete(Set, user, UUID(set_id))
 
     return deleted_set
+
+
+@router.post(":batch", response_model=BatchResult[Set])
+async def batch_create_sets(
+    req: Request,
+    batch: BatchWriteRequest[Set],
+    atomic: bool = False,
+) -> BatchResult[Set]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(batch_post, Set, user, batch.items, atomic)
+
+    return result
+
+
+@router.delete(":batch", response_model=BatchResult[Set])
+async def batch_delete_sets(
+    req: Request,
+    batch: BatchDeleteRequest,
+    atomic: bool = False,
+) -> BatchResult[Set]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(batch_delete, Set, user, batch.object_ids, atomic)
+
+    return result
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from starlette.requests import Request
+
+from hard.app.processes import stats_summary
+from hard.app.schemas import StatsSummary
+from hard.aws.interfaces.fastapi import request
+
+router = APIRouter(prefix="/stats")
+
+
+@router.get("/summary", response_model=StatsSummary)
+async def get_stats_summary(req: Request) -> StatsSummary:
+    user = request.get_user_claims(req)
+    summary = await stats_summary(user)
+
+    return summary
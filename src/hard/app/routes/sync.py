@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from starlette.requests import Request
+
+from hard.app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from hard.app.schemas import SyncChangeset
+from hard.app.sync import get_changes
+from hard.aws.dynamodb.async_handler import run_in_db_executor
+from hard.aws.interfaces.fastapi import request
+
+router = APIRouter(prefix="/sync")
+
+
+@router.get("", response_model=SyncChangeset)
+async def sync_changes(
+    req: Request,
+    since: Optional[datetime] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> SyncChangeset:
+    user = request.get_user_claims(req)
+    changeset = await run_in_db_executor(
+        get_changes, user, since=since, limit=limit, cursor=cursor
+    )
+
+    return changeset
@@ -1,21 +1,40 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
-
-from hard.app.processes import RestProcesses
+from starlette.responses import Response
+
+from hard.app.batch import batch_delete, batch_post
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import AsyncRestProcesses
+from hard.app.responses import list_response
+from hard.app.schemas import BatchDeleteRequest, BatchResult, BatchWriteRequest
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
 from hard.models.tag_join import TagJoin
 
 router = APIRouter(prefix="/tag-joins")
 
+TagJoinPatch = TagJoin.partial_model()
+
 
-@router.get("", response_model=list[TagJoin])
+@router.get("", response_model=list[TagJoin] | Page[TagJoin])
 async def list_tag_joins(
     req: Request,
-) -> list[TagJoin]:
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
-    return RestProcesses.get_list(TagJoin, user)
+    if limit or cursor:
+        return list_response(
+            TagJoin,
+            await AsyncRestProcesses.get_page(
+                TagJoin, user, limit=limit, cursor=cursor
+            ),
+        )
+
+    return list_response(TagJoin, await AsyncRestProcesses.get_list(TagJoin, user))
 
 
 @router.get("/{tag_join_id}", response_model=TagJoin)
@@ -24,7 +43,7 @@ async def get_tag_join(
     tag_join_id: str,
 ) -> TagJoin:
     user = request.get_user_claims(req)
-    tag_join = RestProcesses.get(TagJoin, user, UUID(tag_join_id))
+    tag_join = await AsyncRestProcesses.get(TagJoin, user, UUID(tag_join_id))
 
     return tag_join
 
@@ -35,7 +54,7 @@ async def create_tag_join(
     tag_join: TagJoin,
 ) -> TagJoin:
     user = request.get_user_claims(req)
-    created_tag_join = RestProcesses.post(TagJoin, user, tag_join)
+    created_tag_join = await AsyncRestProcesses.post(TagJoin, user, tag_join)
 
     return created_tag_join
 
@@ -48,17 +67,57 @@ async def update_tag_join(
 ) -> TagJoin:
     user = request.get_user_claims(req)
     tag_join.object_id = UUID(tag_join_id)
-    updated_tag_join = RestProcesses.put(TagJoin, user, tag_join)
+    updated_tag_join = await AsyncRestProcesses.put(TagJoin, user, tag_join)
 
     return updated_tag_join
 
 
+@router.patch("/{tag_join_id}", response_model=TagJoin)
+async def patch_tag_join(
+    req: Request,
+    tag_join_id: str,
+    changes: TagJoinPatch,
+) -> TagJoin:
+    user = request.get_user_claims(req)
+    patched_tag_join = await AsyncRestProcesses.patch(
+        TagJoin, user, UUID(tag_join_id), changes
+    )
+
+    return patched_tag_join
+
+
 @router.delete("/{tag_join_id}", response_model=TagJoin)
 async def delete_tag_join(
     req: Request,
     tag_join_id: str,
 ) -> TagJoin:
     user = request.get_user_claims(req)
-    deleted_tag_join = RestProcesses.delete(TagJoin, user, UUID(tag_join_id))
+    deleted_tag_join = await AsyncRestProcesses.delete(TagJoin, user, UUID(tag_join_id))
 
     return deleted_tag_join
+
+
+@router.post(":batch", response_model=BatchResult[TagJoin])
+async def batch_create_tag_joins(
+    req: Request,
+    batch: BatchWriteRequest[TagJoin],
+    atomic: bool = False,
+) -> BatchResult[TagJoin]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(batch_post, TagJoin, user, batch.items, atomic)
+
+    return result
+
+
+@router.delete(":batch", response_model=BatchResult[TagJoin])
+async def batch_delete_tag_joins(
+    req: Request,
+    batch: BatchDeleteRequest,
+    atomic: bool = False,
+) -> BatchResult[TagJoin]:
+    user = request.get_user_claims(req)
+    result = await run_in_db_executor(
+        batch_delete, TagJoin, user, batch.object_ids, atomic
+    )
+
+    return result
@@ -1,24 +1,44 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
+from starlette.responses import Response
 
-from hard.app.processes import RestProcesses, tags_from_target_id
+from hard.app.conditional import versioned_list_response
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import AsyncRestProcesses, tags_from_target_id
+from hard.app.responses import list_response
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
 from hard.models.tag import Tag
 
 router = APIRouter(prefix="/tags")
 
+TagPatch = Tag.partial_model()
 
-@router.get("", response_model=list[Tag])
-async def list_tags(req: Request, target: Optional[UUID] = None) -> list[Tag]:
+
+@router.get("", response_model=list[Tag] | Page[Tag])
+async def list_tags(
+    req: Request,
+    target: Optional[UUID] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
 
     if target:
-        return tags_from_target_id(user, target_id=target)
+        return list_response(
+            Tag, await run_in_db_executor(tags_from_target_id, user, target_id=target)
+        )
+
+    if limit or cursor:
+        return list_response(
+            Tag,
+            await AsyncRestProcesses.get_page(Tag, user, limit=limit, cursor=cursor),
+        )
 
-    return RestProcesses.get_list(Tag, user)
+    return await versioned_list_response(req, Tag, user)
 
 
 @router.get("/{tag_id}", response_model=Tag)
@@ -27,7 +47,7 @@ async def get_tag(
     tag_id: str,
 ) -> Tag:
     user = request.get_user_claims(req)
-    tag = RestProcesses.get(Tag, user, UUID(tag_id))
+    tag = await AsyncRestProcesses.get(Tag, user, UUID(tag_id))
 
     return tag
 
@@ -38,7 +58,7 @@ async def create_tag(
     tag: Tag,
 ) -> Tag:
     user = request.get_user_claims(req)
-    created_tag = RestProcesses.post(Tag, user, tag)
+    created_tag = await AsyncRestProcesses.post(Tag, user, tag)
 
     return created_tag
 
@@ -51,17 +71,29 @@ async def update_tag(
 ) -> Tag:
     user = request.get_user_claims(req)
     tag.object_id = UUID(tag_id)
-    updated_tag = RestProcesses.put(Tag, user, tag)
+    updated_tag = await AsyncRestProcesses.put(Tag, user, tag)
 
     return updated_tag
 
 
+@router.patch("/{tag_id}", response_model=Tag)
+async def patch_tag(
+    req: Request,
+    tag_id: str,
+    changes: TagPatch,
+) -> Tag:
+    user = request.get_user_claims(req)
+    patched_tag = await AsyncRestProcesses.patch(Tag, user, UUID(tag_id), changes)
+
+    return patched_tag
+
+
 @router.delete("/{tag_id}", response_model=Tag)
 async def delete_tag(
     req: Request,
     tag_id: str,
 ) -> Tag:
     user = request.get_user_claims(req)
-    deleted_tag = RestProcesses.delete(Tag, user, UUID(tag_id))
+    deleted_tag = await AsyncRestProcesses.delete(Tag, user, UUID(tag_id))
 
     return deleted_tag
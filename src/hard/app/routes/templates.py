@@ -1,22 +1,39 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
+from starlette.responses import Response
 
-from hard.app.processes import RestProcesses
+from hard.app.conditional import versioned_list_response
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import AsyncRestProcesses
+from hard.app.responses import list_response
 from hard.aws.interfaces.fastapi import request
 from hard.models.template import Template
 
 router = APIRouter(prefix="/templates")
 
+TemplatePatch = Template.partial_model()
 
-@router.get("", response_model=list[Template])
+
+@router.get("", response_model=list[Template] | Page[Template])
 async def list_templates(
     req: Request,
-) -> list[Template]:
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
 
-    return RestProcesses.get_list(Template, user)
+    if limit or cursor:
+        return list_response(
+            Template,
+            await AsyncRestProcesses.get_page(
+                Template, user, limit=limit, cursor=cursor
+            ),
+        )
+
+    return await versioned_list_response(req, Template, user)
 
 
 @router.get("/{template_id}", response_model=Template)
@@ -25,7 +42,7 @@ async def get_template(
     template_id: str,
 ) -> Template:
     user = request.get_user_claims(req)
-    template = RestProcesses.get(Template, user, UUID(template_id))
+    template = await AsyncRestProcesses.get(Template, user, UUID(template_id))
 
     return template
 
@@ -36,7 +53,7 @@ async def create_template(
     template: Template,
 ) -> Template:
     user = request.get_user_claims(req)
-    created_template = RestProcesses.post(Template, user, template)
+    created_template = await AsyncRestProcesses.post(Template, user, template)
 
     return created_template
 
@@ -49,17 +66,33 @@ async def update_template(
 ) -> Template:
     user = request.get_user_claims(req)
     template.object_id = UUID(template_id)
-    updated_template = RestProcesses.put(Template, user, template)
+    updated_template = await AsyncRestProcesses.put(Template, user, template)
 
     return updated_template
 
 
+@router.patch("/{template_id}", response_model=Template)
+async def patch_template(
+    req: Request,
+    template_id: str,
+    changes: TemplatePatch,
+) -> Template:
+    user = request.get_user_claims(req)
+    patched_template = await AsyncRestProcesses.patch(
+        Template, user, UUID(template_id), changes
+    )
+
+    return patched_template
+
+
 @router.delete("/{template_id}", response_model=Template)
 async def delete_template(
     req: Request,
     template_id: str,
 ) -> Template:
     user = request.get_user_claims(req)
-    deleted_template = RestProcesses.delete(Template, user, UUID(template_id))
+    deleted_template = await AsyncRestProcesses.delete(
+        Template, user, UUID(template_id)
+    )
 
     return deleted_template
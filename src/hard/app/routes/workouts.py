@@ -2,30 +2,62 @@ from datetime import date
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette.requests import Request
-
-from hard.app.processes import RestProcesses, workout_date_filter
-from hard.aws.dynamodb.handler import get_db_instance
+from starlette.responses import Response
+
+from hard.app.pagination import MAX_PAGE_SIZE, Page
+from hard.app.processes import (
+    AsyncRestProcesses,
+    delete_workout_cascade,
+    workout_date_filter,
+    workout_date_range_filter,
+    workout_detail,
+)
+from hard.app.responses import list_response
+from hard.app.schemas import WorkoutDetail
+from hard.aws.dynamodb.async_handler import run_in_db_executor
 from hard.aws.interfaces.fastapi import request
-from hard.models.exercise_join import ExerciseJoin
-from hard.models.set import Set
 from hard.models.workout import Workout
 
 router = APIRouter(prefix="/workouts")
 
+WorkoutPatch = Workout.partial_model()
+
 
-@router.get("", response_model=list[Workout])
+@router.get("", response_model=list[Workout] | Page[Workout])
 async def list_workouts(
     req: Request,
     date: Optional[date] = None,
-) -> list[Workout]:
+    from_date: Optional[date] = Query(default=None, alias="from"),
+    to_date: Optional[date] = Query(default=None, alias="to"),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
     user = request.get_user_claims(req)
 
     if date:
-        return workout_date_filter(user, date)
+        return list_response(
+            Workout, await run_in_db_executor(workout_date_filter, user, date)
+        )
+
+    if from_date or to_date:
+        return list_response(
+            Workout,
+            await run_in_db_executor(
+                workout_date_range_filter, user, from_date, to_date
+            ),
+        )
+
+    if limit or cursor:
+        return list_response(
+            Workout,
+            await AsyncRestProcesses.get_page(
+                Workout, user, limit=limit, cursor=cursor
+            ),
+        )
 
-    return RestProcesses.get_list(Workout, user)
+    return list_response(Workout, await AsyncRestProcesses.get_list(Workout, user))
 
 
 @router.get("/{workout_id}", response_model=Workout)
@@ -34,18 +66,29 @@ async def get_workout(
     workout_id: str,
 ) -> Workout:
     user = request.get_user_claims(req)
-    workout = RestProcesses.get(Workout, user, UUID(workout_id))
+    workout = await AsyncRestProcesses.get(Workout, user, UUID(workout_id))
 
     return workout
 
 
+@router.get("/{workout_id}/full", response_model=WorkoutDetail)
+async def get_workout_detail(
+    req: Request,
+    workout_id: str,
+) -> WorkoutDetail:
+    user = request.get_user_claims(req)
+    detail = await workout_detail(user, UUID(workout_id))
+
+    return detail
+
+
 @router.post("", response_model=Workout, status_code=201)
 async def create_workout(
     req: Request,
     workout: Workout,
 ) -> Workout:
     user = request.get_user_claims(req)
-    created_workout = RestProcesses.post(Workout, user, workout)
+    created_workout = await AsyncRestProcesses.post(Workout, user, workout)
 
     return created_workout
 
@@ -58,40 +101,33 @@ async def update_workout(
 ) -> Workout:
     user = request.get_user_claims(req)
     workout.object_id = UUID(workout_id)
-    updated_workout = RestProcesses.put(Workout, user, workout)
+    updated_workout = await AsyncRestProcesses.put(Workout, user, workout)
 
     return updated_workout
 
 
-@router.delete("/{workout_id}", response_model=Workout)
-async def delete_workout(
+@router.patch("/{workout_id}", response_model=Workout)
+async def patch_workout(
     req: Request,
     workout_id: str,
+    changes: WorkoutPatch,
 ) -> Workout:
     user = request.get_user_claims(req)
-    db = get_db_instance()
-
-    exercise_joins_to_delete = db.batch_get(
-        user,
-        target_object_cls=ExerciseJoin,
-        search_attr="workout_id",
-        matches_list=[workout_id],
+    patched_workout = await AsyncRestProcesses.patch(
+        Workout, user, UUID(workout_id), changes
     )
 
-    if exercise_joins_to_delete:
-        sets_to_delete = db.batch_get(
-            user,
-            target_object_cls=Set,
-            search_attr="exercise_join_id",
-            matches_list=[str(join.object_id) for join in exercise_joins_to_delete],
-        )
-
-        for set in sets_to_delete:
-            RestProcesses.delete(Set, user, set.object_id)
+    return patched_workout
 
-        for join in exercise_joins_to_delete:
-            RestProcesses.delete(ExerciseJoin, user, join.object_id)
 
-    deleted_workout = RestProcesses.delete(Workout, user, UUID(workout_id))
+@router.delete("/{workout_id}", response_model=Workout)
+async def delete_workout(
+    req: Request,
+    workout_id: str,
+) -> Workout:
+    user = request.get_user_claims(req)
+    deleted_workout = await run_in_db_executor(
+        delete_workout_cascade, user, UUID(workout_id)
+    )
 
     return deleted_workout
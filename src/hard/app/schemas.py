@@ -0,0 +1,158 @@
+from datetime import date
+from typing import Any, Generic, Optional, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.tag import Tag
+from hard.models.workout import Workout
+
+MAX_BATCH_ITEMS = 1000
+
+ITEM_TYPE = TypeVar("ITEM_TYPE")
+
+
+class WorkoutExerciseDetail(BaseModel):
+    """An exercise as performed in a workout: the join, its sets and tags"""
+
+    exercise_join: ExerciseJoin
+    # `None` if the exercise has since been deleted
+    exercise: Optional[Exercise] = Field(default=None)
+    sets: list[Set]
+    tags: list[Tag]
+
+
+class WorkoutDetail(BaseModel):
+    """A workout with everything needed to render it"""
+
+    workout: Workout
+    tags: list[Tag]
+    exercises: list[WorkoutExerciseDetail]
+
+
+class BatchWriteRequest(BaseModel, Generic[ITEM_TYPE]):
+    """Items to create, or update where an `object_id` already exists"""
+
+    items: list[ITEM_TYPE] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchDeleteRequest(BaseModel):
+    object_ids: list[UUID] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchItemResult(BaseModel, Generic[ITEM_TYPE]):
+    """
+    Outcome for one entry of a batch, at the same `index` as the request
+
+    `status` is the HTTP status the equivalent single-item call would return
+    """
+
+    index: int
+    status: int
+    object_id: Optional[UUID] = Field(default=None)
+    item: Optional[ITEM_TYPE] = Field(default=None)
+    detail: Optional[str] = Field(default=None)
+
+
+class BatchResult(BaseModel, Generic[ITEM_TYPE]):
+    results: list[BatchItemResult[ITEM_TYPE]]
+
+
+class SyncChange(BaseModel):
+    """
+    One changed object: its current state, or a tombstone if `deleted`
+
+    `item` is the serialized object, as the object's own routes return it
+    """
+
+    object_type: ObjectType
+    object_id: UUID
+    modified_at: str
+    deleted: bool = False
+    item: Optional[dict[str, Any]] = Field(default=None)
+
+
+class SyncChangeset(BaseModel):
+    """
+    A page of changes, oldest first
+
+    Once `next_cursor` is `None`, `watermark` is the `since` for the next sync
+    """
+
+    changes: list[SyncChange]
+    watermark: str
+    next_cursor: Optional[str] = Field(default=None)
+
+
+class RepRecord(BaseModel):
+    """The heaviest working set at a number of reps, and when it was first lifted"""
+
+    reps: int
+    weight: float
+    performed_on: date
+
+
+class WeeklyVolume(BaseModel):
+    """Working sets and tonnage in the week starting on `week_start` (a Monday)"""
+
+    week_start: date
+    set_count: int
+    volume: float
+
+
+class ExerciseTotals(BaseModel):
+    """
+    Lifetime figures for one exercise, over its working sets
+
+    Weights are in kilograms, whatever unit the sets were logged in
+    """
+
+    exercise_id: UUID
+    # `None` if the exercise has since been deleted
+    name: Optional[str] = Field(default=None)
+    set_count: int
+    total_volume: float
+    best_e1rm: Optional[float] = Field(default=None)
+    last_performed: Optional[date] = Field(default=None)
+
+
+class ExerciseStats(ExerciseTotals):
+    rep_records: list[RepRecord]
+    weekly_volume: list[WeeklyVolume]
+
+
+class StatsSummary(BaseModel):
+    """Totals across every exercise, with the most recently performed first"""
+
+    set_count: int
+    total_volume: float
+    weekly_volume: list[WeeklyVolume]
+    exercises: list[ExerciseTotals]
+
+
+class ImportRowError(BaseModel):
+    """Why a row of an import was skipped, `row` counting from 1 after any header"""
+
+    row: int
+    detail: str
+
+
+class ImportSummary(BaseModel):
+    """
+    Outcome of an import: how many rows were read, and what they created
+
+    Rows with errors are skipped and the rest imported. Only the first
+    errors are listed, `error_count` is the total
+    """
+
+    rows: int
+    workouts: int
+    exercises: int
+    exercise_joins: int
+    sets: int
+    error_count: int
+    errors: list[ImportRowError]
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from hard.app.errors import InvalidCursorError, WatermarkExpiredError
+from hard.app.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from hard.app.schemas import SyncChange, SyncChangeset
+from hard.aws.dynamodb.base_object import format_modified_at
+from hard.aws.dynamodb.consts import (
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DELIMITER,
+    PARTITION_TEMPLATE,
+    SYNC_INDEX_NAME,
+    SYNC_INDEX_PARTITION,
+    SYNC_INDEX_SORT_KEY,
+    TOMBSTONE_PARTITION_TEMPLATE,
+    TOMBSTONE_RETENTION_DAYS,
+)
+from hard.aws.dynamodb.handler import (
+    Attr,
+    Key,
+    get_db_instance,
+    sync_index_enabled,
+)
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.aws.models.user import User
+from hard.models.registry import OBJECT_CLASSES
+
+# Index reads are eventually consistent, so the feed stops this far short of
+# "now": anything written since is left for the next sync rather than missed
+WATERMARK_LAG = timedelta(seconds=5)
+
+# Cursors are bound to this (per-user) name rather than a table partition
+SYNC_CURSOR_TEMPLATE = "{user_id}" + DELIMITER + "Sync"
+
+
+def get_changes(
+    user: User,
+    since: Optional[datetime] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> SyncChangeset:
+    """
+    Everything the user created, updated or deleted after `since`
+
+    Reads the `ModifiedSearch` index one page at a time, so the cost
+    scales with the number of changes. Without `since`, every stored
+    object is returned, and no deletions, as the client has nothing to
+    delete (those older than the tombstone retention period cannot be
+    returned at all, so older watermarks are rejected)
+
+    The upper bound is fixed by the first page and carried in the cursor,
+    so every page of one sync reads the same range
+    """
+    now = datetime.now(timezone.utc)
+    binding = SYNC_CURSOR_TEMPLATE.format(**{"user_id": user.id})
+    start_key, upper = _decode_sync_cursor(cursor, binding)
+    if upper is None:
+        upper = format_modified_at(now - WATERMARK_LAG)
+
+    # Key and filter conditions are built alike, only the class differs
+    indexed = sync_index_enabled()
+    modified_at = (Key if indexed else Attr)(SYNC_INDEX_SORT_KEY)
+
+    if since is not None:
+        lower = format_modified_at(since)
+        if lower < format_modified_at(now - timedelta(days=TOMBSTONE_RETENTION_DAYS)):
+            raise WatermarkExpiredError(
+                f"Watermark Expired: Deletions are only kept for {TOMBSTONE_RETENTION_DAYS} days, a full sync is required"
+            )
+        if lower >= upper:
+            return SyncChangeset(changes=[], watermark=lower)
+        modified_condition = modified_at.between(lower, upper)
+    else:
+        lower = None
+        modified_condition = modified_at.lte(upper)
+
+    if indexed:
+        items, last_key = get_db_instance().query_page(
+            secondary_index_name=SYNC_INDEX_NAME,
+            key_expression=Key(SYNC_INDEX_PARTITION).eq(user.id) & modified_condition,
+            limit=limit,
+            exclusive_start_key=start_key,
+        )
+    else:
+        items, last_key = _page_from_partitions(
+            user, modified_condition, limit, start_key
+        )
+
+    # `between` is inclusive, but changes at exactly `since` were already sent
+    changes = [
+        _to_change(item)
+        for item in items
+        if item[SYNC_INDEX_SORT_KEY] != lower
+        and not (since is None and _is_tombstone(item))
+    ]
+
+    return SyncChangeset(
+        changes=changes,
+        watermark=items[-1][SYNC_INDEX_SORT_KEY] if last_key else upper,
+        next_cursor=encode_cursor(
+            {"k": last_key, "u": upper} if last_key else None, binding
+        ),
+    )
+
+
+def _decode_sync_cursor(
+    cursor: Optional[str], binding: str
+) -> tuple[Optional[dict[str]], Optional[str]]:
+    """The `ExclusiveStartKey` and upper bound carried by a sync cursor"""
+    state = decode_cursor(cursor, binding)
+    if state is None:
+        return None, None
+
+    if not isinstance(state, dict) or not {"k", "u"} <= state.keys():
+        raise InvalidCursorError("Invalid Cursor: Cursor does not belong to this list")
+
+    return state["k"], state["u"]
+
+
+def _change_order(item: dict[str]) -> tuple[str, str, str]:
+    return (item[SYNC_INDEX_SORT_KEY], item[DB_PARTITION], item[DB_SORT_KEY])
+
+
+def _page_from_partitions(
+    user: User,
+    modified_condition,
+    limit: int,
+    start_key: Optional[dict[str]],
+) -> tuple[list[dict[str]], Optional[dict[str]]]:
+    """
+    A page of the feed without `ModifiedSearch`: every one of the user's
+    partitions (tombstones included) is read, filtered on `modified_at`,
+    and the matching items are ordered as the index would order them
+
+    Each page re-reads every change in range, so this is only a stand-in
+    until the index is available. Returns a `LastEvaluatedKey` shaped like
+    the index's, so cursors carry over
+    """
+    db = get_db_instance()
+
+    partitions = [
+        PARTITION_TEMPLATE.format(
+            **{"user_id": user.id, "object_type": object_type.value}
+        )
+        for object_type in OBJECT_CLASSES
+        if object_type is not ObjectType.BASE_OBJECT
+    ]
+    partitions.append(TOMBSTONE_PARTITION_TEMPLATE.format(**{"user_id": user.id}))
+
+    items = sorted(
+        (
+            item
+            for partition in partitions
+            for item in db.query_iter(
+                key_expression=Key(DB_PARTITION).eq(partition),
+                filter_expression=modified_condition,
+            )
+        ),
+        key=_change_order,
+    )
+
+    if start_key is not None:
+        start = _change_order(start_key)
+        items = [item for item in items if _change_order(item) > start]
+
+    if len(items) <= limit:
+        return items, None
+
+    page = items[:limit]
+    last_key = {
+        attr: page[-1][attr]
+        for attr in (
+            SYNC_INDEX_PARTITION,
+            SYNC_INDEX_SORT_KEY,
+            DB_PARTITION,
+            DB_SORT_KEY,
+        )
+    }
+    return page, last_key
+
+
+def _is_tombstone(item: dict[str]) -> bool:
+    return item[DB_PARTITION] == TOMBSTONE_PARTITION_TEMPLATE.format(
+        **{"user_id": item[SYNC_INDEX_PARTITION]}
+    )
+
+
+def _to_change(item: dict[str]) -> SyncChange:
+    if _is_tombstone(item):
+        return SyncChange(
+            object_type=item["deleted_type"],
+            object_id=item["deleted_id"],
+            modified_at=item[SYNC_INDEX_SORT_KEY],
+            deleted=True,
+        )
+
+    object_type = ObjectType(item[DB_PARTITION].split(DELIMITER)[-1])
+    data_object = OBJECT_CLASSES[object_type].from_db(item)
+
+    return SyncChange(
+        object_type=object_type,
+        object_id=data_object.object_id,
+        modified_at=item[SYNC_INDEX_SORT_KEY],
+        item=data_object.model_dump(mode="json"),
+    )
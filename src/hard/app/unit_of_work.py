@@ -0,0 +1,106 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional, Type
+from uuid import UUID
+
+from hard.app.metrics import record_cache_lookup
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE, BaseObject
+from hard.aws.dynamodb.consts import DB_PARTITION
+from hard.aws.dynamodb.object_type import ObjectType
+
+_current_unit_of_work: ContextVar[Optional["UnitOfWork"]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+class UnitOfWork:
+    """
+    Request-scoped identity map for objects read through `RestProcesses`
+
+    Objects are cached by `object_type` and `object_id`, and full partition
+    listings by partition key, so a write invalidates the written object
+    and the listing of its partition with two lookups. Hits and misses
+    are counted in the request's metrics (see `metrics.RequestMetrics`)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: dict[tuple[ObjectType, str], BaseObject] = {}
+        self._partitions: dict[str, list[BaseObject]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_object(
+        self, object_cls: Type[DB_OBJECT_TYPE], object_id: UUID | str
+    ) -> Optional[DB_OBJECT_TYPE]:
+        with self._lock:
+            cached = self._objects.get(
+                (ObjectType.from_object_class(object_cls), str(object_id))
+            )
+            self._count(cached is not None)
+            return cached
+
+    def add_object(self, data_object: BaseObject) -> None:
+        with self._lock:
+            self._objects[_object_key(data_object)] = data_object
+
+    def get_partition(
+        self, object_cls: Type[DB_OBJECT_TYPE], partition: str
+    ) -> Optional[list[DB_OBJECT_TYPE]]:
+        with self._lock:
+            cached = self._partitions.get(partition)
+            self._count(cached is not None)
+            return list(cached) if cached is not None else None
+
+    def add_partition(
+        self,
+        object_cls: Type[DB_OBJECT_TYPE],
+        partition: str,
+        data_objects: list[DB_OBJECT_TYPE],
+    ) -> None:
+        with self._lock:
+            self._partitions[partition] = list(data_objects)
+            for data_object in data_objects:
+                self._objects[_object_key(data_object)] = data_object
+
+    def invalidate(self, data_object: BaseObject) -> None:
+        partition = data_object.primary_key()[DB_PARTITION]
+
+        with self._lock:
+            self._objects.pop(_object_key(data_object), None)
+            self._partitions.pop(partition, None)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        record_cache_lookup(hit)
+
+
+def _object_key(data_object: BaseObject) -> tuple[ObjectType, str]:
+    return (data_object.object_type, str(data_object.object_id))
+
+
+def get_unit_of_work() -> Optional[UnitOfWork]:
+    return _current_unit_of_work.get()
+
+
+@contextmanager
+def unit_of_work_scope() -> Iterator[UnitOfWork]:
+    unit_of_work = UnitOfWork()
+    token = _current_unit_of_work.set(unit_of_work)
+    try:
+        yield unit_of_work
+    finally:
+        _current_unit_of_work.reset(token)
+
+
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """FastAPI dependency that opens a `UnitOfWork` for the request"""
+    with unit_of_work_scope() as current:
+        yield current
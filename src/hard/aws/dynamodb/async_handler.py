@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from hard.aws.dynamodb.consts import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    EXECUTOR_MAX_WORKERS_ENV_VAR,
+    MAX_POOL_CONNECTIONS_ENV_VAR,
+)
+
+_RESULT = TypeVar("_RESULT")
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = int(
+                    os.getenv(
+                        EXECUTOR_MAX_WORKERS_ENV_VAR,
+                        os.getenv(
+                            MAX_POOL_CONNECTIONS_ENV_VAR, DEFAULT_MAX_POOL_CONNECTIONS
+                        ),
+                    )
+                )
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="dynamodb-io"
+                )
+
+    return _executor
+
+
+async def run_in_db_executor(
+    func: Callable[..., _RESULT], /, *args: Any, **kwargs: Any
+) -> _RESULT:
+    """
+    Awaits a blocking DynamoDB call on a bounded thread pool
+
+    The pool defaults to one worker per pooled connection, and can be
+    sized with `DYNAMO_EXECUTOR_MAX_WORKERS`. Context variables are
+    copied into the worker thread
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(_get_executor(), call)
+
+
+def reset_db_executor() -> None:
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
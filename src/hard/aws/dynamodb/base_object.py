@@ -1,17 +1,80 @@
-from datetime import datetime
-from typing import Optional, TypeVar
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from functools import cache
+from operator import attrgetter
+from types import NoneType, UnionType
+from typing import (
+    Callable,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
 from uuid import UUID, uuid4
 
-from dateutil import parser as date_parser
-from pydantic import BaseModel, Field, field_serializer, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
 
-from hard.aws.dynamodb.consts import DB_PARTITION, DB_SORT_KEY, DELIMITER
+from hard.aws.dynamodb.consts import (
+    CHILD_KEY_TEMPLATE,
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DELIMITER,
+    PARENT_INDEX_SORT_KEY,
+    PARENT_INDEXES,
+    PARENT_KEY_TEMPLATE,
+    PARTITION_TEMPLATE,
+    SYNC_INDEX_PARTITION,
+    SYNC_INDEX_SORT_KEY,
+)
 from hard.aws.dynamodb.object_type import ObjectType
 from hard.aws.models.user import User
 
 CORE_ATTRIBUTES = ["user_id", "timestamp", "object_type", "object_id"]
 
 
+def format_modified_at(moment: Optional[datetime] = None) -> str:
+    """
+    `modified_at` value for `moment` (default: now), in UTC with a fixed
+    width so values sort chronologically as strings. Naive values are UTC.
+    The `Z` suffix (rather than `+00:00`) keeps values URL-safe as watermarks
+    """
+    if moment is None:
+        moment = datetime.now(timezone.utc)
+    elif moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (
+        moment.astimezone(timezone.utc)
+        .isoformat(timespec="microseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def unique_timestamps() -> Iterator[datetime]:
+    """
+    Creation timestamps that never repeat, keeping sort keys unique however
+    quickly objects are created (and in the order they were taken)
+    """
+    latest = datetime.min
+    while True:
+        now = datetime.now()
+        latest = now if now > latest else latest + timedelta(microseconds=1)
+        yield latest
+
+
+def sync_attributes(user_id: str) -> dict[str, str]:
+    """Attributes placing an item in its owner's change feed, as of now"""
+    return {
+        SYNC_INDEX_PARTITION: user_id,
+        SYNC_INDEX_SORT_KEY: format_modified_at(),
+    }
+
+
 class BaseObject(BaseModel):
     """Base object for all items stored in DynamoDB"""
 
@@ -20,65 +83,96 @@ class BaseObject(BaseModel):
     object_type: Optional[ObjectType] = Field(default=None)
     object_id: Optional[UUID] = Field(default=None)
 
-    # `created` handling
-    @field_validator("timestamp", mode="before")
-    @classmethod
-    def parse_iso_format(cls, iso_date: str | None) -> datetime | None:
-        if iso_date is None:
-            return None
-        return date_parser.isoparse(iso_date)
-
-    @field_serializer("timestamp")
-    def convert_to_iso(self, timestamp: datetime):
-        return timestamp.isoformat()
-
-    # `object_type` handling
-    @field_validator("object_type")
-    @classmethod
-    def get_enum(cls, object_type: str | None):
-        if object_type != None:
-            return ObjectType(object_type)
-        else:
-            return None
+    # Attributes holding the `object_id`s of this object's parents,
+    # in the order of the adjacency indexes (`PARENT_INDEXES`)
+    PARENT_ATTRIBUTES: ClassVar[tuple[str, ...]] = ()
 
-    @field_serializer("object_type")
-    def get_value(self, object_type: ObjectType | None):
-        if object_type == None:
-            return None
-        return object_type.value
-
-    # `object_id` handling
-    @field_serializer("object_id")
-    def to_str(self, object_id: UUID):
-        return str(object_id)
-
-    def to_db(self):
-        as_dict = self.model_dump()
+    def to_db(self) -> dict[str]:
+        as_dict = self.db_values()
         partition_key = (
             f'{as_dict.pop("user_id")}{DELIMITER}{as_dict.pop("object_type")}'
         )
         as_dict[DB_PARTITION] = partition_key
         as_dict[DB_SORT_KEY] = as_dict.pop("timestamp")
+        as_dict.update(sync_attributes(self.user_id))
+
+        if self.PARENT_ATTRIBUTES:
+            as_dict.update(self.parent_index_keys(self.user_id, as_dict))
+            as_dict[PARENT_INDEX_SORT_KEY] = CHILD_KEY_TEMPLATE.format(
+                **{
+                    "object_type": self.object_type.value,
+                    "timestamp": as_dict[DB_SORT_KEY],
+                }
+            )
 
         return as_dict
 
+    def db_values(self, include: Optional[set[str]] = None) -> dict[str]:
+        """
+        Attributes as stored in DynamoDB, optionally only those in `include`
+
+        Only the fields that need it are converted, from a plan built
+        once per class (see `_db_converters`)
+        """
+        # Fields are all flat values, so the instance dict stands in for a dump
+        if include is None:
+            values = dict(self.__dict__)
+        else:
+            values = {name: self.__dict__[name] for name in include}
+
+        for name, convert in _db_converters(type(self)):
+            value = values.get(name)
+            if value is not None:
+                values[name] = convert(value)
+        return values
+
     @classmethod
-    def from_db(cls, object: dict[str, str]):
-        try:
-            user_id, object_type = object.pop(DB_PARTITION).split(DELIMITER)
-        except ValueError:
-            raise ValueError(
-                f"Invalid Partition: Object partition ({DB_PARTITION}) did not contain delimiter: {DELIMITER}"
+    def parent_index_keys(cls, user_id: str, values: dict[str]) -> dict[str, str]:
+        """
+        Adjacency index partition keys for whichever parent attributes
+        appear in `values` (serialized attributes, as written to the db)
+        """
+        return {
+            index_partition: PARENT_KEY_TEMPLATE.format(
+                **{"user_id": user_id, "parent_id": values[parent_attr]}
             )
-        except KeyError:
-            raise KeyError(
-                f"Missing Partition: Object did not contain partition key ({DB_PARTITION})"
+            for parent_attr, index_partition in zip(
+                cls.PARENT_ATTRIBUTES, PARENT_INDEXES.values()
             )
+            if values.get(parent_attr) is not None
+        }
 
-        object.update({"user_id": user_id, "object_type": object_type})
-        object.update({"timestamp": object.pop(DB_SORT_KEY)})
+    def primary_key(self) -> dict[str, str]:
+        return {
+            DB_PARTITION: PARTITION_TEMPLATE.format(
+                **{
+                    "user_id": self.user_id,
+                    "object_type": self.object_type.value,
+                }
+            ),
+            DB_SORT_KEY: self.timestamp.isoformat(),
+        }
+
+    @classmethod
+    def partial_model(cls) -> Type[BaseModel]:
+        """
+        Model for sparse (PATCH) bodies: every non-core field is optional
 
-        return cls.model_validate(object)
+        `timestamp` may be included to locate the stored item directly,
+        it cannot be changed
+        """
+        return _build_partial_model(cls)
+
+    @classmethod
+    def from_db(cls, object: dict[str]):
+        return cls.model_validate(_from_db_values(object))
+
+    @classmethod
+    def from_db_list(cls, objects: Iterable[dict[str]]) -> list:
+        """`from_db` for many items, validated in one call by a cached `TypeAdapter`"""
+        return _list_adapter(cls).validate_python(
+            [_from_db_values(object) for object in objects]
+        )
 
     def from_request(self, user: User, object_type: ObjectType):
         self.set_owner(user)
@@ -88,7 +182,8 @@ class BaseObject(BaseModel):
     def init_from_request(self, user: User, object_type: ObjectType):
         self.set_owner(user)
         self.set_object_type(object_type)
-        self.generate_id()
+        if self.object_id is None:
+            self.generate_id()
         self.timestamp = datetime.now()
         return
 
@@ -112,4 +207,76 @@ class BaseObject(BaseModel):
         self.object_type = object_type
 
 
+def _from_db_values(object: dict[str]) -> dict[str]:
+    """Maps a stored item's key attributes back to model fields (without mutating it)"""
+    try:
+        user_id, object_type = object[DB_PARTITION].split(DELIMITER)
+    except ValueError:
+        raise ValueError(
+            f"Invalid Partition: Object partition ({DB_PARTITION}) did not contain delimiter: {DELIMITER}"
+        )
+    except KeyError:
+        raise KeyError(
+            f"Missing Partition: Object did not contain partition key ({DB_PARTITION})"
+        )
+
+    return {
+        **object,
+        "user_id": user_id,
+        "object_type": object_type,
+        "timestamp": object[DB_SORT_KEY],
+    }
+
+
+def _to_decimal(value: float) -> Decimal:
+    # Via `str`, so `0.1` is stored as 0.1 rather than its binary expansion
+    return Decimal(str(value))
+
+
+@cache
+def _db_converters(
+    object_cls: Type[BaseObject],
+) -> tuple[tuple[str, Callable[[object], object]], ...]:
+    """
+    `(field, converter)` pairs for the fields boto3 cannot store as dumped:
+    enums become their values, UUIDs and dates strings, floats `Decimal`s
+    """
+    converters = []
+    for name, field in object_cls.model_fields.items():
+        annotation = field.annotation
+        if get_origin(annotation) in (Union, UnionType):
+            (annotation,) = [arg for arg in get_args(annotation) if arg is not NoneType]
+
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            converters.append((name, attrgetter("value")))
+        elif annotation is UUID:
+            converters.append((name, str))
+        elif annotation in (date, datetime):
+            converters.append((name, annotation.isoformat))
+        elif annotation is float:
+            converters.append((name, _to_decimal))
+    return tuple(converters)
+
+
+@cache
+def _list_adapter(object_cls: Type[BaseObject]) -> TypeAdapter:
+    return TypeAdapter(list[object_cls])
+
+
+@cache
+def _build_partial_model(object_cls: Type[BaseObject]) -> Type[BaseModel]:
+    fields = {
+        name: (Optional[field.annotation], Field(default=None))
+        for name, field in object_cls.model_fields.items()
+        if name not in CORE_ATTRIBUTES
+    }
+    fields["timestamp"] = (Optional[datetime], Field(default=None))
+
+    return create_model(
+        f"{object_cls.__name__}Patch",
+        __config__=ConfigDict(extra="forbid"),
+        **fields,
+    )
+
+
 DB_OBJECT_TYPE = TypeVar("DB_OBJECT_TYPE", bound=BaseObject)
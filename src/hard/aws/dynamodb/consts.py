@@ -5,7 +5,71 @@ DELIMITER = "#"
 ITEM_INDEX_NAME = "ItemSearch"
 ITEM_INDEX_PARTITION = "object_id"
 
+# Sparse index: only items carrying `workout_date` (i.e. Workouts) appear in it.
+# Workouts have always stored `workout_date` as an ISO string, so existing items
+# are backfilled by DynamoDB when the index is created
+WORKOUT_DATE_INDEX_NAME = "WorkoutDateSearch"
+WORKOUT_DATE_INDEX_SORT_KEY = "workout_date"
+# Until set, workouts are found by filtering their partition on `workout_date`
+# instead, as the index may not exist yet (or still be building)
+WORKOUT_DATE_INDEX_ENV_VAR = "WORKOUT_DATE_INDEX_ENABLED"
+
+# Adjacency indexes: child items (joins, sets) carry "{user_id}#{parent_id}"
+# keys for up to two parents, with "{object_type}#{timestamp}" as the sort key,
+# so "children of X" is a key lookup rather than a filtered partition scan
+PARENT_INDEX_NAME = "ParentSearch"
+PARENT_INDEX_PARTITION = "parent_key"
+ALT_PARENT_INDEX_NAME = "AltParentSearch"
+ALT_PARENT_INDEX_PARTITION = "alt_parent_key"
+PARENT_INDEX_SORT_KEY = "child_key"
+# Index name -> partition attribute, in the order parents are declared on models
+PARENT_INDEXES = {
+    PARENT_INDEX_NAME: PARENT_INDEX_PARTITION,
+    ALT_PARENT_INDEX_NAME: ALT_PARENT_INDEX_PARTITION,
+}
+# Until set, children are found by filtering their partition instead, as
+# items written before the indexes existed are only in them once backfilled
+ADJACENCY_INDEXES_ENV_VAR = "ADJACENCY_INDEXES_ENABLED"
+
+# Change feed: every object carries its owner and when it was last written,
+# and deletes leave a tombstone that expires after the retention period
+SYNC_INDEX_NAME = "ModifiedSearch"
+SYNC_INDEX_PARTITION = "sync_key"
+SYNC_INDEX_SORT_KEY = "modified_at"
+# Until set, the feed is read from each of the user's partitions instead,
+# as the index may not exist yet (or still be building)
+SYNC_INDEX_ENV_VAR = "SYNC_INDEX_ENABLED"
+TOMBSTONE_TTL_ATTRIBUTE = "expires_at"
+TOMBSTONE_RETENTION_DAYS = 30
+
 PARTITION_TEMPLATE = "{user_id}" + DELIMITER + "{object_type}"
+TOMBSTONE_PARTITION_TEMPLATE = "{user_id}" + DELIMITER + "Tombstone"
+PARENT_KEY_TEMPLATE = "{user_id}" + DELIMITER + "{parent_id}"
+CHILD_KEY_TEMPLATE = "{object_type}" + DELIMITER + "{timestamp}"
+
+# Per-user counters, bumped on writes so caches can detect changes cheaply
+VERSION_PARTITION_TEMPLATE = "{user_id}" + DELIMITER + "PartitionVersion"
+VERSION_ATTRIBUTE = "version"
+
+# Per-user running totals of each exercise's working sets, keyed by exercise id
+AGGREGATE_PARTITION_TEMPLATE = "{user_id}" + DELIMITER + "ExerciseAggregate"
+
+TABLE_NAME_ENV_VAR = "DYNAMO_TABLE_NAME"
+MAX_POOL_CONNECTIONS_ENV_VAR = "DYNAMO_MAX_POOL_CONNECTIONS"
+MAX_RETRY_ATTEMPTS_ENV_VAR = "DYNAMO_MAX_RETRY_ATTEMPTS"
+RETRY_MODE_ENV_VAR = "DYNAMO_RETRY_MODE"
+EXECUTOR_MAX_WORKERS_ENV_VAR = "DYNAMO_EXECUTOR_MAX_WORKERS"
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_MAX_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_MODE = "standard"
+
+BATCH_WRITE_CHUNK_SIZE = 25
+BATCH_MAX_ATTEMPTS = 6
+BATCH_RETRY_BASE_DELAY = 0.05
+TRANSACT_WRITE_MAX_ITEMS = 100
+# Operands an `IN` condition may list
+FILTER_IN_MAX_OPERANDS = 100
 
 
 class ItemNotFoundError(Exception):
@@ -22,3 +86,17 @@ class ItemAccessUnauthorizedError(Exception):
 
 class InvalidAttributeChangeError(Exception):
     pass
+
+
+class UnprocessedItemsError(Exception):
+    pass
+
+
+class ConditionalCheckFailedError(Exception):
+    pass
+
+
+class TransactionCanceledError(Exception):
+    def __init__(self, message: str, reasons: list[str | None]) -> None:
+        super().__init__(message)
+        self.reasons = reasons
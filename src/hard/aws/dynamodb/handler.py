@@ -1,20 +1,235 @@
+import contextvars
 import os
-from typing import Optional, Type
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator, Optional, Type, TypeVar
 from uuid import UUID
 
 import boto3
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Attr, ConditionExpressionBuilder, Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE
-from hard.aws.dynamodb.consts import DB_PARTITION, DB_SORT_KEY, PARTITION_TEMPLATE
+from hard.aws.dynamodb.base_object import DB_OBJECT_TYPE, sync_attributes
+from hard.aws.dynamodb.consts import (
+    ADJACENCY_INDEXES_ENV_VAR,
+    BATCH_MAX_ATTEMPTS,
+    BATCH_RETRY_BASE_DELAY,
+    BATCH_WRITE_CHUNK_SIZE,
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    DEFAULT_MAX_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_MODE,
+    DELIMITER,
+    FILTER_IN_MAX_OPERANDS,
+    ITEM_INDEX_NAME,
+    ITEM_INDEX_PARTITION,
+    MAX_POOL_CONNECTIONS_ENV_VAR,
+    MAX_RETRY_ATTEMPTS_ENV_VAR,
+    PARENT_INDEX_NAME,
+    PARENT_INDEX_SORT_KEY,
+    PARENT_INDEXES,
+    PARENT_KEY_TEMPLATE,
+    PARTITION_TEMPLATE,
+    RETRY_MODE_ENV_VAR,
+    SYNC_INDEX_ENV_VAR,
+    TABLE_NAME_ENV_VAR,
+    TOMBSTONE_PARTITION_TEMPLATE,
+    TOMBSTONE_RETENTION_DAYS,
+    TOMBSTONE_TTL_ATTRIBUTE,
+    TRANSACT_WRITE_MAX_ITEMS,
+    WORKOUT_DATE_INDEX_ENV_VAR,
+    ConditionalCheckFailedError,
+    TransactionCanceledError,
+    UnprocessedItemsError,
+)
+from hard.aws.dynamodb.metrics import register_metrics_hooks
 from hard.aws.dynamodb.object_type import ObjectType
 from hard.aws.models.user import User
 
+_IN = TypeVar("_IN")
+_OUT = TypeVar("_OUT")
+
+
+def chunked(items: list[_IN], size: int) -> list[list[_IN]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _condition_kwargs(condition) -> dict[str]:
+    """
+    Renders a condition for the low-level client, which (unlike `Table`)
+    does not accept condition objects inside `TransactItems`
+    """
+    if condition is None:
+        return {}
+
+    expression = ConditionExpressionBuilder().build_expression(condition)
+    kwargs = {
+        "ConditionExpression": expression.condition_expression,
+        "ExpressionAttributeNames": expression.attribute_name_placeholders,
+    }
+    if expression.attribute_value_placeholders:
+        kwargs.update(
+            {"ExpressionAttributeValues": expression.attribute_value_placeholders}
+        )
+    return kwargs
+
+
+def tombstone(data_object: DB_OBJECT_TYPE) -> dict[str]:
+    """
+    Item recording that `data_object` was deleted, for the change feed
+
+    Keyed by the deleted `object_id`, and expired by DynamoDB's TTL
+    once clients have had `TOMBSTONE_RETENTION_DAYS` to sync it
+    """
+    expires_at = datetime.now(timezone.utc) + timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    return {
+        DB_PARTITION: TOMBSTONE_PARTITION_TEMPLATE.format(
+            **{"user_id": data_object.user_id}
+        ),
+        DB_SORT_KEY: str(data_object.object_id),
+        "deleted_type": data_object.object_type.value,
+        "deleted_id": str(data_object.object_id),
+        TOMBSTONE_TTL_ATTRIBUTE: int(expires_at.timestamp()),
+        **sync_attributes(data_object.user_id),
+    }
+
+
+def _primary_key(item: dict[str]) -> tuple[str, str]:
+    return (item[DB_PARTITION], item[DB_SORT_KEY])
+
 
 class DynamoDB:
-    def __init__(self, table_name: str) -> None:
-        self._client = boto3.resource("dynamodb")
+    def __init__(self, table_name: str, resource=None) -> None:
+        self._client = resource if resource is not None else boto3.resource("dynamodb")
         self._table = self._client.Table(table_name)
+        register_metrics_hooks(self._client.meta.client.meta.events)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _map_concurrently(
+        self, func: Callable[[_IN], _OUT], items: Iterable[_IN]
+    ) -> list[_OUT]:
+        """
+        Runs `func` over `items` on a thread pool sized to the connection pool
+
+        Results are returned in the same order as `items`. Each call runs
+        in a copy of the caller's context, so context variables carry over
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._client.meta.client.meta.config.max_pool_connections,
+                        thread_name_prefix="dynamodb",
+                    )
+
+        contexts = [contextvars.copy_context() for _ in items]
+        return list(
+            self._executor.map(
+                lambda context, item: context.run(func, item), contexts, items
+            )
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def query_iter(
+        self,
+        /,
+        key_expression,
+        filter_expression=None,
+        secondary_index_name: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[dict[str]]:
+        """
+        Lazily yields every item matching the given expressions
+
+        Follows `LastEvaluatedKey` one page at a time, so only a single
+        page of raw items is held in memory. `page_size` sets the `Limit`
+        of each underlying request (items evaluated, not items returned)
+        """
+        kwargs = {"KeyConditionExpression": key_expression}
+
+        if filter_expression:
+            kwargs.update({"FilterExpression": filter_expression})
+
+        if secondary_index_name:
+            kwargs.update({"IndexName": secondary_index_name})
+
+        if page_size:
+            kwargs.update({"Limit": page_size})
+
+        while True:
+            response = self._table.query(**kwargs)
+            yield from response["Items"]
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs.update({"ExclusiveStartKey": last_key})
+
+    def query_all(
+        self,
+        /,
+        key_expression,
+        filter_expression=None,
+        secondary_index_name: Optional[str] = None,
+        max_items: Optional[int] = None,
+    ) -> list[dict[str]]:
+        """
+        Collects the results of `query_iter` into a list
+
+        Stops requesting further pages once `max_items` have been collected
+        """
+        items = []
+        for item in self.query_iter(
+            key_expression=key_expression,
+            filter_expression=filter_expression,
+            secondary_index_name=secondary_index_name,
+        ):
+            items.append(item)
+            if max_items is not None and len(items) >= max_items:
+                break
+        return items
+
+    def query_page(
+        self,
+        /,
+        key_expression,
+        limit: int,
+        filter_expression=None,
+        secondary_index_name: Optional[str] = None,
+        exclusive_start_key: Optional[dict[str]] = None,
+    ) -> tuple[list[dict[str]], Optional[dict[str]]]:
+        """
+        Fetches a single page of (at most `limit`) items
+
+        Returns the items along with the `LastEvaluatedKey` to resume
+        from, which is `None` once the final page has been read
+        """
+        kwargs = {"KeyConditionExpression": key_expression, "Limit": limit}
+
+        if filter_expression:
+            kwargs.update({"FilterExpression": filter_expression})
+
+        if secondary_index_name:
+            kwargs.update({"IndexName": secondary_index_name})
+
+        if exclusive_start_key:
+            kwargs.update({"ExclusiveStartKey": exclusive_start_key})
+
+        response = self._table.query(**kwargs)
+        return response["Items"], response.get("LastEvaluatedKey")
 
     def query(
         self,
@@ -31,17 +246,150 @@ class DynamoDB:
 
         You can additionally provide a `secondary_index_name` to
         search an alternate index
+
+        Every page of results is fetched, see `query_iter`
         """
-        kwargs = {"KeyConditionExpression": key_expression}
+        return self.query_all(
+            key_expression=key_expression,
+            filter_expression=filter_expression,
+            secondary_index_name=secondary_index_name,
+        )
+
+    def query_children(
+        self,
+        /,
+        user: User,
+        parent_ids: list[str],
+        child_type: ObjectType,
+        filter_expression=None,
+        secondary_index_name: str = PARENT_INDEX_NAME,
+    ) -> list[dict[str]]:
+        """
+        Fetches the user's `child_type` items belonging to any of `parent_ids`
+
+        Runs one concurrent query per parent against an adjacency index
+        (`ParentSearch` by default). Items are grouped in the order of
+        `parent_ids`, oldest first within each parent
+
+        Unless `ADJACENCY_INDEXES_ENABLED` is set, the child partition is
+        read and filtered on the parent attribute instead (see
+        `_children_from_partition`)
+        """
+        index_partition = PARENT_INDEXES[secondary_index_name]
+        unique_ids = list(dict.fromkeys(str(parent_id) for parent_id in parent_ids))
+
+        if not adjacency_indexes_enabled():
+            return self._children_from_partition(
+                user, unique_ids, child_type, filter_expression, secondary_index_name
+            )
+
+        def children_of(parent_id: str) -> list[dict[str]]:
+            parent_key = PARENT_KEY_TEMPLATE.format(
+                **{"user_id": user.id, "parent_id": parent_id}
+            )
+            return self.query_all(
+                secondary_index_name=secondary_index_name,
+                key_expression=Key(index_partition).eq(parent_key)
+                & Key(PARENT_INDEX_SORT_KEY).begins_with(
+                    f"{child_type.value}{DELIMITER}"
+                ),
+                filter_expression=filter_expression,
+            )
+
+        return [
+            item
+            for children in self._map_concurrently(children_of, unique_ids)
+            for item in children
+        ]
+
+    def _children_from_partition(
+        self,
+        user: User,
+        parent_ids: list[str],
+        child_type: ObjectType,
+        filter_expression,
+        secondary_index_name: str,
+    ) -> list[dict[str]]:
+        """
+        `query_children` without the adjacency indexes: one read of the
+        child partition, filtered on the parent attribute the index keys
+        """
+        # Imported here, as `hard.models` imports this module
+        from hard.models.registry import OBJECT_CLASSES
+
+        parent_attr = OBJECT_CLASSES[child_type].PARENT_ATTRIBUTES[
+            list(PARENT_INDEXES).index(secondary_index_name)
+        ]
+        partition = PARTITION_TEMPLATE.format(
+            **{"user_id": user.id, "object_type": child_type.value}
+        )
+
+        if len(parent_ids) <= FILTER_IN_MAX_OPERANDS:
+            parent_filter = Attr(parent_attr).is_in(parent_ids)
+            if filter_expression is not None:
+                parent_filter = parent_filter & filter_expression
+        else:
+            parent_filter = filter_expression
+
+        by_parent = {parent_id: [] for parent_id in parent_ids}
+        for item in self.query_iter(
+            key_expression=Key(DB_PARTITION).eq(partition),
+            filter_expression=parent_filter,
+        ):
+            if item.get(parent_attr) in by_parent:
+                by_parent[item[parent_attr]].append(item)
+
+        return [item for children in by_parent.values() for item in children]
+
+    def scan_iter(self, /, filter_expression=None) -> Iterator[dict[str]]:
+        """
+        Lazily yields every item in the table matching `filter_expression`
+
+        Reads the whole table, intended for migrations and maintenance only
+        """
+        kwargs = {}
 
         if filter_expression:
             kwargs.update({"FilterExpression": filter_expression})
 
-        if secondary_index_name:
-            kwargs.update({"IndexName": secondary_index_name})
+        while True:
+            response = self._table.scan(**kwargs)
+            yield from response["Items"]
 
-        response = self._table.query(**kwargs)
-        return response["Items"]
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs.update({"ExclusiveStartKey": last_key})
+
+    def get_items_by_id(
+        self, /, object_ids: list[str], partition: Optional[str] = None
+    ) -> list[dict[str]]:
+        """
+        Looks up items by `object_id`, one concurrent `ItemSearch` query per id
+
+        The index projects every attribute, so each lookup already returns
+        the full item and no follow-up read of the base table is needed.
+        If `partition` is given, items from any other partition are dropped.
+        Items are returned in the order of `object_ids`
+        """
+        unique_ids = list(dict.fromkeys(str(object_id) for object_id in object_ids))
+
+        def lookup(object_id: str) -> Optional[dict[str]]:
+            items = self.query_all(
+                secondary_index_name=ITEM_INDEX_NAME,
+                key_expression=Key(ITEM_INDEX_PARTITION).eq(object_id),
+                max_items=1,
+            )
+            return items[0] if items else None
+
+        found = dict(zip(unique_ids, self._map_concurrently(lookup, unique_ids)))
+
+        return [
+            item
+            for item in (found[str(object_id)] for object_id in object_ids)
+            if item is not None
+            and (partition is None or item[DB_PARTITION] == partition)
+        ]
 
     def batch_get(
         self,
@@ -51,6 +399,14 @@ class DynamoDB:
         search_attr: str,
         matches_list: list[str],
     ) -> list[DB_OBJECT_TYPE]:
+        """
+        Fetches the user's `target_object_cls` items whose `search_attr`
+        matches any value in `matches_list`
+
+        Lookups by `object_id` go straight to the `ItemSearch` index and
+        return items in the order of `matches_list`. Any other attribute is
+        matched by querying the partition
+        """
         if search_attr not in target_object_cls.model_fields.keys():
             raise ValueError(
                 f"Invalid `search_attr` ('{search_attr}') for target class `{ObjectType.from_object_class(target_object_cls).value}`"
@@ -62,36 +418,457 @@ class DynamoDB:
                 "object_type": ObjectType.from_object_class(target_object_cls).value,
             }
         )
-        json_items = self.query(
-            key_expression=Key(DB_PARTITION).eq(partition),
-            filter_expression=Attr(search_attr).is_in(matches_list),
-        )
-        objects = [target_object_cls.from_db(item) for item in json_items]
+
+        if search_attr == ITEM_INDEX_PARTITION:
+            json_items = self.get_items_by_id(matches_list, partition=partition)
+            return target_object_cls.from_db_list(json_items)
+
+        if len(matches_list) <= FILTER_IN_MAX_OPERANDS:
+            json_items = self.query_iter(
+                key_expression=Key(DB_PARTITION).eq(partition),
+                filter_expression=Attr(search_attr).is_in(matches_list),
+            )
+        else:
+            # Past the 100-operand limit of `IN`: read the partition once
+            # and match in memory (filters don't reduce read cost anyway)
+            matches = set(matches_list)
+            json_items = (
+                item
+                for item in self.query_iter(
+                    key_expression=Key(DB_PARTITION).eq(partition)
+                )
+                if item.get(search_attr) in matches
+            )
+
+        objects = target_object_cls.from_db_list(json_items)
         return objects
 
-    def put(self, /, data_object: DB_OBJECT_TYPE) -> DB_OBJECT_TYPE:
+    def put(
+        self,
+        /,
+        data_object: DB_OBJECT_TYPE,
+        condition_expression=None,
+        return_values: str = "NONE",
+    ) -> dict[str]:
         """
         'Puts' the given `data_object` into the DynamoDB table
+
+        If a `condition_expression` is given (built from `aws.dynamodb.Attr`),
+        the write only happens when it holds against the item currently
+        stored under the same key; otherwise `ConditionalCheckFailedError`
+        is raised. With `return_values="ALL_OLD"` the item it replaced is
+        returned (empty if there was none), in the same write
         """
-        self._table.put_item(Item=data_object.to_db())
-        return data_object
+        kwargs = {"Item": data_object.to_db(), "ReturnValues": return_values}
 
-    def delete(self, /, data_object: DB_OBJECT_TYPE) -> DB_OBJECT_TYPE:
+        if condition_expression is not None:
+            kwargs.update({"ConditionExpression": condition_expression})
+
+        try:
+            response = self._table.put_item(**kwargs)
+
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionalCheckFailedError(
+                    f"Condition failed when writing `{data_object.object_type.value}` with `object_id`: '{data_object.object_id}'"
+                ) from exc
+            raise
+
+        return response.get("Attributes", {})
+
+    def put_each(
+        self, /, puts: list[tuple[DB_OBJECT_TYPE, Optional[object]]]
+    ) -> list[bool]:
         """
-        Deletes the given `data_object` from the DyanmoDB table
+        Puts each object with its own (optionally conditional) `PutItem`,
+        concurrently
+
+        Unlike `batch_write`, every condition is checked, at the cost of a
+        request per object. Returns whether each was written, in order
+        (`False` where its condition failed)
         """
-        data = data_object.to_db()
-        self._table.delete_item(
-            Key={
-                DB_PARTITION: data.get(DB_PARTITION),
-                DB_SORT_KEY: data.get(DB_SORT_KEY),
-            }
+
+        def put_one(put: tuple[DB_OBJECT_TYPE, Optional[object]]) -> bool:
+            data_object, condition = put
+            try:
+                self.put(data_object, condition_expression=condition)
+            except ConditionalCheckFailedError:
+                return False
+            return True
+
+        return self._map_concurrently(put_one, puts)
+
+    def batch_write(
+        self,
+        /,
+        put_objects: Optional[list[DB_OBJECT_TYPE]] = None,
+        delete_objects: Optional[list[DB_OBJECT_TYPE]] = None,
+    ) -> None:
+        """
+        Puts and deletes the given objects using `BatchWriteItem`
+
+        Requests are sent in chunks of 25, concurrently, and any
+        `UnprocessedItems` are retried with exponential backoff.
+        Writes are not atomic: chunks may land in any order.
+        Each delete also writes a `tombstone`
+        """
+        requests: dict[tuple[str, str], dict] = {}
+
+        for data_object in put_objects or []:
+            item = data_object.to_db()
+            requests[_primary_key(item)] = {"PutRequest": {"Item": item}}
+
+        for data_object in delete_objects or []:
+            key = data_object.primary_key()
+            requests[_primary_key(key)] = {"DeleteRequest": {"Key": key}}
+            marker = tombstone(data_object)
+            requests[_primary_key(marker)] = {"PutRequest": {"Item": marker}}
+
+        self._map_concurrently(
+            self._batch_write_chunk,
+            chunked(list(requests.values()), BATCH_WRITE_CHUNK_SIZE),
         )
+
+    def _batch_write_chunk(self, requests: list[dict]) -> None:
+        table_name = self._table.name
+        request_items = {table_name: requests}
+
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = self._client.batch_write_item(RequestItems=request_items)
+
+            request_items = response.get("UnprocessedItems")
+            if not request_items:
+                return
+
+            time.sleep(BATCH_RETRY_BASE_DELAY * (2**attempt))
+
+        raise UnprocessedItemsError(
+            f"BatchWriteItem left {len(request_items[table_name])} items unprocessed after {BATCH_MAX_ATTEMPTS} attempts"
+        )
+
+    def transact_write(
+        self,
+        /,
+        puts: Optional[list[tuple[DB_OBJECT_TYPE, Optional[object]]]] = None,
+        deletes: Optional[list[tuple[DB_OBJECT_TYPE, Optional[object]]]] = None,
+    ) -> None:
+        """
+        Puts and deletes the given objects atomically using `TransactWriteItems`
+
+        Each object is paired with an optional condition (built from
+        `aws.dynamodb.Attr`). If the transaction is cancelled, nothing is
+        written and `TransactionCanceledError` carries a reason code per
+        action (puts first, then deletes, then a `tombstone` per delete),
+        `None` where the action was fine
+        """
+        table_name = self._table.name
+        actions = []
+
+        for data_object, condition in puts or []:
+            actions.append(
+                {
+                    "Put": {
+                        "TableName": table_name,
+                        "Item": data_object.to_db(),
+                        **_condition_kwargs(condition),
+                    }
+                }
+            )
+
+        for data_object, condition in deletes or []:
+            actions.append(
+                {
+                    "Delete": {
+                        "TableName": table_name,
+                        "Key": data_object.primary_key(),
+                        **_condition_kwargs(condition),
+                    }
+                }
+            )
+
+        for data_object, _ in deletes or []:
+            actions.append(
+                {"Put": {"TableName": table_name, "Item": tombstone(data_object)}}
+            )
+
+        if len(actions) > TRANSACT_WRITE_MAX_ITEMS:
+            raise ValueError(
+                f"Invalid Usage: `transact_write` accepts at most {TRANSACT_WRITE_MAX_ITEMS} actions, {len(actions)} provided"
+            )
+
+        try:
+            self._client.meta.client.transact_write_items(TransactItems=actions)
+
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            reasons = [
+                None if reason.get("Code") in (None, "None") else reason["Code"]
+                for reason in exc.response.get("CancellationReasons", [])
+            ]
+            raise TransactionCanceledError(
+                f"Transaction of {len(actions)} actions was cancelled", reasons
+            ) from exc
+
+    def get_item(
+        self, /, key: dict[str], consistent_read: bool = False
+    ) -> Optional[dict[str]]:
+        """
+        Fetches a single item by its primary key, or `None` if there isn't one
+
+        With `consistent_read`, the read reflects every write that succeeded
+        before it, at twice the read cost
+        """
+        response = self._table.get_item(Key=key, ConsistentRead=consistent_read)
+        return response.get("Item")
+
+    def increment(self, /, key: dict[str], attr: str, amount: int = 1) -> int:
+        """
+        Atomically adds `amount` to the numeric `attr` of the item under `key`
+        (creating either if missing) and returns the new value
+        """
+        response = self._table.update_item(
+            Key=key,
+            UpdateExpression="ADD #attr :amount",
+            ExpressionAttributeNames={"#attr": attr},
+            ExpressionAttributeValues={":amount": amount},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(response["Attributes"][attr])
+
+    def add(self, /, key: dict[str], amounts: dict[str]) -> dict[str]:
+        """
+        Atomically adds each of `amounts` to the numeric attribute of the same
+        name (creating the item or attributes if missing) in one `UpdateItem`
+
+        Returns the updated item
+        """
+        names = {}
+        values = {}
+        for i, (attr, amount) in enumerate(amounts.items()):
+            names[f"#a{i}"] = attr
+            values[f":a{i}"] = amount
+
+        response = self._table.update_item(
+            Key=key,
+            UpdateExpression="ADD "
+            + ", ".join(f"{name} :a{i}" for i, name in enumerate(names)),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW",
+        )
+        return response["Attributes"]
+
+    def put_item(self, /, item: dict[str], condition_expression=None) -> None:
+        """
+        Writes a raw item (one not backed by a `BaseObject`), replacing any
+        stored, unless `condition_expression` is given and does not hold
+        """
+        kwargs = {"Item": item}
+
+        if condition_expression is not None:
+            kwargs.update({"ConditionExpression": condition_expression})
+
+        try:
+            self._table.put_item(**kwargs)
+
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionalCheckFailedError(
+                    f"Condition failed when writing item with key: {_primary_key(item)}"
+                ) from exc
+            raise
+
+    def delete_item(self, /, key: dict[str], condition_expression=None) -> None:
+        """
+        Removes the raw item under `key`, if any, unless `condition_expression`
+        is given and does not hold
+
+        Unlike `delete`, no tombstone is left: only for items outside the
+        change feed, such as counters and aggregates
+        """
+        kwargs = {"Key": key}
+
+        if condition_expression is not None:
+            kwargs.update({"ConditionExpression": condition_expression})
+
+        try:
+            self._table.delete_item(**kwargs)
+
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionalCheckFailedError(
+                    f"Condition failed when deleting item with key: {key}"
+                ) from exc
+            raise
+
+    def update(
+        self,
+        /,
+        key: dict[str],
+        set_attrs: Optional[dict[str]] = None,
+        remove_attrs: Optional[list[str]] = None,
+        condition_expression=None,
+        return_values: str = "ALL_NEW",
+    ) -> dict[str]:
+        """
+        Applies a partial update to the item under `key` with one `UpdateItem`
+
+        `set_attrs` are written with a `SET` clause and `remove_attrs`
+        are dropped with a `REMOVE` clause. Returns the updated item, or
+        the item as it was with `return_values="ALL_OLD"` (nothing with
+        `return_values="NONE"`).
+        Raises `ConditionalCheckFailedError` if `condition_expression` fails
+        """
+        names = {}
+        values = {}
+        clauses = []
+
+        set_clauses = []
+        for i, (attr, value) in enumerate((set_attrs or {}).items()):
+            names[f"#s{i}"] = attr
+            values[f":s{i}"] = value
+            set_clauses.append(f"#s{i} = :s{i}")
+        if set_clauses:
+            clauses.append("SET " + ", ".join(set_clauses))
+
+        remove_clauses = []
+        for i, attr in enumerate(remove_attrs or []):
+            names[f"#r{i}"] = attr
+            remove_clauses.append(f"#r{i}")
+        if remove_clauses:
+            clauses.append("REMOVE " + ", ".join(remove_clauses))
+
+        if not clauses:
+            raise ValueError("Invalid Usage: `update` requires at least one change")
+
+        kwargs = {
+            "Key": key,
+            "UpdateExpression": " ".join(clauses),
+            "ExpressionAttributeNames": names,
+            "ReturnValues": return_values,
+        }
+
+        if values:
+            kwargs.update({"ExpressionAttributeValues": values})
+
+        if condition_expression is not None:
+            kwargs.update({"ConditionExpression": condition_expression})
+
+        try:
+            response = self._table.update_item(**kwargs)
+
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionalCheckFailedError(
+                    f"Condition failed when updating item with key: {key}"
+                ) from exc
+            raise
+
+        return response.get("Attributes", {})
+
+    def delete(self, /, data_object: DB_OBJECT_TYPE) -> DB_OBJECT_TYPE:
+        """
+        Deletes the given `data_object` from the DyanmoDB table,
+        leaving a `tombstone` in its place
+        """
+        self.batch_write(delete_objects=[data_object])
         return data_object
 
 
+_registry_lock = threading.Lock()
+_session: Optional[boto3.session.Session] = None
+_resource = None
+_db_instances: dict[str, DynamoDB] = {}
+
+
+def _flag_enabled(env_var: str) -> bool:
+    return os.getenv(env_var, "").lower() in ("1", "true")
+
+
+def adjacency_indexes_enabled() -> bool:
+    return _flag_enabled(ADJACENCY_INDEXES_ENV_VAR)
+
+
+def workout_date_index_enabled() -> bool:
+    return _flag_enabled(WORKOUT_DATE_INDEX_ENV_VAR)
+
+
+def sync_index_enabled() -> bool:
+    return _flag_enabled(SYNC_INDEX_ENV_VAR)
+
+
+def get_client_config() -> Config:
+    """
+    Builds the `botocore` config shared by every pooled DynamoDB handle
+
+    Pool size and retry behaviour can be tuned with the
+    `DYNAMO_MAX_POOL_CONNECTIONS`, `DYNAMO_MAX_RETRY_ATTEMPTS`
+    and `DYNAMO_RETRY_MODE` environment variables
+    """
+    return Config(
+        max_pool_connections=int(
+            os.getenv(MAX_POOL_CONNECTIONS_ENV_VAR, DEFAULT_MAX_POOL_CONNECTIONS)
+        ),
+        retries={
+            "max_attempts": int(
+                os.getenv(MAX_RETRY_ATTEMPTS_ENV_VAR, DEFAULT_MAX_RETRY_ATTEMPTS)
+            ),
+            "mode": os.getenv(RETRY_MODE_ENV_VAR, DEFAULT_RETRY_MODE),
+        },
+        tcp_keepalive=True,
+    )
+
+
+def _get_resource():
+    # Must be called while holding `_registry_lock`
+    global _session, _resource
+
+    if _resource is None:
+        if _session is None:
+            _session = boto3.session.Session()
+        _resource = _session.resource("dynamodb", config=get_client_config())
+
+    return _resource
+
+
 def get_db_instance() -> DynamoDB:
-    db_name = os.getenv("DYNAMO_TABLE_NAME")
-    if db_name:
-        return DynamoDB(table_name=db_name)
-    raise ValueError("Missing Environment Variable: `DYNAMO_TABLE_NAME`")
+    """
+    Returns the process-wide `DynamoDB` handle for `DYNAMO_TABLE_NAME`
+
+    The handle (and its session and connection pool) is created on
+    first use and reused for the lifetime of the process, so a warm
+    Lambda container only resolves credentials and endpoints once
+    """
+    db_name = os.getenv(TABLE_NAME_ENV_VAR)
+    if not db_name:
+        raise ValueError("Missing Environment Variable: `DYNAMO_TABLE_NAME`")
+
+    db = _db_instances.get(db_name)
+    if db is not None:
+        return db
+
+    with _registry_lock:
+        db = _db_instances.get(db_name)
+        if db is None:
+            db = DynamoDB(table_name=db_name, resource=_get_resource())
+            _db_instances[db_name] = db
+
+    return db
+
+
+def reset_db_instances() -> None:
+    """
+    Drops every pooled handle, along with the shared session
+
+    The next call to `get_db_instance` will build a fresh one,
+    picking up any changes to credentials, endpoints or config
+    """
+    global _session, _resource
+
+    with _registry_lock:
+        for db in _db_instances.values():
+            db.close()
+        _db_instances.clear()
+        _resource = None
+        _session = None
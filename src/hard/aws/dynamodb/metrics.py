@@ -0,0 +1,136 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+RETURN_CONSUMED_CAPACITY = "ReturnConsumedCapacity"
+_START_CONTEXT_KEY = "hard_call_started_at"
+
+_current_call_metrics: ContextVar[Optional["CallMetrics"]] = ContextVar(
+    "dynamodb_call_metrics", default=None
+)
+
+
+class CallMetrics:
+    """
+    Totals for the DynamoDB calls made while collecting, see `collect_call_metrics`
+
+    `items_read` counts the items DynamoDB evaluated and `items_returned`
+    those that survived any filter, so the gap between them is filter waste.
+    Calls also count towards the `parent` collector, if there is one
+    """
+
+    def __init__(self, parent: Optional["CallMetrics"] = None) -> None:
+        self._lock = threading.Lock()
+        self._parent = parent
+        self.calls = 0
+        self.duration = 0.0
+        self.consumed_capacity = 0.0
+        self.items_read = 0
+        self.items_returned = 0
+
+    def record(
+        self,
+        duration: float,
+        consumed_capacity: float = 0.0,
+        items_read: int = 0,
+        items_returned: int = 0,
+    ) -> None:
+        with self._lock:
+            self.calls += 1
+            self.duration += duration
+            self.consumed_capacity += consumed_capacity
+            self.items_read += items_read
+            self.items_returned += items_returned
+
+        if self._parent is not None:
+            self._parent.record(duration, consumed_capacity, items_read, items_returned)
+
+
+@contextmanager
+def collect_call_metrics() -> Iterator[CallMetrics]:
+    """
+    Records every DynamoDB call made in this context, including those made
+    from threads it is copied into (see `run_in_db_executor`). Collectors
+    nest: an enclosing collector sees the calls of those within it
+    """
+    metrics = CallMetrics(parent=_current_call_metrics.get())
+    token = _current_call_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_call_metrics.reset(token)
+
+
+def register_metrics_hooks(events) -> None:
+    """
+    Hooks `collect_call_metrics` into a DynamoDB client's event system
+
+    While collecting, `ReturnConsumedCapacity` is requested on every
+    operation that supports it. Safe to call repeatedly for one client
+    """
+    # Not `provide-client-params`: boto3's resource layer swaps in a copy there
+    events.register(
+        "before-parameter-build.dynamodb",
+        _request_consumed_capacity,
+        unique_id="hard-metrics-params",
+    )
+    events.register(
+        "before-call.dynamodb", _start_call, unique_id="hard-metrics-before"
+    )
+    events.register("after-call.dynamodb", _end_call, unique_id="hard-metrics-after")
+    events.register(
+        "after-call-error.dynamodb", _end_call, unique_id="hard-metrics-error"
+    )
+
+
+def _request_consumed_capacity(params: dict, model, **_) -> None:
+    if _current_call_metrics.get() is None:
+        return
+    if RETURN_CONSUMED_CAPACITY in model.input_shape.members:
+        params.setdefault(RETURN_CONSUMED_CAPACITY, "TOTAL")
+
+
+def _start_call(context: dict, **_) -> None:
+    if _current_call_metrics.get() is not None:
+        context[_START_CONTEXT_KEY] = time.perf_counter()
+
+
+def _end_call(context: dict, parsed: Optional[dict] = None, **_) -> None:
+    metrics = _current_call_metrics.get()
+    started_at = context.pop(_START_CONTEXT_KEY, None)
+    if metrics is None or started_at is None:
+        return
+
+    items_read, items_returned = _item_counts(parsed or {})
+    metrics.record(
+        duration=time.perf_counter() - started_at,
+        consumed_capacity=_capacity_units(parsed or {}),
+        items_read=items_read,
+        items_returned=items_returned,
+    )
+
+
+def _capacity_units(response: dict) -> float:
+    consumed = response.get("ConsumedCapacity") or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return sum(float(capacity.get("CapacityUnits", 0)) for capacity in consumed)
+
+
+def _item_counts(response: dict) -> tuple[int, int]:
+    if "Count" in response:
+        # Query/Scan: `ScannedCount` is what was read before the filter
+        return response.get("ScannedCount", response["Count"]), response["Count"]
+
+    if "Item" in response:
+        return 1, 1
+
+    responses = response.get("Responses")
+    if isinstance(responses, dict):
+        # BatchGetItem: table name -> items found
+        returned = sum(len(items) for items in responses.values())
+        return returned, returned
+
+    return 0, 0
@@ -0,0 +1,23 @@
+from typing import Type
+
+from hard.aws.dynamodb.base_object import BaseObject
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.tag import Tag
+from hard.models.tag_join import TagJoin
+from hard.models.template import Template
+from hard.models.workout import Workout
+
+# The model stored under each `ObjectType`, for reading mixed-type results
+OBJECT_CLASSES: dict[ObjectType, Type[BaseObject]] = {
+    ObjectType.BASE_OBJECT: BaseObject,
+    ObjectType.TAG: Tag,
+    ObjectType.WORKOUT: Workout,
+    ObjectType.EXERCISE: Exercise,
+    ObjectType.SET: Set,
+    ObjectType.TEMPLATE: Template,
+    ObjectType.TAG_JOIN: TagJoin,
+    ObjectType.EXCERCISE_JOIN: ExerciseJoin,
+}
@@ -1,6 +1,7 @@
 from decimal import Decimal
+from typing import ClassVar
 
-from pydantic import field_serializer, field_validator
+from pydantic import field_serializer
 
 from hard.aws.dynamodb.base_object import BaseObject
 from hard.aws.dynamodb.object_type import ObjectType
@@ -16,28 +17,11 @@ class Set(BaseObject):
     notes: str
     exercise_join_id: str
 
-    @field_validator("unit")
-    @classmethod
-    def process_weight_unit(cls, weight_unit: str):
-        return WeightUnit(weight_unit)
+    PARENT_ATTRIBUTES: ClassVar[tuple[str, ...]] = ("exercise_join_id",)
 
-    @field_serializer("unit")
-    def serialize_weight_unit(self, unit: WeightUnit):
-        return unit.value
-
-    @field_validator("set_type")
-    @classmethod
-    def process_set_type(cls, set_type: str):
-        return SetType(set_type)
-
-    @field_serializer("set_type")
-    def serialize_set_type(self, set_type: SetType):
-        return set_type.value
-
-    @field_serializer("weight")
-    def serialize_weight(self, weight: float):
-        return Decimal(weight)
-
-    @field_serializer("reps")
-    def serialize_reps(self, reps: float):
-        return Decimal(reps)
+    @field_serializer("weight", "reps", when_used="json")
+    def serialize_decimal(self, value: float) -> str:
+        # Sent as decimal strings ("62.5", "5"), as they always have been
+        if value.is_integer():
+            return str(int(value))
+        return str(Decimal(str(value)))
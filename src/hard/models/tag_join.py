@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import ClassVar, Optional
 from uuid import UUID
 
-from pydantic import Field, field_serializer, field_validator
+from pydantic import Field
 
 from hard.aws.dynamodb.base_object import BaseObject
 from hard.aws.dynamodb.handler import get_db_instance
@@ -14,24 +14,7 @@ class TagJoin(BaseObject):
     tag_id: UUID
     target_object_type: Optional[ObjectType] = Field(default=None)
 
-    # target_id handler
-    @field_serializer("target_id")
-    def target_id_to_str(self, target_id: UUID) -> str:
-        return str(target_id)
-
-    # tag_id handler
-    @field_serializer("tag_id")
-    def tag_id_to_str(self, tag_id: UUID) -> str:
-        return str(tag_id)
-
-    # target_object_type handler
-    @field_serializer("target_object_type")
-    def target_object_type_to_str(
-        self, target_object_type: Optional[ObjectType]
-    ) -> Optional[str]:
-        if target_object_type == None:
-            return None
-        return target_object_type.value
+    PARENT_ATTRIBUTES: ClassVar[tuple[str, ...]] = ("target_id", "tag_id")
 
     def get_target_object_type_from_db() -> ObjectType:
         # TODO: For now, will just deal with passing the value through
@@ -1,13 +1,31 @@
 import boto3
 import moto
 import pytest
+from fastapi.testclient import TestClient
 
-from hard.aws.dynamodb.consts import DB_PARTITION, DB_SORT_KEY, ITEM_INDEX_NAME
+from hard.app.catalog_cache import reset_catalog_cache
+from hard.aws.dynamodb.consts import (
+    ALT_PARENT_INDEX_NAME,
+    ALT_PARENT_INDEX_PARTITION,
+    DB_PARTITION,
+    DB_SORT_KEY,
+    ITEM_INDEX_NAME,
+    PARENT_INDEX_NAME,
+    PARENT_INDEX_PARTITION,
+    PARENT_INDEX_SORT_KEY,
+    SYNC_INDEX_NAME,
+    SYNC_INDEX_PARTITION,
+    SYNC_INDEX_SORT_KEY,
+    WORKOUT_DATE_INDEX_NAME,
+    WORKOUT_DATE_INDEX_SORT_KEY,
+)
+from hard.aws.dynamodb.handler import reset_db_instances
 from hard.aws.models.user import User
 
 MOCK_USER_ID = "mock_user"
 FAKE_USER_ID = "fake_user"
 MOCK_DYNAMO_TABLE_NAME = "mock_table"
+MOCK_CURSOR_SECRET_KEY = "mock_secret"
 
 
 @pytest.fixture
@@ -23,46 +41,139 @@ def fake_user() -> User:
 @pytest.fixture
 def env_vars():
     pytest.MonkeyPatch().setenv("DYNAMO_TABLE_NAME", MOCK_DYNAMO_TABLE_NAME)
+    pytest.MonkeyPatch().setenv("CURSOR_SECRET_KEY", MOCK_CURSOR_SECRET_KEY)
+    pytest.MonkeyPatch().setenv("ADJACENCY_INDEXES_ENABLED", "true")
+    pytest.MonkeyPatch().setenv("WORKOUT_DATE_INDEX_ENABLED", "true")
+    pytest.MonkeyPatch().setenv("SYNC_INDEX_ENABLED", "true")
     yield
 
 
+def create_table(client) -> None:
+    """Creates the mock table, with the same keys and indexes as `serverless.yml`"""
+    client.create_table(
+        TableName=MOCK_DYNAMO_TABLE_NAME,
+        AttributeDefinitions=[
+            {
+                "AttributeName": DB_PARTITION,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": DB_SORT_KEY,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": "object_id",
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": WORKOUT_DATE_INDEX_SORT_KEY,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": PARENT_INDEX_PARTITION,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": ALT_PARENT_INDEX_PARTITION,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": PARENT_INDEX_SORT_KEY,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": SYNC_INDEX_PARTITION,
+                "AttributeType": "S",
+            },
+            {
+                "AttributeName": SYNC_INDEX_SORT_KEY,
+                "AttributeType": "S",
+            },
+        ],
+        KeySchema=[
+            {
+                "AttributeName": DB_PARTITION,
+                "KeyType": "HASH",
+            },
+            {
+                "AttributeName": DB_SORT_KEY,
+                "KeyType": "RANGE",
+            },
+        ],
+        BillingMode="PAY_PER_REQUEST",
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": ITEM_INDEX_NAME,
+                "KeySchema": [{"AttributeName": "object_id", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": WORKOUT_DATE_INDEX_NAME,
+                "KeySchema": [
+                    {"AttributeName": DB_PARTITION, "KeyType": "HASH"},
+                    {
+                        "AttributeName": WORKOUT_DATE_INDEX_SORT_KEY,
+                        "KeyType": "RANGE",
+                    },
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": PARENT_INDEX_NAME,
+                "KeySchema": [
+                    {"AttributeName": PARENT_INDEX_PARTITION, "KeyType": "HASH"},
+                    {"AttributeName": PARENT_INDEX_SORT_KEY, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": ALT_PARENT_INDEX_NAME,
+                "KeySchema": [
+                    {
+                        "AttributeName": ALT_PARENT_INDEX_PARTITION,
+                        "KeyType": "HASH",
+                    },
+                    {"AttributeName": PARENT_INDEX_SORT_KEY, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": SYNC_INDEX_NAME,
+                "KeySchema": [
+                    {"AttributeName": SYNC_INDEX_PARTITION, "KeyType": "HASH"},
+                    {"AttributeName": SYNC_INDEX_SORT_KEY, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+    )
+
+
 @pytest.fixture
 def set_up_aws_resources():
     with moto.mock_aws():
+        reset_db_instances()
+        reset_catalog_cache()
         client = boto3.client("dynamodb")
-        client.create_table(
-            TableName=MOCK_DYNAMO_TABLE_NAME,
-            AttributeDefinitions=[
-                {
-                    "AttributeName": DB_PARTITION,
-                    "AttributeType": "S",
-                },
-                {
-                    "AttributeName": DB_SORT_KEY,
-                    "AttributeType": "S",
-                },
-                {
-                    "AttributeName": "object_id",
-                    "AttributeType": "S",
-                },
-            ],
-            KeySchema=[
-                {
-                    "AttributeName": DB_PARTITION,
-                    "KeyType": "HASH",
-                },
-                {
-                    "AttributeName": DB_SORT_KEY,
-                    "KeyType": "RANGE",
-                },
-            ],
-            BillingMode="PAY_PER_REQUEST",
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": ITEM_INDEX_NAME,
-                    "KeySchema": [{"AttributeName": "object_id", "KeyType": "HASH"}],
-                    "Projection": {"ProjectionType": "ALL"},
-                }
-            ],
-        )
+        create_table(client)
         yield client
+        reset_db_instances()
+
+
+@pytest.fixture
+def api_client(env_vars, set_up_aws_resources, mock_user) -> TestClient:
+    """The full app, as API Gateway invokes it for `mock_user`"""
+    from hard.app.main import app
+
+    event = {
+        "requestContext": {
+            "authorizer": {
+                "claims": {"cognito:username": mock_user.id, "email": mock_user.email}
+            }
+        }
+    }
+
+    async def app_with_event(scope, receive, send):
+        await app({**scope, "aws.event": event}, receive, send)
+
+    return TestClient(app_with_event)
@@ -0,0 +1,377 @@
+import asyncio
+import logging
+from copy import deepcopy
+from datetime import date
+
+import pytest
+
+from hard.app import aggregates
+from hard.app import processes as processes_module
+from hard.app.analytics import LBS_TO_KG, epley, exercise_columns
+from hard.app.batch import batch_delete, batch_post
+from hard.app.processes import RestProcesses
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+MONDAY = date(2024, 5, 6)
+NEXT_MONDAY = date(2024, 5, 13)
+
+SetPatch = Set.partial_model()
+
+
+@pytest.fixture
+def log(set_up_aws_resources, mock_user) -> dict[str, list]:
+    """One exercise, done in two workouts a week apart, with no sets yet"""
+    exercise = Exercise.model_validate({"name": "Squat"})
+    exercise.init_from_request(mock_user, ObjectType.EXERCISE)
+
+    workouts, joins = [], []
+    for workout_date in (MONDAY, NEXT_MONDAY):
+        workout = Workout.model_validate(
+            {"workout_date": workout_date.isoformat(), "notes": "", "title": "Legs"}
+        )
+        workout.init_from_request(mock_user, ObjectType.WORKOUT)
+        join = ExerciseJoin.model_validate(
+            {"workout_id": workout.object_id, "exercise_id": exercise.object_id}
+        )
+        join.init_from_request(mock_user, ObjectType.EXCERCISE_JOIN)
+        workouts.append(workout)
+        joins.append(join)
+
+    get_db_instance().batch_write(put_objects=[exercise, *workouts, *joins])
+
+    return {"exercise": exercise, "workouts": workouts, "joins": joins}
+
+
+@pytest.fixture(autouse=True)
+def no_aggregate_errors(caplog):
+    yield
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+
+def new_set(
+    join: ExerciseJoin,
+    weight: float,
+    reps: float = 5,
+    unit: WeightUnit = WeightUnit.KILOGRAMS,
+    set_type: SetType = SetType.WORKING,
+) -> Set:
+    return Set.model_validate(
+        {
+            "set_type": set_type.value,
+            "weight": weight,
+            "unit": unit.value,
+            "reps": reps,
+            "notes": "",
+            "exercise_join_id": str(join.object_id),
+        }
+    )
+
+
+def post_set(user, join: ExerciseJoin, weight: float, **kwargs) -> Set:
+    return RestProcesses.post(Set, user, new_set(join, weight, **kwargs))
+
+
+def summary(user, log):
+    """The summary from the aggregates, checked against a rebuild from scratch"""
+    names = {str(log["exercise"].object_id): log["exercise"].name}
+    incremental = aggregates.summarize(aggregates.aggregate_items(user), names)
+
+    aggregates.rebuild_user(user)
+    rebuilt = aggregates.summarize(aggregates.aggregate_items(user), names)
+
+    assert incremental == rebuilt
+    return incremental
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestRecordSetChanges:
+
+    def test_post(self, mock_user, log):
+        first, second = log["joins"]
+        post_set(mock_user, first, 100)
+        post_set(mock_user, first, 50, set_type=SetType.WARMUP)
+        post_set(mock_user, second, 220, unit=WeightUnit.POUNDS)
+        post_set(mock_user, second, 90)
+
+        result = summary(mock_user, log)
+
+        (squat,) = result.exercises
+        assert (squat.name, squat.set_count, squat.last_performed) == (
+            "Squat",
+            3,
+            NEXT_MONDAY,
+        )
+        assert squat.total_volume == pytest.approx(
+            (100 + 220 * LBS_TO_KG + 90) * 5, abs=0.01
+        )
+        assert squat.best_e1rm == pytest.approx(epley(100, 5), abs=0.01)
+        assert [(week.week_start, week.set_count) for week in result.weekly_volume] == [
+            (MONDAY, 1),
+            (NEXT_MONDAY, 2),
+        ]
+
+    def test_put_and_patch(self, mock_user, log):
+        first, _ = log["joins"]
+        stored = post_set(mock_user, first, 100)
+        post_set(mock_user, first, 80)
+
+        stored.weight = 120
+        RestProcesses.put(Set, mock_user, stored)
+        RestProcesses.patch(
+            Set,
+            mock_user,
+            stored.object_id,
+            SetPatch(reps=3, timestamp=stored.timestamp),
+        )
+
+        (squat,) = summary(mock_user, log).exercises
+        assert squat.total_volume == 120 * 3 + 80 * 5
+        assert squat.best_e1rm == pytest.approx(epley(120, 3), abs=0.01)
+
+    def test_put_reads_nothing(self, mock_user, log, monkeypatch):
+        first, _ = log["joins"]
+        stored = post_set(mock_user, first, 100)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Read before write")
+
+        monkeypatch.setattr(RestProcesses, "get", fail)
+        stored.weight = 120
+        RestProcesses.put(Set, mock_user, stored)
+
+        (squat,) = summary(mock_user, log).exercises
+        assert squat.total_volume == 120 * 5
+
+    def test_moving_a_set_between_workouts(self, mock_user, log):
+        first, second = log["joins"]
+        stored = post_set(mock_user, first, 100)
+
+        RestProcesses.patch(
+            Set,
+            mock_user,
+            stored.object_id,
+            SetPatch(exercise_join_id=str(second.object_id)),
+        )
+
+        result = summary(mock_user, log)
+        assert result.exercises[0].last_performed == NEXT_MONDAY
+        assert [week.week_start for week in result.weekly_volume] == [NEXT_MONDAY]
+
+    def test_redating_a_workout(self, mock_user, log):
+        first, _ = log["joins"]
+        post_set(mock_user, first, 100)
+        workout = deepcopy(log["workouts"][0])
+        workout.workout_date = date(2024, 5, 20)
+
+        RestProcesses.put(Workout, mock_user, workout)
+
+        result = summary(mock_user, log)
+        assert result.exercises[0].last_performed == date(2024, 5, 20)
+        assert [week.week_start for week in result.weekly_volume] == [date(2024, 5, 20)]
+
+    def test_redating_rebuilds_on_read(self, mock_user, log, monkeypatch):
+        first, _ = log["joins"]
+        post_set(mock_user, first, 100)
+        workout = deepcopy(log["workouts"][0])
+        workout.workout_date = date(2024, 5, 20)
+        rebuilt = []
+        monkeypatch.setattr(
+            aggregates,
+            "exercise_columns",
+            lambda *args: rebuilt.append(args) or exercise_columns(*args),
+        )
+
+        RestProcesses.put(Workout, mock_user, workout)
+        post_set(mock_user, first, 110)
+
+        assert rebuilt == []
+        (stored,) = aggregates._stored_aggregate_items(mock_user)
+        assert stored[aggregates.STALE_ATTRIBUTE] == 1
+
+        (item,) = aggregates.aggregate_items(mock_user)
+        assert item[aggregates.LAST_PERFORMED_ATTRIBUTE] == "2024-05-20"
+        assert len(rebuilt) == 1
+        assert aggregates._stored_aggregate_items(mock_user) == [item]
+
+    def test_marked_again_during_rebuild(self, mock_user, log, monkeypatch):
+        post_set(mock_user, log["joins"][0], 100)
+        exercise_id = str(log["exercise"].object_id)
+        aggregates.mark_stale(mock_user, [exercise_id])
+
+        def columns_then_mark(*args):
+            columns = exercise_columns(*args)
+            aggregates.mark_stale(mock_user, [exercise_id])
+            return columns
+
+        monkeypatch.setattr(aggregates, "exercise_columns", columns_then_mark)
+
+        (item,) = aggregates.aggregate_items(mock_user)
+
+        assert item[aggregates.SET_COUNT_ATTRIBUTE] == 1
+        (stored,) = aggregates._stored_aggregate_items(mock_user)
+        assert stored[aggregates.STALE_ATTRIBUTE] == 2
+
+    def test_moving_a_join_to_another_exercise(self, mock_user, log):
+        first, second = log["joins"]
+        post_set(mock_user, first, 100)
+        post_set(mock_user, second, 100)
+        bench = RestProcesses.post(
+            Exercise, mock_user, Exercise.model_validate({"name": "Bench"})
+        )
+
+        RestProcesses.patch(
+            ExerciseJoin,
+            mock_user,
+            second.object_id,
+            ExerciseJoin.partial_model()(exercise_id=bench.object_id),
+        )
+
+        result = summary(mock_user, log)
+        assert sorted(
+            (totals.exercise_id, totals.last_performed) for totals in result.exercises
+        ) == sorted(
+            [
+                (log["exercise"].object_id, MONDAY),
+                (bench.object_id, NEXT_MONDAY),
+            ]
+        )
+
+    def test_deleting_the_best_set(self, mock_user, log):
+        first, second = log["joins"]
+        best = post_set(mock_user, first, 140)
+        post_set(mock_user, second, 100)
+
+        RestProcesses.delete(Set, mock_user, best.object_id)
+
+        (squat,) = summary(mock_user, log).exercises
+        assert squat.best_e1rm == pytest.approx(epley(100, 5), abs=0.01)
+
+    def test_deleting_the_latest_sets(self, mock_user, log):
+        first, second = log["joins"]
+        post_set(mock_user, first, 100)
+        latest = [post_set(mock_user, second, 100) for _ in range(2)]
+
+        RestProcesses.delete(Set, mock_user, latest[0].object_id)
+        assert (
+            aggregates.summarize(aggregates.aggregate_items(mock_user), {})
+            .exercises[0]
+            .last_performed
+            == NEXT_MONDAY
+        )
+
+        RestProcesses.delete(Set, mock_user, latest[1].object_id)
+        (squat,) = summary(mock_user, log).exercises
+        assert (squat.set_count, squat.last_performed) == (1, MONDAY)
+
+    def test_cascades(self, mock_user, log):
+        first, second = log["joins"]
+        post_set(mock_user, first, 100)
+        post_set(mock_user, second, 100)
+
+        processes_module.delete_workout_cascade(mock_user, log["workouts"][1].object_id)
+        assert summary(mock_user, log).set_count == 1
+
+        processes_module.delete_exercise_join_cascade(mock_user, first.object_id)
+        assert aggregates.aggregate_items(mock_user) == []
+
+    def test_batches(self, mock_user, log):
+        first, second = log["joins"]
+        sets = [new_set(first, 100), new_set(second, 110)]
+        batch_post(Set, mock_user, sets)
+
+        sets[0].weight = 120
+        batch_post(Set, mock_user, [sets[0]], atomic=True)
+        (squat,) = summary(mock_user, log).exercises
+        assert squat.total_volume == (120 + 110) * 5
+
+        moved = deepcopy(second)
+        moved.workout_id = first.workout_id
+        batch_post(ExerciseJoin, mock_user, [moved])
+        (squat,) = summary(mock_user, log).exercises
+        assert squat.last_performed == MONDAY
+
+        batch_delete(ExerciseJoin, mock_user, [second.object_id])
+        (squat,) = summary(mock_user, log).exercises
+        assert (squat.set_count, squat.last_performed) == (1, MONDAY)
+
+    def test_failures_do_not_fail_the_write(self, mock_user, log, monkeypatch, caplog):
+        def fail(*args, **kwargs):
+            raise RuntimeError("Aggregates unavailable")
+
+        monkeypatch.setattr(processes_module, "record_set_changes", fail)
+
+        stored = post_set(mock_user, log["joins"][0], 100)
+
+        assert RestProcesses.get(Set, mock_user, stored.object_id) == stored
+        assert "Failed to update exercise aggregates" in caplog.text
+        caplog.clear()
+
+    def test_redating_failures_do_not_fail_the_write(
+        self, mock_user, log, monkeypatch, caplog
+    ):
+        def fail(*args, **kwargs):
+            raise RuntimeError("Joins unavailable")
+
+        monkeypatch.setattr(processes_module, "exercise_join_filter", fail)
+        workout = deepcopy(log["workouts"][0])
+        workout.workout_date = date(2024, 5, 20)
+
+        stored = RestProcesses.put(Workout, mock_user, workout)
+
+        assert RestProcesses.get(Workout, mock_user, workout.object_id) == stored
+        assert "Failed to mark exercise aggregates stale" in caplog.text
+        caplog.clear()
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestSummary:
+
+    def test_one_item_per_exercise(self, mock_user, log):
+        first, second = log["joins"]
+        for join in (first, second):
+            for _ in range(10):
+                post_set(mock_user, join, 100)
+
+        assert len(aggregates.aggregate_items(mock_user)) == 1
+
+        result = asyncio.run(processes_module.stats_summary(mock_user))
+
+        assert result.set_count == 20
+        assert [exercise.name for exercise in result.exercises] == ["Squat"]
+
+    def test_rebuild_drops_aggregates_without_sets(self, mock_user, log):
+        stored = post_set(mock_user, log["joins"][0], 100)
+        # Removed without going through `RestProcesses`, so not tracked
+        get_db_instance().delete(stored)
+
+        assert aggregates.rebuild_user(mock_user) == 0
+        assert aggregates.aggregate_items(mock_user) == []
+
+
+@pytest.mark.usefixtures("log")
+class TestStatsRoute:
+
+    def test_workout_date_change(self, api_client, mock_user, log):
+        post_set(mock_user, log["joins"][0], 100)
+        assert [
+            week["week_start"]
+            for week in api_client.get("/api/stats/summary").json()["weekly_volume"]
+        ] == [MONDAY.isoformat()]
+
+        response = api_client.patch(
+            f"/api/workouts/{log['workouts'][0].object_id}",
+            json={"workout_date": "2024-05-20"},
+        )
+        assert response.status_code == 200
+
+        result = api_client.get("/api/stats/summary").json()
+        assert result["exercises"][0]["last_performed"] == "2024-05-20"
+        assert [week["week_start"] for week in result["weekly_volume"]] == [
+            "2024-05-20"
+        ]
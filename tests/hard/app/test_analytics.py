@@ -0,0 +1,208 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from hard.app import analytics, processes
+from hard.app.analytics import LBS_TO_KG, SetColumns, epley
+from hard.aws.dynamodb.consts import ItemNotFoundError
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+EXERCISE_ID = str(uuid4())
+OTHER_EXERCISE_ID = str(uuid4())
+
+# Monday 2024-05-06 and the following Wednesday and Monday
+MONDAY = date(2024, 5, 6)
+WEDNESDAY = date(2024, 5, 8)
+NEXT_MONDAY = date(2024, 5, 13)
+
+JOIN_TARGETS = {
+    "join-1": (EXERCISE_ID, MONDAY),
+    "join-2": (EXERCISE_ID, WEDNESDAY),
+    "join-3": (OTHER_EXERCISE_ID, NEXT_MONDAY),
+}
+
+
+def set_item(
+    join_id: str,
+    weight: float,
+    reps: float,
+    unit: WeightUnit = WeightUnit.KILOGRAMS,
+    set_type: SetType = SetType.WORKING,
+) -> dict[str]:
+    return {
+        "exercise_join_id": join_id,
+        "weight": weight,
+        "reps": reps,
+        "unit": unit.value,
+        "set_type": set_type.value,
+    }
+
+
+@pytest.fixture
+def columns() -> SetColumns:
+    return SetColumns.from_items(
+        [
+            set_item("join-1", 50, 10, set_type=SetType.WARMUP),
+            set_item("join-1", 100, 5),
+            set_item("join-1", 100, 5),
+            set_item("join-2", 220.5, 3, unit=WeightUnit.POUNDS),
+            set_item("join-2", 110, 5),
+            set_item("join-3", 60, 8),
+            set_item("deleted-join", 500, 1),
+        ],
+        JOIN_TARGETS,
+    )
+
+
+def test_epley():
+    assert epley(100, 0) == 0
+    assert epley(100, 1) == 100
+    assert epley(100, 10) == pytest.approx(133.33, abs=0.01)
+
+
+class TestSetColumns:
+
+    def test_from_items(self, columns):
+        assert len(columns) == 5
+        assert columns.exercise_ids == [EXERCISE_ID, OTHER_EXERCISE_ID]
+        assert list(columns.exercise) == [0, 0, 0, 0, 1]
+        assert columns.weight[2] == pytest.approx(220.5 * LBS_TO_KG)
+        assert list(columns.day) == [
+            MONDAY.toordinal(),
+            MONDAY.toordinal(),
+            WEDNESDAY.toordinal(),
+            WEDNESDAY.toordinal(),
+            NEXT_MONDAY.toordinal(),
+        ]
+
+    def test_weeks(self, columns):
+        assert [date.fromordinal(week) for week in columns.weeks()] == [
+            MONDAY,
+            MONDAY,
+            MONDAY,
+            MONDAY,
+            NEXT_MONDAY,
+        ]
+
+
+class TestCompute:
+
+    def test_exercise_totals(self, columns):
+        squat, other = analytics.exercise_totals(
+            columns, columns.volumes(), columns.e1rms(), {EXERCISE_ID: "Squat"}
+        )
+
+        assert (str(other.exercise_id), other.name) == (OTHER_EXERCISE_ID, None)
+        assert (squat.name, squat.set_count, squat.last_performed) == (
+            "Squat",
+            4,
+            WEDNESDAY,
+        )
+        assert squat.total_volume == pytest.approx(
+            500 + 500 + 220.5 * LBS_TO_KG * 3 + 550, abs=0.01
+        )
+        assert squat.best_e1rm == pytest.approx(epley(110, 5), abs=0.01)
+
+    def test_weekly_volume(self, columns):
+        weekly = analytics.weekly_volume(columns.weeks(), columns.volumes())
+
+        assert [(week.week_start, week.set_count) for week in weekly] == [
+            (MONDAY, 4),
+            (NEXT_MONDAY, 1),
+        ]
+        assert weekly[1].volume == 480
+
+    def test_rep_records(self, columns):
+        records = analytics.rep_records(columns)
+
+        assert [(record.reps, record.performed_on) for record in records] == [
+            (3, WEDNESDAY),
+            (5, WEDNESDAY),
+            (8, NEXT_MONDAY),
+        ]
+        assert records[0].weight == pytest.approx(100.02, abs=0.01)
+
+    def test_rep_record_ties_keep_the_first(self):
+        columns = SetColumns.from_items(
+            [set_item("join-2", 100, 5), set_item("join-1", 100, 5)], JOIN_TARGETS
+        )
+
+        (record,) = analytics.rep_records(columns)
+
+        assert record.performed_on == MONDAY
+
+
+@pytest.fixture
+def training_log(set_up_aws_resources, mock_user) -> dict[str, list]:
+    exercise = Exercise.model_validate({"name": "Squat"})
+    exercise.init_from_request(mock_user, ObjectType.EXERCISE)
+
+    objects = {"exercises": [exercise], "workouts": [], "sets": []}
+    for workout_date, weight in ((MONDAY, 100), (NEXT_MONDAY, 105)):
+        workout = Workout.model_validate(
+            {"workout_date": workout_date.isoformat(), "notes": "", "title": "Legs"}
+        )
+        workout.init_from_request(mock_user, ObjectType.WORKOUT)
+
+        join = ExerciseJoin.model_validate(
+            {"workout_id": workout.object_id, "exercise_id": exercise.object_id}
+        )
+        join.init_from_request(mock_user, ObjectType.EXCERCISE_JOIN)
+
+        for set_type in (SetType.WARMUP, SetType.WORKING, SetType.WORKING):
+            set = Set.model_validate(
+                {
+                    "set_type": set_type.value,
+                    "weight": weight,
+                    "unit": WeightUnit.KILOGRAMS.value,
+                    "reps": 5,
+                    "notes": "",
+                    "exercise_join_id": str(join.object_id),
+                }
+            )
+            set.init_from_request(mock_user, ObjectType.SET)
+            objects["sets"].append(set)
+
+        objects["workouts"].append(workout)
+        get_db_instance().batch_write(put_objects=[workout, join])
+
+    get_db_instance().batch_write(put_objects=[exercise, *objects["sets"]])
+
+    return objects
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestExerciseStats:
+
+    def test_stats(self, mock_user, training_log):
+        exercise = training_log["exercises"][0]
+
+        stats = asyncio.run(processes.exercise_stats(mock_user, exercise.object_id))
+
+        assert stats.name == "Squat"
+        assert stats.set_count == 4
+        assert stats.total_volume == 2050
+        assert stats.last_performed == NEXT_MONDAY
+        assert [record.weight for record in stats.rep_records] == [105]
+        assert [week.volume for week in stats.weekly_volume] == [1000, 1050]
+
+    def test_without_sets(self, mock_user, set_up_aws_resources):
+        exercise = Exercise.model_validate({"name": "Plank"})
+        exercise.init_from_request(mock_user, ObjectType.EXERCISE)
+        get_db_instance().put(exercise)
+
+        stats = asyncio.run(processes.exercise_stats(mock_user, exercise.object_id))
+
+        assert (stats.set_count, stats.best_e1rm, stats.weekly_volume) == (0, None, [])
+
+    def test_missing_exercise(self, mock_user, set_up_aws_resources):
+        with pytest.raises(ItemNotFoundError):
+            asyncio.run(processes.exercise_stats(mock_user, uuid4()))
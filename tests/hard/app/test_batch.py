@@ -0,0 +1,179 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from hard.app.batch import InvalidBatchError, batch_delete, batch_post
+from hard.app.processes import RestProcesses, sets_from_ids
+from hard.aws.dynamodb import base_object
+from hard.aws.dynamodb.consts import TRANSACT_WRITE_MAX_ITEMS, ItemNotFoundError
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+
+MOCK_JOIN_ID = str(uuid4())
+
+
+def make_sets(count: int, exercise_join_id: str = MOCK_JOIN_ID) -> list[Set]:
+    return [
+        Set.model_validate(
+            {
+                "set_type": SetType.WORKING.value,
+                "weight": 60 + index,
+                "unit": WeightUnit.KILOGRAMS.value,
+                "reps": 5,
+                "notes": "",
+                "exercise_join_id": exercise_join_id,
+            }
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def stored_set(set_up_aws_resources, mock_user) -> Set:
+    return RestProcesses.post(Set, mock_user, make_sets(1)[0])
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestBatchPost:
+
+    @pytest.mark.parametrize("atomic", [False, True])
+    def test_successful_create(self, mock_user, atomic):
+        result = batch_post(Set, mock_user, make_sets(40), atomic=atomic)
+
+        assert [item.status for item in result.results] == [201] * 40
+        assert [item.index for item in result.results] == list(range(40))
+        assert len(RestProcesses.get_list(Set, mock_user)) == 40
+
+    def test_existing_id_is_replaced(self, mock_user, stored_set):
+        replacement = make_sets(1)[0]
+        replacement.object_id = stored_set.object_id
+        replacement.reps = 12
+
+        result = batch_post(Set, mock_user, [replacement])
+
+        assert result.results[0].status == 200
+        fetched = RestProcesses.get(Set, mock_user, stored_set.object_id)
+        assert fetched.reps == 12
+        assert fetched.timestamp == stored_set.timestamp
+
+    def test_invalid_items_skipped(self, mock_user, fake_user, stored_set):
+        clash, duplicate, foreign, valid = make_sets(4)
+        clash.object_id = stored_set.object_id
+        duplicate.object_id = stored_set.object_id
+        foreign.user_id = fake_user.id
+
+        result = batch_post(Set, fake_user, [clash, duplicate, foreign, valid])
+
+        assert [item.status for item in result.results] == [409, 400, 201, 201]
+        result = batch_post(Set, mock_user, [foreign])
+        assert result.results[0].status == 401
+        assert (
+            result.results[0].detail
+            == f"`Set` Item not owned by current user ({mock_user.id}): Cannot Create"
+        )
+
+    @pytest.mark.parametrize("atomic", [False, True])
+    def test_same_clock_reading(self, mock_user, monkeypatch, atomic):
+        frozen = datetime.now()
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen
+
+        monkeypatch.setattr(base_object, "datetime", FrozenDatetime)
+
+        result = batch_post(Set, mock_user, make_sets(3), atomic=atomic)
+
+        assert [item.status for item in result.results] == [201] * 3
+        assert len(RestProcesses.get_list(Set, mock_user)) == 3
+
+    def test_replace_of_deleted_item(self, mock_user, stored_set, monkeypatch):
+        replacement = make_sets(1)[0]
+        replacement.object_id = stored_set.object_id
+        db = get_db_instance()
+        put_each = db.put_each
+
+        def delete_then_put(puts):
+            # Deleted by another request after the batch was checked
+            RestProcesses.delete(Set, mock_user, stored_set.object_id)
+            return put_each(puts)
+
+        monkeypatch.setattr(db, "put_each", delete_then_put)
+
+        result = batch_post(Set, mock_user, [replacement, *make_sets(1)])
+
+        assert [item.status for item in result.results] == [404, 201]
+        assert [set.object_id for set in RestProcesses.get_list(Set, mock_user)] == [
+            result.results[1].object_id
+        ]
+
+    def test_atomic_writes_nothing_on_failure(self, mock_user, fake_user, stored_set):
+        clash, valid = make_sets(2)
+        clash.object_id = stored_set.object_id
+
+        result = batch_post(Set, fake_user, [valid, clash], atomic=True)
+
+        assert [item.status for item in result.results] == [424, 409]
+        assert RestProcesses.get_list(Set, fake_user) == []
+
+    def test_atomic_size_limit(self, mock_user):
+        with pytest.raises(
+            InvalidBatchError,
+            match=f"Invalid Batch: Atomic batches are limited to {TRANSACT_WRITE_MAX_ITEMS} writes",
+        ):
+            batch_post(
+                Set, mock_user, make_sets(TRANSACT_WRITE_MAX_ITEMS + 1), atomic=True
+            )
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestBatchDelete:
+
+    @pytest.fixture
+    def join_with_sets(self, mock_user) -> ExerciseJoin:
+        join = ExerciseJoin.model_validate(
+            {"workout_id": uuid4(), "exercise_id": uuid4()}
+        )
+        join = RestProcesses.post(ExerciseJoin, mock_user, join)
+        batch_post(Set, mock_user, make_sets(5, str(join.object_id)))
+        return join
+
+    @pytest.mark.parametrize("atomic", [False, True])
+    def test_cascade(self, mock_user, join_with_sets, atomic):
+        result = batch_delete(
+            ExerciseJoin, mock_user, [join_with_sets.object_id], atomic=atomic
+        )
+
+        assert result.results[0].status == 200
+        assert result.results[0].item.object_id == join_with_sets.object_id
+        assert sets_from_ids(mock_user, workout_id=join_with_sets.workout_id) == []
+        assert RestProcesses.get_list(Set, mock_user) == []
+        with pytest.raises(ItemNotFoundError):
+            RestProcesses.get(ExerciseJoin, mock_user, join_with_sets.object_id)
+
+    def test_invalid_ids(self, mock_user, fake_user, stored_set):
+        missing_id = uuid4()
+
+        result = batch_delete(
+            Set, fake_user, [stored_set.object_id, missing_id, missing_id]
+        )
+
+        assert [item.status for item in result.results] == [401, 404, 400]
+        assert (
+            result.results[1].detail
+            == f"No `Set` found with `object_id`: '{missing_id}': Cannot Delete"
+        )
+        assert RestProcesses.get(Set, mock_user, stored_set.object_id)
+
+    def test_atomic_deletes_nothing_on_failure(self, mock_user, stored_set):
+        result = batch_delete(
+            Set, mock_user, [stored_set.object_id, uuid4()], atomic=True
+        )
+
+        assert [item.status for item in result.results] == [424, 404]
+        assert RestProcesses.get(Set, mock_user, stored_set.object_id)
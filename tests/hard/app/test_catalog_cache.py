@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+from hard.app import catalog_cache as catalog_cache_module
+from hard.app.processes import RestProcesses
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.exercise import Exercise
+from hard.models.set import Set
+
+from ...conftest import MOCK_USER_ID
+
+
+@pytest.fixture
+def enable_cache(monkeypatch):
+    monkeypatch.setenv(catalog_cache_module.CACHE_ENABLED_ENV_VAR, "true")
+
+
+@pytest.fixture
+def query_calls(monkeypatch) -> list:
+    db = get_db_instance()
+    calls = []
+    real_query = db._table.query
+
+    def counting_query(**kwargs):
+        calls.append(kwargs)
+        return real_query(**kwargs)
+
+    monkeypatch.setattr(db._table, "query", counting_query)
+    return calls
+
+
+def make_exercise(name: str) -> Exercise:
+    return Exercise.model_validate({"name": name})
+
+
+class TestCatalogCache:
+
+    def test_lru_eviction(self):
+        cache = catalog_cache_module.CatalogCache(ttl=60, max_objects=3)
+        cache.put("a", ObjectType.TAG, [make_exercise("1"), make_exercise("2")], 1)
+        cache.put("b", ObjectType.TAG, [make_exercise("3")], 1)
+
+        assert cache.get("a", ObjectType.TAG) is not None
+
+        cache.put("c", ObjectType.TAG, [make_exercise("4")], 1)
+
+        assert cache.get("b", ObjectType.TAG) is None
+        assert cache.get("a", ObjectType.TAG) is not None
+        assert cache.get("c", ObjectType.TAG) is not None
+
+    def test_ttl_expiry(self):
+        cache = catalog_cache_module.CatalogCache(ttl=0.01, max_objects=10)
+        cache.put("a", ObjectType.TAG, [make_exercise("1")], 1)
+        time.sleep(0.02)
+
+        assert cache.get("a", ObjectType.TAG) is None
+
+    def test_oversized_partition_not_cached(self):
+        cache = catalog_cache_module.CatalogCache(ttl=60, max_objects=1)
+        cache.put("a", ObjectType.TAG, [make_exercise("1"), make_exercise("2")], 1)
+
+        assert cache.get("a", ObjectType.TAG) is None
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources", "enable_cache")
+class TestCachedGetList:
+
+    def test_repeat_list_served_from_cache(self, mock_user, query_calls):
+        RestProcesses.post(Exercise, mock_user, make_exercise("Squat"))
+
+        first = RestProcesses.get_list(Exercise, mock_user)
+        second = RestProcesses.get_list(Exercise, mock_user)
+
+        assert [exercise.name for exercise in second] == ["Squat"]
+        assert first == second
+        assert len(query_calls) == 1
+
+    def test_local_write_invalidates(self, mock_user, query_calls):
+        RestProcesses.get_list(Exercise, mock_user)
+        RestProcesses.post(Exercise, mock_user, make_exercise("Bench"))
+
+        results = RestProcesses.get_list(Exercise, mock_user)
+
+        assert [exercise.name for exercise in results] == ["Bench"]
+        assert len(query_calls) == 2
+
+    def test_other_container_write_detected(self, mock_user, query_calls):
+        RestProcesses.get_list(Exercise, mock_user)
+
+        # Another container writes, bumping the stored version
+        catalog_cache_module.bump_partition_version(MOCK_USER_ID, ObjectType.EXERCISE)
+        RestProcesses.get_list(Exercise, mock_user)
+
+        assert len(query_calls) == 2
+
+    def test_uncached_types_always_query(self, mock_user, query_calls):
+        RestProcesses.get_list(Set, mock_user)
+        RestProcesses.get_list(Set, mock_user)
+
+        assert len(query_calls) == 2
+
+    def test_writes_counted_while_disabled(self, mock_user, monkeypatch):
+        monkeypatch.delenv(catalog_cache_module.CACHE_ENABLED_ENV_VAR)
+        RestProcesses.post(Exercise, mock_user, make_exercise("Deadlift"))
+        monkeypatch.setenv(catalog_cache_module.CACHE_ENABLED_ENV_VAR, "true")
+
+        # Another warm container still holds the partition from before the write
+        catalog_cache_module.cache_partition(Exercise, MOCK_USER_ID, [], 0)
+
+        results = RestProcesses.get_list(Exercise, mock_user)
+
+        assert [exercise.name for exercise in results] == ["Deadlift"]
+
+    def test_version_read_is_consistent(self, monkeypatch):
+        db = get_db_instance()
+        calls = []
+        real_get_item = db._table.get_item
+
+        def recording_get_item(**kwargs):
+            calls.append(kwargs)
+            return real_get_item(**kwargs)
+
+        monkeypatch.setattr(db._table, "get_item", recording_get_item)
+
+        catalog_cache_module.get_partition_version(MOCK_USER_ID, ObjectType.EXERCISE)
+
+        assert calls[0]["ConsistentRead"] is True
@@ -0,0 +1,89 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from hard.app import compression
+from hard.app.compression import CompressionMiddleware, accepts_encoding
+from hard.app.responses import TimedORJSONResponse
+
+ITEMS = [{"index": index, "name": "Squat"} for index in range(100)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(default_response_class=TimedORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/items")
+    def list_items():
+        return ITEMS
+
+    @app.get("/tagged")
+    def tagged():
+        return TimedORJSONResponse(ITEMS, headers={"ETag": '"items"'})
+
+    @app.get("/small")
+    def small():
+        return {"name": "Squat"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 200, b"b" * 200]))
+
+    return TestClient(app)
+
+
+def test_accepts_encoding():
+    assert accepts_encoding("gzip, deflate, br", "br")
+    assert accepts_encoding("br;q=0.5, gzip", "br")
+    assert not accepts_encoding("gzip, br;q=0", "br")
+    assert not accepts_encoding("gzip", "br")
+
+
+def test_gzip_without_brotli(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    response = client.get("/items", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json() == ITEMS
+
+
+def test_etag_of_encoded_body(client):
+    response = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["ETag"] == '"items-gzip"'
+
+
+class TestBrotli:
+
+    @pytest.fixture(autouse=True)
+    def brotli_installed(self):
+        pytest.importorskip("brotli")
+
+    def test_compressed(self, client):
+        response = client.get("/items", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["Content-Encoding"] == "br"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < len(response.content)
+        assert response.json() == ITEMS
+
+    def test_streamed(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["Content-Encoding"] == "br"
+        assert "content-length" not in response.headers
+        assert response.content == b"a" * 200 + b"b" * 200
+
+    def test_etag_of_encoded_body(self, client):
+        response = client.get("/tagged", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["ETag"] == '"items-br"'
+
+    def test_small_uncompressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"name": "Squat"}
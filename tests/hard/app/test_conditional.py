@@ -0,0 +1,205 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from hard.app import catalog_cache, conditional
+from hard.app.catalog_cache import CACHE_ENABLED_ENV_VAR
+from hard.app.compression import CompressionMiddleware
+from hard.app.conditional import versioned_list_response
+from hard.app.etag import ETagMiddleware, etag_matches
+from hard.app.processes import AsyncRestProcesses, RestProcesses
+from hard.app.responses import TimedORJSONResponse
+from hard.models.exercise import Exercise
+
+ITEMS = [{"index": index, "name": "Squat"} for index in range(100)]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(default_response_class=TimedORJSONResponse)
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/items")
+    def list_items():
+        return ITEMS
+
+    @app.post("/items")
+    def create_item():
+        return ITEMS[0]
+
+    @app.get("/missing")
+    def missing():
+        return TimedORJSONResponse({"detail": "Not Found"}, status_code=404)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b"]))
+
+    return TestClient(app)
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+    assert etag_matches('"b-gzip"', '"b"')
+    assert etag_matches('W/"b-br"', '"b"')
+    assert not etag_matches('"b-deflate"', '"b"')
+
+
+class TestETagMiddleware:
+
+    def test_not_modified(self, client):
+        response = client.get("/items")
+        etag = response.headers["ETag"]
+
+        assert response.json() == ITEMS
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+        cached = client.get("/items", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+        assert "content-length" not in cached.headers
+
+    def test_changed(self, client):
+        response = client.get("/items", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.json() == ITEMS
+
+    def test_etag_per_encoding(self, client):
+        plain = client.get("/items", headers={"Accept-Encoding": "identity"})
+        compressed = client.get("/items", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in plain.headers
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+        for encoding, response in (("identity", plain), ("gzip", compressed)):
+            etag = response.headers["ETag"]
+            cached = client.get(
+                "/items",
+                headers={"Accept-Encoding": encoding, "If-None-Match": etag},
+            )
+
+            assert cached.status_code == 304
+            assert cached.headers["ETag"] == etag
+
+    @pytest.mark.parametrize(
+        "method, path", [("POST", "/items"), ("GET", "/missing"), ("GET", "/stream")]
+    )
+    def test_untagged(self, client, method, path):
+        response = client.request(method, path)
+
+        assert "etag" not in response.headers
+
+
+@pytest.fixture
+def catalog_client(
+    env_vars, set_up_aws_resources, mock_user, monkeypatch
+) -> TestClient:
+    monkeypatch.setenv(CACHE_ENABLED_ENV_VAR, "true")
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+
+    @app.get("/exercises")
+    async def list_exercises(req: Request, user_id: str = mock_user.id):
+        return await versioned_list_response(
+            req, Exercise, mock_user.model_copy(update={"id": user_id})
+        )
+
+    return TestClient(app)
+
+
+def post_exercise(user, name: str) -> Exercise:
+    return RestProcesses.post(Exercise, user, Exercise.model_validate({"name": name}))
+
+
+class TestVersionedListResponse:
+
+    def test_not_modified_without_query(self, catalog_client, mock_user, monkeypatch):
+        post_exercise(mock_user, "Squat")
+        etag = catalog_client.get("/exercises").headers["ETag"]
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("Partition queried")
+
+        monkeypatch.setattr(AsyncRestProcesses, "get_list", fail)
+
+        response = catalog_client.get("/exercises", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    def test_writes_change_the_etag(self, catalog_client, mock_user):
+        post_exercise(mock_user, "Squat")
+        etag = catalog_client.get("/exercises").headers["ETag"]
+
+        post_exercise(mock_user, "Bench")
+        response = catalog_client.get("/exercises", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert sorted(item["name"] for item in response.json()) == ["Bench", "Squat"]
+
+    def test_etag_per_user(self, catalog_client, mock_user, fake_user):
+        post_exercise(mock_user, "Squat")
+        post_exercise(fake_user, "Squat")
+
+        mine, theirs = (
+            catalog_client.get("/exercises", params={"user_id": user.id})
+            for user in (mock_user, fake_user)
+        )
+
+        assert mine.headers["ETag"] != theirs.headers["ETag"]
+
+    def test_etag_from_version(self, mock_user, catalog_client, monkeypatch):
+        monkeypatch.setattr(conditional, "get_partition_version", lambda *args: 7)
+
+        etag = catalog_client.get("/exercises").headers["ETag"]
+
+        assert etag.startswith('"Exercise-7-')
+
+    def test_version_etag_without_catalog_cache(
+        self, catalog_client, mock_user, monkeypatch
+    ):
+        monkeypatch.delenv(CACHE_ENABLED_ENV_VAR)
+        post_exercise(mock_user, "Squat")
+        etag = catalog_client.get("/exercises").headers["ETag"]
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("Partition queried")
+
+        monkeypatch.setattr(AsyncRestProcesses, "get_list", fail)
+
+        response = catalog_client.get("/exercises", headers={"If-None-Match": etag})
+
+        assert etag.startswith('"Exercise-1-')
+        assert response.status_code == 304
+
+    def test_body_not_hashed(self, catalog_client, mock_user, monkeypatch):
+        post_exercise(mock_user, "Squat")
+        version_reads = []
+        get_partition_version = conditional.get_partition_version
+
+        def counting_version(*args):
+            version_reads.append(args)
+            return get_partition_version(*args)
+
+        def fail(body):
+            raise AssertionError("Body hashed")
+
+        monkeypatch.setattr("hard.app.etag.content_etag", fail)
+        monkeypatch.setattr(catalog_cache, "get_partition_version", counting_version)
+        monkeypatch.setattr(conditional, "get_partition_version", counting_version)
+
+        response = catalog_client.get("/exercises")
+
+        assert response.status_code == 200
+        assert len(version_reads) == 1
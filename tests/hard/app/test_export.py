@@ -0,0 +1,165 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import pytest
+
+from hard.app import export
+from hard.app.export import CSV_COLUMNS, ExportFormat, export_chunks
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.tag import Tag
+from hard.models.workout import Workout
+
+MONDAY = date(2024, 5, 6)
+NEXT_MONDAY = date(2024, 5, 13)
+
+
+@pytest.fixture
+def history(set_up_aws_resources, mock_user, fake_user) -> dict[str, list]:
+    """Two exercises over two workouts, the later workout logged first"""
+    squat = Exercise.model_validate({"name": "Squat"})
+    bench = Exercise.model_validate({"name": "Bench"})
+    tag = Tag.model_validate({"name": "Legs", "color_hex": "#00ff00"})
+    for data_object, object_type in (
+        (squat, ObjectType.EXERCISE),
+        (bench, ObjectType.EXERCISE),
+        (tag, ObjectType.TAG),
+    ):
+        data_object.init_from_request(mock_user, object_type)
+
+    objects = {"exercises": [squat, bench], "workouts": [], "sets": []}
+    to_write = [squat, bench, tag]
+    for workout_date, title in ((NEXT_MONDAY, "Heavy"), (MONDAY, "")):
+        workout = Workout.model_validate(
+            {"workout_date": workout_date.isoformat(), "notes": "", "title": title}
+        )
+        workout.init_from_request(mock_user, ObjectType.WORKOUT)
+        objects["workouts"].append(workout)
+        to_write.append(workout)
+
+        for exercise in (squat, bench):
+            join = ExerciseJoin.model_validate(
+                {"workout_id": workout.object_id, "exercise_id": exercise.object_id}
+            )
+            join.init_from_request(mock_user, ObjectType.EXCERCISE_JOIN)
+            to_write.append(join)
+
+            for weight in (60, 100):
+                set = Set.model_validate(
+                    {
+                        "set_type": SetType.WORKING.value,
+                        "weight": weight,
+                        "unit": WeightUnit.KILOGRAMS.value,
+                        "reps": 5,
+                        "notes": "felt, good",
+                        "exercise_join_id": str(join.object_id),
+                    }
+                )
+                set.init_from_request(mock_user, ObjectType.SET)
+                objects["sets"].append(set)
+                to_write.append(set)
+
+    other = Exercise.model_validate({"name": "Not mine"})
+    other.init_from_request(fake_user, ObjectType.EXERCISE)
+
+    get_db_instance().batch_write(put_objects=[*to_write, other])
+    objects["written"] = to_write
+
+    return objects
+
+
+def read_export(user, export_format: ExportFormat) -> str:
+    return gzip.decompress(b"".join(export_chunks(user, export_format))).decode()
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestNDJSONExport:
+
+    def test_every_object(self, mock_user, history):
+        lines = read_export(mock_user, ExportFormat.NDJSON).splitlines()
+
+        exported = [json.loads(line) for line in lines]
+        assert sorted(item["object_id"] for item in exported) == sorted(
+            str(data_object.object_id) for data_object in history["written"]
+        )
+        assert {item["user_id"] for item in exported} == {mock_user.id}
+
+    def test_objects_match_the_api(self, mock_user, history):
+        lines = read_export(mock_user, ExportFormat.NDJSON).splitlines()
+
+        sets = [Set.model_validate_json(line) for line in lines if '"Set"' in line]
+        assert sorted(sets, key=lambda set: set.timestamp) == history["sets"]
+
+    def test_small_chunks(self, mock_user, history, monkeypatch):
+        expected = read_export(mock_user, ExportFormat.NDJSON)
+        monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 1)
+
+        chunks = list(export_chunks(mock_user, ExportFormat.NDJSON, compress=False))
+
+        assert len(chunks) == len(history["written"])
+        assert b"".join(chunks).decode() == expected
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestCSVExport:
+
+    def test_rows(self, mock_user, history):
+        rows = list(
+            csv.DictReader(io.StringIO(read_export(mock_user, ExportFormat.CSV)))
+        )
+
+        assert len(rows) == len(history["sets"])
+        assert [
+            (row["workout_date"], row["workout_title"], row["exercise"], row["weight"])
+            for row in rows[:4]
+        ] == [
+            (MONDAY.isoformat(), "", "Squat", "60.0"),
+            (MONDAY.isoformat(), "", "Squat", "100.0"),
+            (MONDAY.isoformat(), "", "Bench", "60.0"),
+            (MONDAY.isoformat(), "", "Bench", "100.0"),
+        ]
+        assert (rows[-1]["workout_date"], rows[-1]["workout_title"]) == (
+            NEXT_MONDAY.isoformat(),
+            "Heavy",
+        )
+        assert rows[0]["notes"] == "felt, good"
+        assert {row["set_id"] for row in rows} == {
+            str(set.object_id) for set in history["sets"]
+        }
+
+    def test_small_batches(self, mock_user, history, monkeypatch):
+        expected = read_export(mock_user, ExportFormat.CSV)
+        monkeypatch.setattr(export, "EXPORT_CHUNK_SIZE", 3)
+        monkeypatch.setattr(export, "EXPORT_WORKOUT_BATCH_SIZE", 1)
+
+        assert read_export(mock_user, ExportFormat.CSV) == expected
+
+    def test_header_only_without_sets(self, mock_user, set_up_aws_resources):
+        text = read_export(mock_user, ExportFormat.CSV)
+
+        assert text.splitlines() == [",".join(CSV_COLUMNS)]
+
+
+class TestExportRoute:
+
+    @pytest.mark.parametrize(
+        "accept_encoding, content_encoding",
+        [("gzip, br", "gzip"), ("gzip;q=0", None), ("", None)],
+    )
+    def test_negotiates_gzip(
+        self, api_client, history, accept_encoding, content_encoding
+    ):
+        response = api_client.get(
+            "/api/export", headers={"Accept-Encoding": accept_encoding}
+        )
+
+        assert response.status_code == 200
+        assert response.headers.get("Content-Encoding") == content_encoding
+        assert len(response.text.splitlines()) == len(history["written"])
@@ -0,0 +1,206 @@
+import asyncio
+import csv
+import gzip
+import io
+import logging
+from datetime import date
+
+import pytest
+
+from hard.app import aggregates, importer
+from hard.app.export import ExportFormat, export_chunks
+from hard.app.importer import (
+    ImportFormat,
+    InvalidImportError,
+    import_lines,
+    import_stream,
+    iter_lines,
+)
+from hard.app.processes import RestProcesses
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+MONDAY = date(2024, 5, 6)
+
+CSV_IMPORT = """workout_date,workout_title,exercise,set_type,weight,unit,reps,notes
+2024-05-06,Legs,Squat,warmup,60,kg,5,
+2024-05-06,Legs,Squat,working,100,kg,5,"easy, fast"
+2024-05-06,Legs,squat ,working,105,kg,3,
+2024-05-06,Legs,Leg Press,working,200,lbs,10,
+2024-05-08,,Squat,working,110,kg,2,
+"""
+
+
+def lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+@pytest.fixture(autouse=True)
+def no_aggregate_errors(caplog):
+    yield
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestImportLines:
+
+    def test_csv(self, mock_user):
+        summary = import_lines(mock_user, lines(CSV_IMPORT), ImportFormat.CSV)
+
+        assert summary.model_dump(exclude={"errors"}) == {
+            "rows": 5,
+            "workouts": 2,
+            "exercises": 2,
+            "exercise_joins": 3,
+            "sets": 5,
+            "error_count": 0,
+        }
+
+        workouts = sorted(
+            RestProcesses.get_list(Workout, mock_user), key=lambda w: w.workout_date
+        )
+        assert [(w.workout_date, w.title) for w in workouts] == [
+            (MONDAY, "Legs"),
+            (date(2024, 5, 8), ""),
+        ]
+        assert sorted(e.name for e in RestProcesses.get_list(Exercise, mock_user)) == [
+            "Leg Press",
+            "Squat",
+        ]
+
+        sets = RestProcesses.get_list(Set, mock_user)
+        assert [(s.set_type, s.weight, s.unit, s.notes) for s in sets[:2]] == [
+            (SetType.WARMUP, 60, WeightUnit.KILOGRAMS, ""),
+            (SetType.WORKING, 100, WeightUnit.KILOGRAMS, "easy, fast"),
+        ]
+        assert len({s.exercise_join_id for s in sets}) == 3
+
+    def test_matches_existing_exercises_by_name(self, mock_user):
+        existing = RestProcesses.post(
+            Exercise, mock_user, Exercise.model_validate({"name": "SQUAT"})
+        )
+
+        summary = import_lines(mock_user, lines(CSV_IMPORT), ImportFormat.CSV)
+
+        assert summary.exercises == 1
+        joins = RestProcesses.get_list(ExerciseJoin, mock_user)
+        assert sum(join.exercise_id == existing.object_id for join in joins) == 2
+
+    def test_other_trackers_columns(self, mock_user):
+        text = (
+            "Date,Workout Name,Exercise Name,Set Order,Weight (kg),Reps\n"
+            "2024-05-06 18:30:00,Evening,Deadlift,1,140,5\n"
+            "2024-05-06 18:30:00,Evening,Pull Up,2,,8\n"
+        )
+
+        summary = import_lines(mock_user, lines(text), ImportFormat.CSV)
+
+        assert (summary.workouts, summary.sets, summary.error_count) == (1, 2, 0)
+        (workout,) = RestProcesses.get_list(Workout, mock_user)
+        assert (workout.workout_date, workout.title) == (MONDAY, "Evening")
+        assert sorted(s.weight for s in RestProcesses.get_list(Set, mock_user)) == [
+            0,
+            140,
+        ]
+
+    def test_row_errors(self, mock_user, monkeypatch):
+        monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 2)
+        monkeypatch.setattr(importer, "IMPORT_MAX_REPORTED_ERRORS", 2)
+        text = (
+            "workout_date,exercise,weight,reps\n"
+            "2024-05-06,Squat,100,5\n"
+            "not a date,Squat,100,5\n"
+            "2024-05-06,,100,-1\n"
+            "2024-05-06,Squat,heavy,5\n"
+            "2024-05-06,Squat,100,5\n"
+        )
+
+        summary = import_lines(mock_user, lines(text), ImportFormat.CSV)
+
+        assert (summary.rows, summary.sets, summary.error_count) == (5, 2, 3)
+        assert [error.row for error in summary.errors] == [2, 3]
+        assert summary.errors[0].detail.startswith("workout_date: ")
+        assert "exercise: " in summary.errors[1].detail
+        assert "reps: " in summary.errors[1].detail
+
+    def test_missing_columns(self, mock_user):
+        with pytest.raises(InvalidImportError, match="exercise, reps"):
+            import_lines(mock_user, lines("workout_date,weight\n"), ImportFormat.CSV)
+
+    def test_ndjson(self, mock_user):
+        text = (
+            '{"workout_date": "2024-05-06", "exercise": "Squat", "weight": 100, "reps": 5}\n'
+            "\n"
+            "not json\n"
+            "[1, 2]\n"
+            '{"workout_date": "2024-05-06", "exercise": "Squat", "reps": 5, "unit": "lbs"}\n'
+        )
+
+        summary = import_lines(mock_user, lines(text), ImportFormat.NDJSON)
+
+        assert (summary.rows, summary.sets, summary.exercise_joins) == (4, 2, 1)
+        assert [(error.row, error.detail) for error in summary.errors] == [
+            (2, "Row is not a JSON object"),
+            (3, "Row is not a JSON object"),
+        ]
+
+    def test_updates_aggregates(self, mock_user, monkeypatch):
+        monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 2)
+        import_lines(mock_user, lines(CSV_IMPORT), ImportFormat.CSV)
+        # A second import adds to the aggregates the first one wrote
+        import_lines(mock_user, lines(CSV_IMPORT), ImportFormat.CSV)
+
+        names = {
+            str(exercise.object_id): exercise.name
+            for exercise in RestProcesses.get_list(Exercise, mock_user)
+        }
+        incremental = aggregates.summarize(aggregates.aggregate_items(mock_user), names)
+        aggregates.rebuild_user(mock_user)
+        rebuilt = aggregates.summarize(aggregates.aggregate_items(mock_user), names)
+
+        assert incremental == rebuilt
+        assert incremental.set_count == 8
+
+    def test_export_round_trip(self, mock_user, fake_user):
+        import_lines(mock_user, lines(CSV_IMPORT), ImportFormat.CSV)
+        exported = gzip.decompress(
+            b"".join(export_chunks(mock_user, ExportFormat.CSV))
+        ).decode()
+
+        summary = import_lines(fake_user, lines(exported), ImportFormat.CSV)
+
+        assert (summary.workouts, summary.exercises, summary.sets) == (2, 2, 5)
+        reexported = gzip.decompress(
+            b"".join(export_chunks(fake_user, ExportFormat.CSV))
+        ).decode()
+
+        def without_ids(text: str) -> list[list[str]]:
+            return [row[:8] for row in csv.reader(io.StringIO(text))]
+
+        assert without_ids(reexported) == without_ids(exported)
+
+
+def test_iter_lines():
+    chunks = ["a,b\n1,", '"x\ny"\n', "\n2,3"]
+
+    assert list(iter_lines(chunks)) == ["a,b\n", '1,"x\n', 'y"\n', "\n", "2,3"]
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+def test_import_stream(mock_user):
+    body = CSV_IMPORT.replace("easy, fast", "très facile").encode()
+
+    async def upload():
+        # A byte at a time, splitting lines and characters
+        for start in range(len(body)):
+            yield body[start : start + 1]
+            await asyncio.sleep(0)
+
+    summary = asyncio.run(import_stream(mock_user, upload(), ImportFormat.CSV))
+
+    assert (summary.rows, summary.sets, summary.error_count) == (5, 5, 0)
+    stored_notes = [s.notes for s in RestProcesses.get_list(Set, mock_user)]
+    assert "très facile" in stored_notes
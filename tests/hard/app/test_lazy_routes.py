@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+from importlib import import_module
+
+import pytest
+from fastapi import FastAPI
+
+from hard.app.lazy_routes import LAZY_ROUTERS_ENV_VAR, LazyRouters
+from hard.app.main import API_PREFIX, ROUTER_MODULES
+
+IMPORTED_MODULES = """
+import json, sys
+import hard.app.main
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def route_paths(app: FastAPI) -> set[str]:
+    return {route.path for route in app.routes}
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    return FastAPI()
+
+
+class TestLazyRouters:
+
+    @pytest.mark.parametrize("prefix, module", ROUTER_MODULES.items())
+    def test_prefix_matches_router(self, prefix, module):
+        assert API_PREFIX + import_module(module).router.prefix == prefix
+
+    def test_load_only_includes_matching_router(self, app):
+        routers = LazyRouters(app, ROUTER_MODULES, prefix=API_PREFIX)
+
+        routers.load("/api/sets/3fa85f64-5717-4562-b3fc-2c963f66afa6")
+
+        paths = route_paths(app)
+        assert "/api/sets/{set_id}" in paths
+        assert not any(path.startswith("/api/workouts") for path in paths)
+
+    def test_load_matches_custom_methods(self, app):
+        routers = LazyRouters(app, ROUTER_MODULES, prefix=API_PREFIX)
+
+        routers.load("/api/sets:batch")
+
+        assert "/api/sets:batch" in route_paths(app)
+        assert "/api/tags" not in route_paths(app)
+
+    def test_load_does_not_match_longer_prefix(self, app):
+        routers = LazyRouters(app, ROUTER_MODULES, prefix=API_PREFIX)
+
+        routers.load("/api/tag-joins")
+
+        assert "/api/tag-joins" in route_paths(app)
+        assert "/api/tags" not in route_paths(app)
+
+    def test_unknown_path_loads_everything(self, app):
+        routers = LazyRouters(app, ROUTER_MODULES, prefix=API_PREFIX)
+
+        routers.load("/openapi.json")
+
+        paths = route_paths(app)
+        for prefix in ROUTER_MODULES:
+            assert any(path.startswith(prefix) for path in paths)
+
+    def test_routers_are_included_once(self, app):
+        routers = LazyRouters(app, ROUTER_MODULES, prefix=API_PREFIX)
+
+        routers.load("/api/sets")
+        routers.load("/api/sets")
+        routers.load_all()
+
+        expected = FastAPI()
+        LazyRouters(expected, ROUTER_MODULES, prefix=API_PREFIX).load_all()
+        assert len(app.routes) == len(expected.routes)
+
+    def test_cold_start_imports(self):
+        # A fresh interpreter, so only the imports of `main` itself are seen
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORTED_MODULES],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={**os.environ, LAZY_ROUTERS_ENV_VAR: "true"},
+        ).stdout
+        modules = set(json.loads(output))
+
+        assert "boto3" not in modules
+        assert not any(module.startswith("hard.models") for module in modules)
+        assert not set(ROUTER_MODULES.values()) & modules
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+ROOT = Path(__file__).parents[3]
+REQUIREMENTS = ROOT / "requirements.txt"
+LAMBDA_REQUIREMENTS = ROOT / "lambda-requirements.txt"
+
+# Every distribution `hard.app.main` (and the routers it loads) needs at
+# runtime, directly or through another; the Lambda layer installs nothing else
+RUNTIME_DISTRIBUTIONS = {
+    "annotated-types",
+    "anyio",
+    "boto3",
+    "botocore",
+    "brotli",
+    "dnspython",
+    "email-validator",
+    "fastapi",
+    "idna",
+    "itsdangerous",
+    "jmespath",
+    "mangum",
+    "orjson",
+    "pydantic",
+    "pydantic-core",
+    "python-dateutil",
+    "s3transfer",
+    "six",
+    "sniffio",
+    "starlette",
+    "typing-extensions",
+    "urllib3",
+}
+
+
+def pins(path: Path) -> dict[str, str]:
+    """`{distribution: version}` for each pinned line of a requirements file"""
+    return {
+        name.strip().lower().replace("_", "-"): version.strip()
+        for name, _, version in (
+            line.partition("==")
+            for line in path.read_text().splitlines()
+            if "==" in line and not line.startswith("#")
+        )
+    }
+
+
+class TestLambdaRequirements:
+
+    def test_runtime_distributions_are_pinned(self):
+        assert RUNTIME_DISTRIBUTIONS <= pins(LAMBDA_REQUIREMENTS).keys()
+
+    def test_pins_match_requirements(self):
+        lambda_pins = pins(LAMBDA_REQUIREMENTS)
+        requirement_pins = pins(REQUIREMENTS)
+
+        assert {name: requirement_pins.get(name) for name in lambda_pins} == lambda_pins
+
+
+class TestWorkoutRoutes:
+
+    def test_put_without_timestamp(self, api_client):
+        created = api_client.post(
+            "/api/workouts",
+            json={"workout_date": "2024-05-06", "notes": "", "title": "Legs"},
+        ).json()
+        body = {key: value for key, value in created.items() if key != "timestamp"}
+
+        response = api_client.put(f"/api/workouts/{created['object_id']}", json=body)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            "Cannot Modify `timestamp` Attribute on `Workout`"
+        )
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from hard.app.metrics import (
+    EMF_ENABLED_ENV_VAR,
+    EMF_METRICS,
+    RequestMetricsMiddleware,
+)
+from hard.app.responses import TimedORJSONResponse
+from hard.app.unit_of_work import unit_of_work_scope
+from hard.aws.dynamodb.consts import DB_PARTITION, DB_SORT_KEY
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.models.exercise import Exercise
+
+
+@pytest.fixture
+def client(env_vars, set_up_aws_resources) -> TestClient:
+    app = FastAPI(default_response_class=TimedORJSONResponse)
+    app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/items/{key}")
+    def get_item(key: str):
+        db = get_db_instance()
+        db.get_item({DB_PARTITION: key, DB_SORT_KEY: key})
+        db.get_item({DB_PARTITION: key, DB_SORT_KEY: key})
+        return {"key": key}
+
+    @app.get("/cached/{key}")
+    def get_cached(key: str):
+        with unit_of_work_scope() as current:
+            for _ in range(3):
+                if current.get_partition(Exercise, key) is None:
+                    current.add_partition(Exercise, key, [])
+        return {"key": key}
+
+    return TestClient(app)
+
+
+def server_timing(header: str) -> dict[str, str]:
+    return {
+        metric.split(";")[0]: metric.split(";", 1)[1]
+        for metric in header.split(", ")
+        if ";" in metric
+    }
+
+
+class TestRequestMetricsMiddleware:
+
+    def test_server_timing_header(self, client, capsys):
+        response = client.get("/items/mock")
+
+        assert response.status_code == 200
+        timings = server_timing(response.headers["Server-Timing"])
+        assert set(timings) == {"total", "db", "serialize", "cache"}
+        assert 'desc="2 calls' in timings["db"]
+        assert 'desc="0 hits' in timings["cache"]
+        assert capsys.readouterr().out == ""
+
+    def test_emf_record(self, client, capsys, monkeypatch):
+        monkeypatch.setenv(EMF_ENABLED_ENV_VAR, "true")
+
+        client.get("/items/mock")
+
+        record = json.loads(capsys.readouterr().out)
+        metric_names = [
+            metric["Name"]
+            for metric in record["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+        ]
+        assert metric_names == list(EMF_METRICS)
+        assert record["Route"] == "/items/{key}"
+        assert record["Method"] == "GET"
+        assert record["StatusCode"] == 200
+        assert record["DynamoDBCalls"] == 2
+        assert record["SerializationDuration"] > 0
+
+    def test_unit_of_work_lookups(self, client, capsys, monkeypatch):
+        monkeypatch.setenv(EMF_ENABLED_ENV_VAR, "true")
+
+        response = client.get("/cached/mock")
+
+        timings = server_timing(response.headers["Server-Timing"])
+        assert 'desc="2 hits' in timings["cache"]
+        assert '1 misses"' in response.headers["Server-Timing"]
+        record = json.loads(capsys.readouterr().out)
+        assert record["UnitOfWorkHits"] == 2
+        assert record["UnitOfWorkMisses"] == 1
+
+    def test_unmatched_route(self, client, capsys, monkeypatch):
+        monkeypatch.setenv(EMF_ENABLED_ENV_VAR, "true")
+
+        response = client.get("/missing")
+
+        record = json.loads(capsys.readouterr().out)
+        assert response.status_code == 404
+        assert record["Route"] == "UNMATCHED"
+        assert record["StatusCode"] == 404
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import boto3
+import pytest
+
+from hard.app import migrations
+from hard.app import sync as sync_module
+from hard.app.processes import RestProcesses, exercise_join_filter
+from hard.app.sync import get_changes
+from hard.aws.dynamodb.base_object import format_modified_at
+from hard.aws.dynamodb.consts import (
+    ADJACENCY_INDEXES_ENV_VAR,
+    ALT_PARENT_INDEX_PARTITION,
+    PARENT_INDEX_PARTITION,
+    PARENT_INDEX_SORT_KEY,
+    SYNC_INDEX_PARTITION,
+    SYNC_INDEX_SORT_KEY,
+)
+from hard.aws.dynamodb.handler import get_db_instance
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.exercise import Exercise
+from hard.models.exercise_join import ExerciseJoin
+
+from ...conftest import MOCK_DYNAMO_TABLE_NAME
+
+
+PARENT_KEYS = (
+    PARENT_INDEX_PARTITION,
+    ALT_PARENT_INDEX_PARTITION,
+    PARENT_INDEX_SORT_KEY,
+)
+SYNC_KEYS = (SYNC_INDEX_PARTITION, SYNC_INDEX_SORT_KEY)
+
+
+def store_legacy_join(user, missing: tuple[str, ...]) -> ExerciseJoin:
+    """Stores an `ExerciseJoin` as it was before the `missing` keys were written"""
+    join = ExerciseJoin.model_validate({"workout_id": uuid4(), "exercise_id": uuid4()})
+    join.init_from_request(user, ObjectType.EXCERCISE_JOIN)
+
+    item = join.to_db()
+    for attr in missing:
+        item.pop(attr)
+    boto3.resource("dynamodb").Table(MOCK_DYNAMO_TABLE_NAME).put_item(Item=item)
+
+    return join
+
+
+def stored_item(data_object) -> dict:
+    return get_db_instance().get_item(data_object.primary_key())
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestBackfill:
+
+    @pytest.fixture
+    def legacy_join(self, mock_user) -> ExerciseJoin:
+        return store_legacy_join(mock_user, PARENT_KEYS + SYNC_KEYS)
+
+    def test_backfill(self, mock_user, legacy_join):
+        assert exercise_join_filter(mock_user, workout_id=legacy_join.workout_id) == []
+
+        assert migrations.backfill_parent_keys() == 1
+
+        joins = exercise_join_filter(mock_user, workout_id=legacy_join.workout_id)
+        assert [join.object_id for join in joins] == [legacy_join.object_id]
+
+    def test_found_without_adjacency_indexes(self, mock_user, legacy_join, monkeypatch):
+        monkeypatch.setenv(ADJACENCY_INDEXES_ENV_VAR, "false")
+
+        for joins in (
+            exercise_join_filter(mock_user, workout_id=legacy_join.workout_id),
+            exercise_join_filter(mock_user, exercise_id=legacy_join.exercise_id),
+            exercise_join_filter(
+                mock_user,
+                workout_id=legacy_join.workout_id,
+                exercise_id=legacy_join.exercise_id,
+            ),
+        ):
+            assert [join.object_id for join in joins] == [legacy_join.object_id]
+
+        assert exercise_join_filter(mock_user, workout_id=uuid4()) == []
+
+    def test_backfill_sync_keys(self, mock_user, legacy_join, monkeypatch):
+        monkeypatch.setattr(sync_module, "WATERMARK_LAG", timedelta(0))
+        assert get_changes(mock_user).changes == []
+
+        assert migrations.backfill_sync_keys() == 1
+
+        changes = get_changes(mock_user).changes
+        assert [change.object_id for change in changes] == [legacy_join.object_id]
+
+    def test_rerun_and_unrelated_items_skipped(self, mock_user, legacy_join):
+        exercise = Exercise.model_validate({"name": "Squat"})
+        exercise.init_from_request(mock_user, ObjectType.EXERCISE)
+        get_db_instance().put(exercise)
+
+        assert migrations.backfill_parent_keys() == 1
+        assert migrations.backfill_parent_keys() == 0
+
+    def test_write_since_scan_kept(self, mock_user, legacy_join, monkeypatch):
+        db = get_db_instance()
+        scan_iter = db.scan_iter
+        moved = legacy_join.model_copy(update={"exercise_id": uuid4()})
+
+        def scan_then_write(**kwargs):
+            for item in scan_iter(**kwargs):
+                # The user moves the join after the scan has read it
+                RestProcesses.put(ExerciseJoin, mock_user, moved.model_copy())
+                yield item
+
+        monkeypatch.setattr(db, "scan_iter", scan_then_write)
+
+        assert migrations.backfill_parent_keys() == 0
+
+        joins = exercise_join_filter(mock_user, exercise_id=moved.exercise_id)
+        assert [join.object_id for join in joins] == [legacy_join.object_id]
+        assert (
+            exercise_join_filter(mock_user, exercise_id=legacy_join.exercise_id) == []
+        )
+
+    def test_modified_at_not_restamped(self, mock_user):
+        join = store_legacy_join(mock_user, PARENT_KEYS)
+        modified_at = stored_item(join)[SYNC_INDEX_SORT_KEY]
+
+        assert migrations.backfill_parent_keys() == 1
+        assert migrations.backfill_sync_keys() == 0
+
+        assert stored_item(join)[SYNC_INDEX_SORT_KEY] == modified_at
+
+    def test_sync_keys_from_creation(self, mock_user, legacy_join):
+        migrations.backfill_sync_keys()
+
+        item = stored_item(legacy_join)
+        assert item[SYNC_INDEX_PARTITION] == mock_user.id
+        assert item[SYNC_INDEX_SORT_KEY] == format_modified_at(legacy_join.timestamp)
+        # Only the missing attributes are written
+        assert PARENT_INDEX_SORT_KEY not in item
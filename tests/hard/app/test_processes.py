@@ -1,6 +1,7 @@
+import asyncio
 import re
 from copy import deepcopy
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Generator
 from uuid import uuid4
 
@@ -8,18 +9,26 @@ import boto3
 import pytest
 
 from hard.app import processes as processes_module
+from hard.app.pagination import InvalidCursorError, Page
+from hard.app.unit_of_work import UnitOfWork, unit_of_work_scope
 from hard.aws.dynamodb.base_object import BaseObject
 from hard.aws.dynamodb.consts import (
     DB_PARTITION,
     DB_SORT_KEY,
     DELIMITER,
+    WORKOUT_DATE_INDEX_ENV_VAR,
     InvalidAttributeChangeError,
     ItemAccessUnauthorizedError,
     ItemAlreadyExistsError,
     ItemNotFoundError,
 )
+from hard.aws.dynamodb.handler import get_db_instance
 from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.exercise import Exercise
 from hard.models.exercise_join import ExerciseJoin
+from hard.models.set import Set
+from hard.models.tag import Tag
 from hard.models.tag_join import TagJoin
 from hard.models.workout import Workout
 
@@ -41,6 +50,15 @@ MOCK_TABLE_ITEMS = [
 ]
 
 
+def scan_objects(client) -> list[dict]:
+    """Every stored object, leaving out deletion tombstones"""
+    return [
+        item
+        for item in client.scan(TableName=MOCK_DYNAMO_TABLE_NAME)["Items"]
+        if not item[DB_PARTITION]["S"].endswith(f"{DELIMITER}Tombstone")
+    ]
+
+
 @pytest.fixture
 def processes():
     return processes_module.RestProcesses()
@@ -83,6 +101,42 @@ def add_example_object_to_db(
     yield example_object
 
 
+@pytest.fixture
+def workout_graph(set_up_aws_resources, mock_user) -> dict[str, list[BaseObject]]:
+    workout = Workout.model_validate(
+        {"workout_date": "2024-05-06", "notes": "", "title": "Legs"}
+    )
+    workout.init_from_request(mock_user, ObjectType.WORKOUT)
+
+    joins = []
+    for _ in range(2):
+        join = ExerciseJoin.model_validate(
+            {"workout_id": workout.object_id, "exercise_id": uuid4()}
+        )
+        join.init_from_request(mock_user, ObjectType.EXCERCISE_JOIN)
+        joins.append(join)
+
+    sets = []
+    for join in joins:
+        for _ in range(15):
+            set = Set.model_validate(
+                {
+                    "set_type": SetType.WORKING.value,
+                    "weight": 100,
+                    "unit": WeightUnit.KILOGRAMS.value,
+                    "reps": 5,
+                    "notes": "",
+                    "exercise_join_id": str(join.object_id),
+                }
+            )
+            set.init_from_request(mock_user, ObjectType.SET)
+            sets.append(set)
+
+    get_db_instance().batch_write(put_objects=[workout, *joins, *sets])
+
+    return {"workout": [workout], "joins": joins, "sets": sets}
+
+
 @pytest.mark.dependency(name="CREATE")
 @pytest.mark.usefixtures("env_vars")
 class TestPost:
@@ -164,6 +218,75 @@ class TestGetList:
         assert len(results) == 0
 
 
+@pytest.mark.usefixtures("env_vars")
+class TestAsyncRestProcesses:
+
+    @pytest.mark.usefixtures("append_items_to_table")
+    def test_get_list_matches_sync(self, mock_user, processes):
+        results = asyncio.run(
+            processes_module.AsyncRestProcesses.get_list(BaseObject, mock_user)
+        )
+
+        assert results == processes.get_list(BaseObject, mock_user)
+
+    @pytest.mark.dependency(depends=["CREATE"])
+    def test_overlapping_calls(self, mock_user, add_example_object_to_db):
+        example_object = add_example_object_to_db
+
+        async def fetch_concurrently():
+            return await asyncio.gather(
+                processes_module.AsyncRestProcesses.get(
+                    BaseObject, mock_user, EXAMPLE_OBJECT_ID
+                ),
+                processes_module.AsyncRestProcesses.get_list(BaseObject, mock_user),
+            )
+
+        fetched, listed = asyncio.run(fetch_concurrently())
+
+        assert fetched.__dict__ == example_object.__dict__
+        assert listed == [fetched]
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestGetPage:
+
+    @pytest.mark.usefixtures("append_items_to_table")
+    def test_successfully_page_results(self, mock_user, processes):
+        first_page = processes.get_page(BaseObject, mock_user, limit=1)
+
+        assert isinstance(first_page, Page)
+        assert len(first_page.items) == 1
+        assert first_page.next_cursor is not None
+
+        second_page = processes.get_page(
+            BaseObject, mock_user, limit=1, cursor=first_page.next_cursor
+        )
+        assert len(second_page.items) == 1
+        assert second_page.items[0].object_id != first_page.items[0].object_id
+        assert second_page.next_cursor is None
+
+    @pytest.mark.usefixtures("append_items_to_table")
+    def test_tampered_cursor(self, mock_user, processes):
+        first_page = processes.get_page(BaseObject, mock_user, limit=1)
+
+        with pytest.raises(
+            InvalidCursorError, match="Invalid Cursor: Signature does not match"
+        ):
+            processes.get_page(
+                BaseObject, mock_user, cursor=first_page.next_cursor + "x"
+            )
+
+    @pytest.mark.usefixtures("append_items_to_table")
+    def test_cursor_from_other_user(self, mock_user, fake_user, processes):
+        first_page = processes.get_page(BaseObject, mock_user, limit=1)
+
+        with pytest.raises(
+            InvalidCursorError,
+            match="Invalid Cursor: Cursor does not belong to this list",
+        ):
+            processes.get_page(BaseObject, fake_user, cursor=first_page.next_cursor)
+
+
 @pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
 class TestGet:
 
@@ -206,6 +329,8 @@ class TestPut:
                 "timestamp": "2024-05-06T00:00:00.000000",
                 "user_id": MOCK_USER_ID,
                 "workout_date": "2024-05-06",
+                "notes": "",
+                "title": "Legs",
             }
         )
         processes.post(Workout, mock_user, example_object)
@@ -230,6 +355,21 @@ class TestPut:
         assert object_from_db.notes == "UPDATED"
         assert object_from_db.__dict__ == updated_object.__dict__
 
+    @pytest.mark.dependency(depends=["CREATE"])
+    def test_update_without_read(
+        self, mock_user, processes, add_example_object_to_db, monkeypatch
+    ):
+        updated_object = deepcopy(add_example_object_to_db)
+
+        def fail_on_read(*args, **kwargs):
+            raise AssertionError("`put` should not read before writing")
+
+        monkeypatch.setattr(processes_module.RestProcesses, "get", fail_on_read)
+
+        result = processes.put(BaseObject, mock_user, updated_object)
+
+        assert result == updated_object
+
     def test_item_doesnt_exist(self, mock_user, processes, example_object):
         updated_object = deepcopy(example_object)
         updated_object.timestamp = datetime.fromisoformat("2024-05-06T00:00:00.000000")
@@ -248,6 +388,8 @@ class TestPut:
                 "timestamp": "2024-05-06T00:00:00.000000",
                 "user_id": MOCK_USER_ID,
                 "workout_date": "2024-05-06",
+                "notes": "",
+                "title": "Legs",
             }
         )
         processes.post(Workout, mock_user, example_object)
@@ -273,7 +415,7 @@ class TestPut:
         }
         object_from_db = Workout.from_db(object_data)
 
-        assert object_from_db.notes == None
+        assert object_from_db.notes == ""
         assert object_from_db.__dict__ == example_object.__dict__
 
     def test_invalid_attr_change(self, mock_user, processes, add_example_object_to_db):
@@ -289,6 +431,101 @@ class TestPut:
             processes.put(BaseObject, mock_user, updated_object)
 
 
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestPatch:
+
+    @pytest.fixture
+    def stored_set(self, workout_graph) -> Set:
+        return workout_graph["sets"][0]
+
+    def test_successful_patch(self, mock_user, processes, stored_set):
+        changes = Set.partial_model().model_validate({"reps": 8, "notes": "PR"})
+
+        result = processes.patch(Set, mock_user, stored_set.object_id, changes)
+
+        assert isinstance(result, Set)
+        assert result.reps == 8
+        assert result.notes == "PR"
+        assert result.weight == stored_set.weight
+        assert result.timestamp == stored_set.timestamp
+
+        fetched = processes.get(Set, mock_user, stored_set.object_id)
+        assert fetched.__dict__ == result.__dict__
+
+    def test_patch_with_timestamp_skips_read(
+        self, mock_user, processes, stored_set, monkeypatch
+    ):
+        def fail_on_read(*args, **kwargs):
+            raise AssertionError("`patch` should not read when given a timestamp")
+
+        monkeypatch.setattr(processes_module.RestProcesses, "get", fail_on_read)
+        changes = Set.partial_model().model_validate(
+            {"timestamp": stored_set.timestamp.isoformat(), "weight": 102.5}
+        )
+
+        result = processes.patch(Set, mock_user, stored_set.object_id, changes)
+
+        assert result.weight == 102.5
+
+    def test_remove_optional_attr(self, mock_user, processes):
+        exercise = processes.post(
+            Exercise,
+            mock_user,
+            Exercise.model_validate({"name": "Squat", "description": "Low bar"}),
+        )
+        changes = Exercise.partial_model().model_validate({"description": None})
+
+        result = processes.patch(Exercise, mock_user, exercise.object_id, changes)
+
+        assert result.description is None
+
+    def test_reparent_moves_adjacency_keys(
+        self, mock_user, processes, stored_set, workout_graph
+    ):
+        old_join, new_join = workout_graph["joins"]
+        changes = Set.partial_model().model_validate(
+            {"exercise_join_id": str(new_join.object_id)}
+        )
+
+        processes.patch(Set, mock_user, stored_set.object_id, changes)
+
+        old_children = processes_module.sets_from_joins(mock_user, [old_join])
+        new_children = processes_module.sets_from_joins(mock_user, [new_join])
+        assert stored_set.object_id not in [set.object_id for set in old_children]
+        assert stored_set.object_id in [set.object_id for set in new_children]
+
+    def test_remove_required_attr(self, mock_user, processes, stored_set):
+        changes = Set.partial_model().model_validate({"reps": None})
+
+        with pytest.raises(
+            InvalidAttributeChangeError,
+            match="Cannot Remove required `reps` Attribute on `Set`",
+        ):
+            processes.patch(Set, mock_user, stored_set.object_id, changes)
+
+    def test_user_mismatch(self, fake_user, processes, stored_set):
+        changes = Set.partial_model().model_validate(
+            {"timestamp": stored_set.timestamp.isoformat(), "reps": 1}
+        )
+
+        with pytest.raises(
+            ItemAccessUnauthorizedError,
+            match=re.escape(
+                f"`Set` Item not owned by current user ({fake_user.id}): Cannot Update"
+            ),
+        ):
+            processes.patch(Set, fake_user, stored_set.object_id, changes)
+
+    def test_item_doesnt_exist(self, mock_user, processes):
+        changes = Set.partial_model().model_validate({"reps": 1})
+
+        with pytest.raises(
+            ItemNotFoundError,
+            match=f"No `Set` found with `object_id`: '{EXAMPLE_OBJECT_ID}': Cannot Update",
+        ):
+            processes.patch(Set, mock_user, EXAMPLE_OBJECT_ID, changes)
+
+
 @pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
 class TestDelete:
 
@@ -303,7 +540,7 @@ class TestDelete:
         result = processes.delete(BaseObject, mock_user, EXAMPLE_OBJECT_ID)
         assert isinstance(result, BaseObject)
 
-        table_data_after = client.scan(TableName=MOCK_DYNAMO_TABLE_NAME)["Items"]
+        table_data_after = scan_objects(client)
         assert len(table_data_after) == 0
 
     def test_item_doesnt_exist(self, mock_user, processes):
@@ -333,6 +570,99 @@ class TestDelete:
         assert len(table_data_after) == 1
 
 
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestWorkoutDateFilter:
+
+    @pytest.fixture
+    def workouts_by_date(self, mock_user, fake_user) -> dict[str, Workout]:
+        workouts = {}
+        for workout_date in ["2024-05-01", "2024-05-06", "2024-05-20", "2024-06-02"]:
+            workout = Workout.model_validate(
+                {"workout_date": workout_date, "notes": "", "title": "Legs"}
+            )
+            workouts[workout_date] = processes_module.RestProcesses.post(
+                Workout, mock_user, workout
+            )
+
+        other_user_workout = Workout.model_validate(
+            {"workout_date": "2024-05-06", "notes": "", "title": "Legs"}
+        )
+        processes_module.RestProcesses.post(Workout, fake_user, other_user_workout)
+
+        return workouts
+
+    def test_single_date(self, mock_user, workouts_by_date):
+        results = processes_module.workout_date_filter(
+            mock_user, date.fromisoformat("2024-05-06")
+        )
+
+        assert [workout.object_id for workout in results] == [
+            workouts_by_date["2024-05-06"].object_id
+        ]
+
+    def test_date_range(self, mock_user, workouts_by_date):
+        results = processes_module.workout_date_range_filter(
+            mock_user,
+            from_date=date.fromisoformat("2024-05-02"),
+            to_date=date.fromisoformat("2024-06-02"),
+        )
+
+        assert [workout.workout_date.isoformat() for workout in results] == [
+            "2024-05-06",
+            "2024-05-20",
+            "2024-06-02",
+        ]
+
+    def test_open_ended_ranges(self, mock_user, workouts_by_date):
+        from_results = processes_module.workout_date_range_filter(
+            mock_user, from_date=date.fromisoformat("2024-05-20")
+        )
+        to_results = processes_module.workout_date_range_filter(
+            mock_user, to_date=date.fromisoformat("2024-05-01")
+        )
+
+        assert len(from_results) == 2
+        assert len(to_results) == 1
+
+    def test_without_date_index(self, mock_user, workouts_by_date, monkeypatch):
+        monkeypatch.setenv(WORKOUT_DATE_INDEX_ENV_VAR, "false")
+        # Posted last, so only sorting puts it first
+        processes_module.RestProcesses.post(
+            Workout,
+            mock_user,
+            Workout.model_validate(
+                {"workout_date": "2024-05-02", "notes": "", "title": "Legs"}
+            ),
+        )
+        db = get_db_instance()
+        real_query = db._table.query
+
+        def partition_query(**kwargs):
+            assert "IndexName" not in kwargs
+            return real_query(**kwargs)
+
+        monkeypatch.setattr(db._table, "query", partition_query)
+
+        results = processes_module.workout_date_range_filter(
+            mock_user,
+            from_date=date.fromisoformat("2024-05-02"),
+            to_date=date.fromisoformat("2024-05-20"),
+        )
+
+        assert [workout.workout_date.isoformat() for workout in results] == [
+            "2024-05-02",
+            "2024-05-06",
+            "2024-05-20",
+        ]
+
+    def test_invalid_params(self, mock_user):
+        with pytest.raises(
+            ValueError,
+            match="Invalid Usage: `workout_date_range_filter` requires either `from_date` or `to_date` or both, None provided",
+        ):
+            processes_module.workout_date_range_filter(mock_user)
+
+
 @pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
 class TestExerciseJoinFilter:
 
@@ -384,6 +714,35 @@ class TestExerciseJoinFilter:
             processes_module.exercise_join_filter(mock_user)
 
 
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestSetsFromIds:
+
+    def test_sets_for_workout(self, mock_user, workout_graph):
+        workout = workout_graph["workout"][0]
+
+        sets = processes_module.sets_from_ids(mock_user, workout_id=workout.object_id)
+
+        assert [set.object_id for set in sets] == [
+            set.object_id for set in workout_graph["sets"]
+        ]
+
+    def test_sets_for_exercise(self, mock_user, workout_graph):
+        join = workout_graph["joins"][1]
+
+        sets = processes_module.sets_from_ids(mock_user, exercise_id=join.exercise_id)
+
+        assert len(sets) == 15
+        assert all(set.exercise_join_id == str(join.object_id) for set in sets)
+
+    def test_other_users_children_excluded(self, fake_user, workout_graph):
+        workout = workout_graph["workout"][0]
+
+        assert (
+            processes_module.sets_from_ids(fake_user, workout_id=workout.object_id)
+            == []
+        )
+
+
 @pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
 class TestIdsFromExerciseJoins:
 
@@ -459,3 +818,203 @@ class TestTagJoinFilter:
                 tag_id=uuid4(),
                 target_id=uuid4(),
             )
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestUnitOfWork:
+
+    @pytest.fixture
+    def query_calls(self, monkeypatch) -> list:
+        db = get_db_instance()
+        calls = []
+        real_query = db._table.query
+
+        def counting_query(**kwargs):
+            calls.append(kwargs)
+            return real_query(**kwargs)
+
+        monkeypatch.setattr(db._table, "query", counting_query)
+        return calls
+
+    @pytest.mark.dependency(depends=["CREATE"])
+    def test_repeated_get_is_cached(
+        self, mock_user, processes, add_example_object_to_db, query_calls
+    ):
+        with unit_of_work_scope() as unit_of_work:
+            first = processes.get(BaseObject, mock_user, EXAMPLE_OBJECT_ID)
+            second = processes.get(BaseObject, mock_user, EXAMPLE_OBJECT_ID)
+
+        assert first is second
+        assert len(query_calls) == 1
+        assert unit_of_work.stats() == {"hits": 1, "misses": 1}
+
+    @pytest.mark.dependency(depends=["CREATE"])
+    def test_ownership_checked_on_hit(
+        self, mock_user, fake_user, processes, add_example_object_to_db
+    ):
+        with unit_of_work_scope():
+            processes.get(BaseObject, mock_user, EXAMPLE_OBJECT_ID)
+
+            with pytest.raises(ItemAccessUnauthorizedError):
+                processes.get(BaseObject, fake_user, EXAMPLE_OBJECT_ID)
+
+    def test_write_invalidates(self, mock_user, processes, workout_graph, query_calls):
+        workout = workout_graph["workout"][0]
+
+        with unit_of_work_scope() as unit_of_work:
+            assert len(processes.get_list(ExerciseJoin, mock_user)) == 2
+            processes.get(Workout, mock_user, workout.object_id)
+
+            processes.patch(
+                Workout,
+                mock_user,
+                workout.object_id,
+                Workout.partial_model().model_validate({"notes": "UPDATED"}),
+            )
+            processes_module.delete_exercise_join_cascade(
+                mock_user, workout_graph["joins"][0]
+            )
+
+            assert processes.get(Workout, mock_user, workout.object_id).notes == (
+                "UPDATED"
+            )
+            assert len(processes.get_list(ExerciseJoin, mock_user)) == 1
+
+        assert unit_of_work.stats()["hits"] == 1
+
+    def test_invalidate_keeps_other_partitions(self, mock_user, workout_graph):
+        workout = workout_graph["workout"][0]
+        joins = workout_graph["joins"]
+
+        workouts = workout.primary_key()[DB_PARTITION]
+        exercise_joins = joins[0].primary_key()[DB_PARTITION]
+
+        unit_of_work = UnitOfWork()
+        unit_of_work.add_partition(Workout, workouts, [workout])
+        unit_of_work.add_partition(ExerciseJoin, exercise_joins, joins)
+
+        unit_of_work.invalidate(joins[0])
+
+        assert unit_of_work.get_object(ExerciseJoin, joins[0].object_id) is None
+        assert unit_of_work.get_object(ExerciseJoin, joins[1].object_id) is joins[1]
+        assert unit_of_work.get_partition(ExerciseJoin, exercise_joins) is None
+        assert unit_of_work.get_partition(Workout, workouts) == [workout]
+
+    def test_no_caching_outside_scope(
+        self, mock_user, processes, workout_graph, query_calls
+    ):
+        processes.get_list(ExerciseJoin, mock_user)
+        processes.get_list(ExerciseJoin, mock_user)
+
+        assert len(query_calls) == 2
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestWorkoutDetail:
+
+    @pytest.fixture
+    def tagged_graph(self, mock_user, workout_graph) -> dict[str, list[BaseObject]]:
+        workout = workout_graph["workout"][0]
+        join = workout_graph["joins"][0]
+
+        exercise = Exercise.model_validate({"name": "Squat"})
+        exercise.object_id = join.exercise_id
+        exercise.init_from_request(mock_user, ObjectType.EXERCISE)
+
+        tag = Tag.model_validate({"name": "Heavy", "color_hex": "#ff0000"})
+        tag.init_from_request(mock_user, ObjectType.TAG)
+
+        tag_joins = []
+        for target_id in (workout.object_id, exercise.object_id):
+            tag_join = TagJoin.model_validate(
+                {"target_id": target_id, "tag_id": tag.object_id}
+            )
+            tag_join.init_from_request(mock_user, ObjectType.TAG_JOIN)
+            tag_joins.append(tag_join)
+
+        get_db_instance().batch_write(put_objects=[exercise, tag, *tag_joins])
+
+        return {**workout_graph, "exercises": [exercise], "tags": [tag]}
+
+    def test_nested_document(self, mock_user, tagged_graph):
+        workout = tagged_graph["workout"][0]
+        first_join, second_join = tagged_graph["joins"]
+
+        detail = asyncio.run(
+            processes_module.workout_detail(mock_user, workout.object_id)
+        )
+
+        assert detail.workout.object_id == workout.object_id
+        assert [tag.name for tag in detail.tags] == ["Heavy"]
+        assert [entry.exercise_join.object_id for entry in detail.exercises] == [
+            first_join.object_id,
+            second_join.object_id,
+        ]
+
+        first, second = detail.exercises
+        assert first.exercise.name == "Squat"
+        assert [tag.name for tag in first.tags] == ["Heavy"]
+        assert [set.object_id for set in first.sets] == [
+            set.object_id for set in tagged_graph["sets"][:15]
+        ]
+        # Exercise was never stored for the second join
+        assert second.exercise is None
+        assert second.tags == []
+        assert len(second.sets) == 15
+
+    def test_user_mismatch(self, fake_user, workout_graph):
+        workout = workout_graph["workout"][0]
+
+        with pytest.raises(ItemAccessUnauthorizedError):
+            asyncio.run(processes_module.workout_detail(fake_user, workout.object_id))
+
+    def test_workout_doesnt_exist(self, mock_user):
+        with pytest.raises(ItemNotFoundError):
+            asyncio.run(processes_module.workout_detail(mock_user, uuid4()))
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestCascadeDelete:
+
+    def test_delete_workout_cascade(self, mock_user, workout_graph):
+        client = boto3.client("dynamodb")
+        table_data_before = client.scan(TableName=MOCK_DYNAMO_TABLE_NAME)["Items"]
+        assert len(table_data_before) == 33
+
+        workout = workout_graph["workout"][0]
+        result = processes_module.delete_workout_cascade(mock_user, workout.object_id)
+
+        assert result.object_id == workout.object_id
+        table_data_after = scan_objects(client)
+        assert len(table_data_after) == 0
+
+    def test_delete_exercise_join_cascade(self, mock_user, workout_graph):
+        client = boto3.client("dynamodb")
+        to_delete, to_keep = workout_graph["joins"]
+
+        processes_module.delete_exercise_join_cascade(mock_user, to_delete.object_id)
+
+        remaining_ids = {item["object_id"]["S"] for item in scan_objects(client)}
+        assert len(remaining_ids) == 17
+        assert str(to_delete.object_id) not in remaining_ids
+        assert str(to_keep.object_id) in remaining_ids
+        assert all(
+            str(set.object_id) in remaining_ids
+            for set in workout_graph["sets"]
+            if set.exercise_join_id == str(to_keep.object_id)
+        )
+
+    def test_user_mismatch(self, fake_user, workout_graph):
+        workout = workout_graph["workout"][0]
+
+        with pytest.raises(
+            ItemAccessUnauthorizedError,
+            match=re.escape(
+                f"`Workout` Item not owned by current user ({fake_user.id}): Cannot Delete"
+            ),
+        ):
+            processes_module.delete_workout_cascade(fake_user, workout.object_id)
+
+        client = boto3.client("dynamodb")
+        table_data = client.scan(TableName=MOCK_DYNAMO_TABLE_NAME)["Items"]
+        assert len(table_data) == 33
@@ -0,0 +1,63 @@
+import json
+
+from pydantic import TypeAdapter
+
+from hard.app.pagination import Page
+from hard.app.responses import JSON_MEDIA_TYPE, list_response
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.set import Set
+
+
+def make_sets(mock_user, count: int) -> list[Set]:
+    sets = []
+    for index in range(count):
+        set = Set.model_validate(
+            {
+                "set_type": SetType.WORKING.value,
+                "weight": 60 + index * 2.5,
+                "unit": WeightUnit.KILOGRAMS.value,
+                "reps": 5,
+                "notes": "",
+                "exercise_join_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+            }
+        )
+        set.init_from_request(mock_user, ObjectType.SET)
+        sets.append(set)
+    return sets
+
+
+class TestListResponse:
+
+    def test_list_matches_response_model(self, mock_user):
+        sets = make_sets(mock_user, 3)
+
+        response = list_response(Set, sets)
+
+        assert response.media_type == JSON_MEDIA_TYPE
+        assert json.loads(response.body) == TypeAdapter(
+            list[Set] | Page[Set]
+        ).dump_python(sets, mode="json")
+
+    def test_page_matches_response_model(self, mock_user):
+        page = Page[Set](items=make_sets(mock_user, 2), next_cursor="next")
+
+        response = list_response(Set, page)
+
+        assert json.loads(response.body) == TypeAdapter(
+            list[Set] | Page[Set]
+        ).dump_python(page, mode="json")
+        assert json.loads(response.body)["next_cursor"] == "next"
+
+    def test_empty_list(self):
+        assert list_response(Set, []).body == b"[]"
+
+    def test_decimal_strings(self, mock_user):
+        sets = make_sets(mock_user, 2)
+
+        body = json.loads(list_response(Set, sets).body)
+
+        assert [(item["weight"], item["reps"]) for item in body] == [
+            ("60", "5"),
+            ("62.5", "5"),
+        ]
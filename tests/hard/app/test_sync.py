@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hard.app import sync as sync_module
+from hard.app.pagination import InvalidCursorError
+from hard.app.processes import RestProcesses
+from hard.app.sync import WatermarkExpiredError, get_changes
+from hard.aws.dynamodb.consts import SYNC_INDEX_ENV_VAR, TOMBSTONE_RETENTION_DAYS
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models.exercise import Exercise
+from hard.models.workout import Workout
+
+
+@pytest.fixture(autouse=True)
+def no_watermark_lag(monkeypatch):
+    # Reads here are consistent, so changes can be synced as soon as they land
+    monkeypatch.setattr(sync_module, "WATERMARK_LAG", timedelta(0))
+
+
+@pytest.fixture
+def stored_objects(set_up_aws_resources, mock_user) -> tuple[Workout, Exercise]:
+    workout = RestProcesses.post(
+        Workout,
+        mock_user,
+        Workout.model_validate(
+            {"workout_date": "2024-05-06", "notes": "", "title": "Legs"}
+        ),
+    )
+    exercise = RestProcesses.post(
+        Exercise, mock_user, Exercise.model_validate({"name": "Squat"})
+    )
+    return workout, exercise
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestGetChanges:
+
+    @pytest.fixture(autouse=True, params=["true", "false"], ids=["index", "partitions"])
+    def sync_index(self, request, monkeypatch):
+        monkeypatch.setenv(SYNC_INDEX_ENV_VAR, request.param)
+
+    def test_full_sync(self, mock_user, fake_user, stored_objects):
+        workout, exercise = stored_objects
+
+        changeset = get_changes(mock_user)
+
+        assert [
+            (change.object_type, change.object_id) for change in changeset.changes
+        ] == [
+            (ObjectType.WORKOUT, workout.object_id),
+            (ObjectType.EXERCISE, exercise.object_id),
+        ]
+        assert changeset.changes[1].item["name"] == "Squat"
+        assert changeset.next_cursor is None
+        assert get_changes(fake_user).changes == []
+
+    def test_full_sync_without_deletions(self, mock_user, stored_objects):
+        workout, exercise = stored_objects
+        RestProcesses.delete(Workout, mock_user, workout.object_id)
+
+        changeset = get_changes(mock_user)
+
+        assert [(change.object_id, change.deleted) for change in changeset.changes] == [
+            (exercise.object_id, False)
+        ]
+
+    def test_delta_since_watermark(self, mock_user, stored_objects):
+        workout, exercise = stored_objects
+        watermark = get_changes(mock_user).watermark
+
+        RestProcesses.patch(
+            Exercise,
+            mock_user,
+            exercise.object_id,
+            Exercise.partial_model().model_validate({"description": "Low bar"}),
+        )
+        RestProcesses.delete(Workout, mock_user, workout.object_id)
+
+        changeset = get_changes(mock_user, since=datetime.fromisoformat(watermark))
+
+        assert [(change.object_id, change.deleted) for change in changeset.changes] == [
+            (exercise.object_id, False),
+            (workout.object_id, True),
+        ]
+        assert changeset.changes[0].item["description"] == "Low bar"
+        assert changeset.changes[1].item is None
+        assert changeset.changes[1].object_type == ObjectType.WORKOUT
+
+        unchanged = get_changes(
+            mock_user, since=datetime.fromisoformat(changeset.watermark)
+        )
+        assert unchanged.changes == []
+
+    def test_pagination(self, mock_user, fake_user, stored_objects):
+        first_page = get_changes(mock_user, limit=1)
+        assert len(first_page.changes) == 1
+        assert first_page.watermark == first_page.changes[0].modified_at
+
+        second_page = get_changes(mock_user, limit=1, cursor=first_page.next_cursor)
+        assert second_page.changes[0].object_id == stored_objects[1].object_id
+
+        with pytest.raises(InvalidCursorError):
+            get_changes(fake_user, limit=1, cursor=first_page.next_cursor)
+
+    def test_range_fixed_by_first_page(self, mock_user, stored_objects):
+        first_page = get_changes(mock_user, limit=1)
+        later = RestProcesses.post(
+            Exercise, mock_user, Exercise.model_validate({"name": "Bench"})
+        )
+
+        second_page = get_changes(mock_user, limit=10, cursor=first_page.next_cursor)
+        assert [change.object_id for change in second_page.changes] == [
+            stored_objects[1].object_id
+        ]
+        assert second_page.next_cursor is None
+
+        next_sync = get_changes(
+            mock_user, since=datetime.fromisoformat(second_page.watermark)
+        )
+        assert [change.object_id for change in next_sync.changes] == [later.object_id]
+
+    def test_expired_watermark(self, mock_user):
+        since = datetime.now(timezone.utc) - timedelta(
+            days=TOMBSTONE_RETENTION_DAYS + 1
+        )
+
+        with pytest.raises(
+            WatermarkExpiredError,
+            match=f"Watermark Expired: Deletions are only kept for {TOMBSTONE_RETENTION_DAYS} days",
+        ):
+            get_changes(mock_user, since=since)
+
+    def test_future_watermark(self, mock_user, stored_objects):
+        since = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        changeset = get_changes(mock_user, since=since)
+
+        assert changeset.changes == []
+        assert changeset.watermark == since.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
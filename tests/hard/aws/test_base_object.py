@@ -0,0 +1,99 @@
+from copy import deepcopy
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from hard.aws.dynamodb.consts import DB_PARTITION, DB_SORT_KEY, DELIMITER
+from hard.aws.dynamodb.object_type import ObjectType
+from hard.models import SetType, WeightUnit
+from hard.models.set import Set
+from hard.models.workout import Workout
+
+from ...conftest import MOCK_USER_ID
+
+
+@pytest.fixture
+def example_set(mock_user) -> Set:
+    set = Set.model_validate(
+        {
+            "set_type": SetType.WARMUP.value,
+            "weight": 0.1,
+            "unit": WeightUnit.POUNDS.value,
+            "reps": 5,
+            "notes": "",
+            "exercise_join_id": str(uuid4()),
+        }
+    )
+    set.init_from_request(mock_user, ObjectType.SET)
+    return set
+
+
+class TestToDb:
+
+    def test_keys(self, example_set):
+        item = example_set.to_db()
+
+        assert item[DB_PARTITION] == f"{MOCK_USER_ID}{DELIMITER}Set"
+        assert item[DB_SORT_KEY] == example_set.timestamp.isoformat()
+        assert "user_id" not in item and "timestamp" not in item
+        assert example_set.primary_key() == {
+            DB_PARTITION: item[DB_PARTITION],
+            DB_SORT_KEY: item[DB_SORT_KEY],
+        }
+
+    def test_sort_key_without_microseconds(self, example_set):
+        example_set.timestamp = datetime(2024, 7, 6)
+
+        assert example_set.to_db()[DB_SORT_KEY] == "2024-07-06T00:00:00"
+
+    def test_attribute_types(self, example_set):
+        item = example_set.to_db()
+
+        assert item["object_id"] == str(example_set.object_id)
+        assert item["set_type"] == "warmup"
+        assert item["unit"] == "lbs"
+        # Exactly 0.1, not the float's binary expansion
+        assert item["weight"] == Decimal("0.1")
+        assert item["reps"] == Decimal("5.0")
+
+    def test_date_attribute(self, mock_user):
+        workout = Workout.model_validate(
+            {"workout_date": "2024-05-06", "notes": "", "title": "Legs"}
+        )
+        workout.init_from_request(mock_user, ObjectType.WORKOUT)
+
+        assert workout.to_db()["workout_date"] == "2024-05-06"
+
+
+class TestFromDb:
+
+    def test_round_trip(self, example_set):
+        item = example_set.to_db()
+        original = deepcopy(item)
+
+        result = Set.from_db(item)
+
+        assert result == example_set
+        assert item == original
+
+    def test_from_db_list(self, example_set, mock_user):
+        workout = Workout.model_validate(
+            {"workout_date": date(2024, 5, 6), "notes": "", "title": "Legs"}
+        )
+        workout.init_from_request(mock_user, ObjectType.WORKOUT)
+        items = [example_set.to_db(), example_set.to_db()]
+
+        assert Set.from_db_list(items) == [example_set, example_set]
+        assert Workout.from_db_list(iter([workout.to_db()])) == [workout]
+
+    def test_invalid_partition(self, example_set):
+        item = example_set.to_db()
+        item[DB_PARTITION] = "no_delimiter"
+
+        with pytest.raises(
+            ValueError,
+            match=f"Invalid Partition: Object partition \\({DB_PARTITION}\\) did not contain delimiter",
+        ):
+            Set.from_db(item)
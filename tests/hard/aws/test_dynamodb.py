@@ -0,0 +1,273 @@
+from typing import Iterator
+from uuid import uuid4
+
+import pytest
+
+from hard.aws.dynamodb import handler as handler_module
+from hard.aws.dynamodb.base_object import BaseObject
+from hard.aws.dynamodb.consts import (
+    DB_PARTITION,
+    DB_SORT_KEY,
+    DELIMITER,
+    MAX_POOL_CONNECTIONS_ENV_VAR,
+    TransactionCanceledError,
+)
+from hard.aws.dynamodb.handler import Attr, Key
+from hard.aws.dynamodb.metrics import collect_call_metrics
+from hard.aws.dynamodb.object_type import ObjectType
+
+from ...conftest import MOCK_DYNAMO_TABLE_NAME, MOCK_USER_ID
+
+MOCK_PK = f"{MOCK_USER_ID}{DELIMITER}{ObjectType.BASE_OBJECT.value}"
+ITEM_COUNT = 10
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestGetDbInstance:
+
+    def test_instance_is_reused(self):
+        first = handler_module.get_db_instance()
+        second = handler_module.get_db_instance()
+
+        assert first is second
+        assert first._table.name == MOCK_DYNAMO_TABLE_NAME
+
+    def test_reset_builds_new_instance(self):
+        first = handler_module.get_db_instance()
+        handler_module.reset_db_instances()
+        second = handler_module.get_db_instance()
+
+        assert first is not second
+
+    def test_pool_size_from_env(self, monkeypatch):
+        monkeypatch.setenv(MAX_POOL_CONNECTIONS_ENV_VAR, "25")
+        handler_module.reset_db_instances()
+
+        db = handler_module.get_db_instance()
+
+        assert db._client.meta.client.meta.config.max_pool_connections == 25
+
+    def test_missing_table_name(self, monkeypatch):
+        monkeypatch.delenv("DYNAMO_TABLE_NAME")
+
+        with pytest.raises(
+            ValueError, match="Missing Environment Variable: `DYNAMO_TABLE_NAME`"
+        ):
+            handler_module.get_db_instance()
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestQueryPagination:
+
+    @pytest.fixture
+    def paged_table(self, set_up_aws_resources):
+        client = set_up_aws_resources
+        for i in range(ITEM_COUNT):
+            client.put_item(
+                TableName=MOCK_DYNAMO_TABLE_NAME,
+                Item={
+                    DB_PARTITION: {"S": MOCK_PK},
+                    DB_SORT_KEY: {"S": f"2024-05-06T00:00:{i:02}.000000"},
+                    "object_id": {"S": str(uuid4())},
+                },
+            )
+        return client
+
+    def test_query_iter_follows_last_evaluated_key(self, paged_table):
+        db = handler_module.get_db_instance()
+
+        items = db.query_iter(
+            key_expression=Key(DB_PARTITION).eq(MOCK_PK),
+            page_size=3,
+        )
+
+        assert isinstance(items, Iterator)
+        assert len(list(items)) == ITEM_COUNT
+
+    def test_query_all_respects_max_items(self, paged_table):
+        db = handler_module.get_db_instance()
+
+        assert len(db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))) == (
+            ITEM_COUNT
+        )
+        assert (
+            len(
+                db.query_all(
+                    key_expression=Key(DB_PARTITION).eq(MOCK_PK),
+                    max_items=4,
+                )
+            )
+            == 4
+        )
+
+
+@pytest.fixture
+def stored_items(set_up_aws_resources) -> list[dict[str, str]]:
+    client = set_up_aws_resources
+    items = []
+    for i in range(ITEM_COUNT):
+        item = {
+            DB_PARTITION: MOCK_PK,
+            DB_SORT_KEY: f"2024-05-06T00:00:{i:02}.000000",
+            "object_id": str(uuid4()),
+        }
+        client.put_item(
+            TableName=MOCK_DYNAMO_TABLE_NAME,
+            Item={key: {"S": value} for key, value in item.items()},
+        )
+        items.append(item)
+    return items
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestBatchGet:
+
+    def test_get_items_by_id(self, stored_items, fake_user):
+        db = handler_module.get_db_instance()
+        requested = [stored_items[3], stored_items[0], stored_items[7]]
+
+        results = db.get_items_by_id(
+            [item["object_id"] for item in requested] + [str(uuid4())],
+            partition=MOCK_PK,
+        )
+        assert results == requested
+
+        other_partition = db.get_items_by_id(
+            [item["object_id"] for item in requested],
+            partition=f"{fake_user.id}{DELIMITER}{ObjectType.BASE_OBJECT.value}",
+        )
+        assert other_partition == []
+
+    def test_batch_get_by_object_id(self, stored_items, mock_user):
+        db = handler_module.get_db_instance()
+
+        results = db.batch_get(
+            mock_user,
+            target_object_cls=BaseObject,
+            search_attr="object_id",
+            matches_list=[item["object_id"] for item in stored_items]
+            + [str(uuid4()) for _ in range(150)],
+        )
+
+        assert [str(result.object_id) for result in results] == [
+            item["object_id"] for item in stored_items
+        ]
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestTransactWrite:
+
+    @pytest.fixture
+    def objects(self, mock_user) -> list[BaseObject]:
+        objects = []
+        for _ in range(3):
+            data_object = BaseObject()
+            data_object.init_from_request(mock_user, ObjectType.BASE_OBJECT)
+            objects.append(data_object)
+        return objects
+
+    def test_successful_write(self, objects):
+        db = handler_module.get_db_instance()
+        db.transact_write(puts=[(data_object, None) for data_object in objects])
+
+        db.transact_write(
+            puts=[(objects[0], Attr(DB_PARTITION).exists())],
+            deletes=[(objects[1], None)],
+        )
+
+        stored = db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))
+        assert [item["object_id"] for item in stored] == [
+            str(objects[0].object_id),
+            str(objects[2].object_id),
+        ]
+
+    def test_cancelled(self, objects):
+        db = handler_module.get_db_instance()
+        db.put(objects[1])
+
+        with pytest.raises(TransactionCanceledError) as exc_info:
+            db.transact_write(
+                puts=[
+                    (data_object, Attr(DB_PARTITION).not_exists())
+                    for data_object in objects
+                ]
+            )
+
+        assert exc_info.value.reasons == [None, "ConditionalCheckFailed", None]
+        stored = db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))
+        assert [item["object_id"] for item in stored] == [str(objects[1].object_id)]
+
+
+@pytest.mark.usefixtures("env_vars", "set_up_aws_resources")
+class TestPut:
+
+    def test_returns_replaced_item(self, mock_user):
+        db = handler_module.get_db_instance()
+        data_object = BaseObject()
+        data_object.init_from_request(mock_user, ObjectType.BASE_OBJECT)
+
+        assert db.put(data_object, return_values="ALL_OLD") == {}
+
+        replaced = db.put(data_object, return_values="ALL_OLD")
+        assert replaced["object_id"] == str(data_object.object_id)
+        assert db.put(data_object) == {}
+
+
+@pytest.mark.usefixtures("env_vars")
+class TestCallMetrics:
+
+    def test_query_counts_filtered_items(self, stored_items):
+        db = handler_module.get_db_instance()
+
+        with collect_call_metrics() as metrics:
+            results = db.query_all(
+                key_expression=Key(DB_PARTITION).eq(MOCK_PK),
+                filter_expression=Attr("object_id").eq(stored_items[0]["object_id"]),
+            )
+
+        assert len(results) == 1
+        assert metrics.calls == 1
+        assert metrics.items_read == ITEM_COUNT
+        assert metrics.items_returned == 1
+        assert metrics.duration > 0
+
+    def test_consumed_capacity_requested(self, stored_items):
+        db = handler_module.get_db_instance()
+        key = {DB_PARTITION: MOCK_PK, DB_SORT_KEY: stored_items[0][DB_SORT_KEY]}
+
+        with collect_call_metrics() as metrics:
+            db.get_item(key)
+
+        assert metrics.consumed_capacity > 0
+        assert (metrics.items_read, metrics.items_returned) == (1, 1)
+
+    def test_concurrent_calls_are_collected(self, stored_items):
+        db = handler_module.get_db_instance()
+
+        with collect_call_metrics() as metrics:
+            results = db.get_items_by_id([item["object_id"] for item in stored_items])
+
+        assert len(results) == ITEM_COUNT
+        assert metrics.calls == ITEM_COUNT
+        assert metrics.items_returned == ITEM_COUNT
+
+    def test_nothing_collected_outside_context(self, stored_items):
+        db = handler_module.get_db_instance()
+
+        with collect_call_metrics() as metrics:
+            pass
+        db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))
+
+        assert metrics.calls == 0
+
+    def test_nested_collectors(self, stored_items):
+        db = handler_module.get_db_instance()
+
+        with collect_call_metrics() as outer:
+            db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))
+            with collect_call_metrics() as inner:
+                db.query_all(key_expression=Key(DB_PARTITION).eq(MOCK_PK))
+
+        assert inner.calls == 1
+        assert outer.calls == 2
+        assert outer.items_read == 2 * ITEM_COUNT